@@ -0,0 +1,796 @@
+"""
+Banc d'essai hors ligne du module code_prototype
+
+Ce script mesure les performances de la collecte, de l'analyse, du calcul des
+KPIs et des routes Flask sans appeler les vrais services :
+1. Un serveur HTTP local imite Google Places, l'App Store (recherche et flux
+   RSS), Trustpilot et l'API ChatCompletion d'OpenAI, avec les mêmes formes
+   de réponse que celles attendues par les clients du module
+2. Les URLs de base du module sont redirigées vers ce serveur par variables
+   d'environnement avant son import
+3. Chaque scénario est répété (latences p50/p90/p99, débit) puis rejoué une
+   fois sous tracemalloc pour mesurer le pic mémoire
+
+Paramètres du serveur simulé:
+- --reviews: nombre d'avis servis par plateforme
+- --latency-ms / --jitter-ms: latence ajoutée à chaque réponse
+- --error-rate: proportion de réponses 503 (rejouées par les clients)
+
+Suivi des régressions:
+- --json: enregistre les résultats
+- --baseline / --tolerance: compare les p50 à un résultat enregistré et
+  termine en erreur si un scénario est plus lent que la tolérance
+
+Utilisation:
+    python benchmark_prototype.py --reviews 500 --latency-ms 20 --error-rate 0.02
+
+Auteur: Data Consulting Team
+Date: 2025
+"""
+
+import argparse
+import importlib
+import json
+import math
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any, Optional, Callable
+from urllib.parse import urlsplit, parse_qs
+
+# Fragments utilisés pour générer des avis réalistes et reproductibles
+POSITIVE_PHRASES = [
+    "Livraison rapide et produit conforme",
+    "Service client très réactif et aimable",
+    "Application fluide, je recommande",
+    "Excellent rapport qualité prix",
+    "Commande reçue en parfait état",
+    "Remboursement traité sans difficulté"
+]
+NEGATIVE_PHRASES = [
+    "Livraison en retard de deux semaines",
+    "Service client injoignable malgré plusieurs relances",
+    "L'application plante à chaque ouverture",
+    "Prix trop élevés pour la qualité",
+    "Colis abîmé et produit manquant",
+    "Remboursement toujours en attente"
+]
+NEUTRAL_PHRASES = [
+    "Commande passée la semaine dernière",
+    "Le site propose beaucoup de références",
+    "Paiement par carte ou virement",
+    "Emballage standard"
+]
+POSITIVE_WORDS = ('rapide', 'réactif', 'aimable', 'recommande', 'excellent', 'parfait', 'fluide')
+NEGATIVE_WORDS = ('retard', 'injoignable', 'plante', 'élevés', 'abîmé', 'manquant', 'attente')
+TOPIC_WORDS = {
+    'livraison': ('livraison', 'colis', 'reçue'),
+    'service client': ('service client',),
+    'application': ('application',),
+    'prix': ('prix', 'qualité prix'),
+    'remboursement': ('remboursement',)
+}
+
+# Identifiants renvoyés par les endpoints de résolution simulés
+STUB_PLACE_ID = 'stub-place'
+STUB_APP_ID = '424242'
+STUB_BUSINESS_UNIT_ID = 'stub-business-unit'
+
+# Taille des pages des flux simulés (identique aux API réelles)
+APPSTORE_PAGE_SIZE = 50
+APPSTORE_MAX_PAGES = 10
+
+## Jeu d'avis synthétiques servi par le serveur simulé
+class StubDataset:
+    """
+    Jeu d'avis synthétiques, du plus récent au plus ancien, identique d'une
+    exécution à l'autre pour une même graine.
+
+    Attributes:
+        reviews (List[Dict[str, Any]]): Avis bruts (auteur, note, texte, date)
+    """
+
+    ## Génère le jeu d'avis
+    def __init__(self, size: int, seed: int = 42):
+        """
+        Génère le jeu d'avis.
+
+        Args:
+            size (int): Nombre d'avis par plateforme
+            seed (int): Graine du générateur aléatoire
+        """
+        rng = random.Random(seed)
+        now = datetime(2025, 6, 30, 18, 0, 0)
+        self.reviews = []
+        for index in range(size):
+            rating = rng.choice((1, 2, 3, 4, 5, 5, 4))
+            pool = POSITIVE_PHRASES if rating >= 4 else NEGATIVE_PHRASES if rating <= 2 else NEUTRAL_PHRASES
+            sentences = rng.sample(pool, 2) + [rng.choice(NEUTRAL_PHRASES)]
+            self.reviews.append({
+                'index': index,
+                'author': f"Client {index}",
+                'rating': rating,
+                'title': sentences[0],
+                'text': '. '.join(sentences) + f". Avis numéro {index}.",
+                'date': now - timedelta(hours=7 * index + rng.randint(0, 6))
+            })
+
+## Configuration et compteurs partagés par les threads du serveur simulé
+class StubConfig:
+    """
+    Latence, taux d'erreur et compteurs du serveur simulé.
+
+    Attributes:
+        latency (float): Latence de base en secondes
+        jitter (float): Variation maximale de la latence en secondes
+        error_rate (float): Proportion de réponses 503
+        requests (Counter): Requêtes servies par endpoint
+        errors (Counter): Erreurs injectées par endpoint
+    """
+
+    ## Initialise la configuration du serveur simulé
+    def __init__(self, dataset: StubDataset, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 42):
+        """
+        Initialise la configuration du serveur simulé.
+
+        Args:
+            dataset (StubDataset): Avis servis par les endpoints
+            latency (float): Latence de base en secondes
+            jitter (float): Variation maximale de la latence en secondes
+            error_rate (float): Proportion de réponses 503 (0 à 1)
+            seed (int): Graine du tirage des erreurs et de la gigue
+        """
+        self.dataset = dataset
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = Counter()
+        self.errors = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    ## Simule la latence et tire une éventuelle erreur pour une requête
+    def simulate(self, endpoint: str) -> bool:
+        """
+        Simule la latence et tire une éventuelle erreur pour une requête.
+
+        Args:
+            endpoint (str): Nom de l'endpoint appelé
+
+        Returns:
+            bool: True si la requête doit échouer (503)
+        """
+        with self._lock:
+            self.requests[endpoint] += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors[endpoint] += 1
+        if delay > 0:
+            time.sleep(delay)
+        return failed
+
+## Gestionnaire HTTP imitant les API des plateformes et d'OpenAI
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Gestionnaire HTTP imitant les API des plateformes et d'OpenAI.
+
+    Préfixes servis:
+    - /google: findplacefromtext/json, details/json
+    - /appstore: search, <pays>/rss/customerreviews/page=<n>/id=<id>/sortBy=mostRecent/json
+    - /trustpilot: business-units/find, reviews/business-unit/<id>
+    - /openai: chat/completions (avis seul ou lot d'avis)
+    """
+
+    # Connexions persistantes, comme les API réelles; sans Nagle, l'envoi
+    # séparé des en-têtes et du corps ajouterait ~40 ms par réponse
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    APPSTORE_FEED = re.compile(r'^/appstore/(\w+)/rss/customerreviews/page=(\d+)/id=(\w+)/sortBy=mostRecent/json$')
+    TRUSTPILOT_REVIEWS = re.compile(r'^/trustpilot/reviews/business-unit/([\w-]+)$')
+
+    ## Traite une requête GET
+    def do_GET(self):
+        self._dispatch()
+
+    ## Traite une requête POST
+    def do_POST(self):
+        self._dispatch()
+
+    ## Désactive la journalisation de chaque requête
+    def log_message(self, format, *args):
+        pass
+
+    ## Route la requête vers la réponse simulée correspondante
+    def _dispatch(self) -> None:
+        """
+        Route la requête vers la réponse simulée correspondante, après
+        application de la latence et des erreurs configurées.
+        """
+        config = self.server.config
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        routes = [
+            ('google.find', lambda: url.path == '/google/findplacefromtext/json', self._google_find),
+            ('google.details', lambda: url.path == '/google/details/json', self._google_details),
+            ('appstore.search', lambda: url.path == '/appstore/search', self._appstore_search),
+            ('appstore.feed', lambda: self.APPSTORE_FEED.match(url.path), self._appstore_feed),
+            ('trustpilot.find', lambda: url.path == '/trustpilot/business-units/find', self._trustpilot_find),
+            ('trustpilot.reviews', lambda: self.TRUSTPILOT_REVIEWS.match(url.path), self._trustpilot_reviews),
+            ('openai.chat', lambda: url.path == '/openai/chat/completions', self._openai_chat)
+        ]
+        for endpoint, matches, handler in routes:
+            match = matches()
+            if not match:
+                continue
+            if config.simulate(endpoint):
+                self._send(503, {'error': {'message': 'Service temporairement indisponible (simulé)',
+                                           'type': 'server_error'}})
+                return
+            try:
+                status, payload = handler(match, query, body)
+            except (ValueError, KeyError) as e:
+                status, payload = 400, {'error': {'message': str(e), 'type': 'invalid_request_error'}}
+            self._send(status, payload)
+            return
+
+        self._send(404, {'error': {'message': f"Endpoint inconnu: {url.path}"}})
+
+    ## Envoie une réponse JSON
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    ## Résolution d'un lieu Google Places
+    def _google_find(self, match, query, body):
+        return 200, {'status': 'OK', 'candidates': [{'place_id': STUB_PLACE_ID}]}
+
+    ## Détails d'un lieu Google Places avec tous ses avis
+    def _google_details(self, match, query, body):
+        reviews = self.server.config.dataset.reviews
+        return 200, {
+            'status': 'OK',
+            'result': {
+                'rating': round(sum(review['rating'] for review in reviews) / max(1, len(reviews)), 1),
+                'user_ratings_total': len(reviews),
+                'reviews': [{
+                    'author_name': review['author'],
+                    'author_url': f"https://www.google.com/maps/contrib/{review['index']}",
+                    'rating': review['rating'],
+                    'text': review['text'],
+                    'time': int(review['date'].timestamp()),
+                    'language': 'fr'
+                } for review in reviews]
+            }
+        }
+
+    ## Recherche d'une application sur l'App Store
+    def _appstore_search(self, match, query, body):
+        return 200, {'resultCount': 1, 'results': [{'trackId': int(STUB_APP_ID), 'trackName': query.get('term')}]}
+
+    ## Page du flux RSS des avis App Store
+    def _appstore_feed(self, match, query, body):
+        country, page = match.group(1), int(match.group(2))
+        reviews = self.server.config.dataset.reviews[:APPSTORE_PAGE_SIZE * APPSTORE_MAX_PAGES]
+        start = (page - 1) * APPSTORE_PAGE_SIZE
+        entries = [{
+            'id': {'label': f"{country}-{review['index']}"},
+            'author': {'name': {'label': review['author']}},
+            'im:rating': {'label': str(review['rating'])},
+            'updated': {'label': review['date'].strftime('%Y-%m-%dT%H:%M:%S-07:00')},
+            'title': {'label': review['title']},
+            'content': {'label': review['text']}
+        } for review in reviews[start:start + APPSTORE_PAGE_SIZE]]
+        # La première page commence par une entrée décrivant l'application
+        if page == 1:
+            entries.insert(0, {'id': {'label': STUB_APP_ID}, 'title': {'label': 'Application'}})
+        return 200, {'feed': {'entry': entries} if entries else {}}
+
+    ## Résolution d'une entreprise Trustpilot
+    def _trustpilot_find(self, match, query, body):
+        return 200, {'id': STUB_BUSINESS_UNIT_ID, 'displayName': query.get('domain')}
+
+    ## Page d'avis Trustpilot
+    def _trustpilot_reviews(self, match, query, body):
+        page = int(query.get('page', 1))
+        per_page = int(query.get('perPage', 20))
+        reviews = self.server.config.dataset.reviews[(page - 1) * per_page:page * per_page]
+        return 200, {'reviews': [{
+            'id': f"tp-{review['index']}",
+            'consumer': {'displayName': review['author']},
+            'stars': review['rating'],
+            'title': review['title'],
+            'text': review['text'],
+            'createdAt': review['date'].strftime('%Y-%m-%dT%H:%M:%SZ')
+        } for review in reviews]}
+
+    ## Réponse ChatCompletion pour un avis ou un lot d'avis
+    def _openai_chat(self, match, query, body):
+        request_data = json.loads(body)
+        messages = request_data['messages']
+        user_content = messages[-1]['content']
+
+        # Un lot d'avis est envoyé sous forme de liste JSON {id, text}
+        try:
+            batch = json.loads(user_content)
+        except ValueError:
+            batch = None
+        if isinstance(batch, list):
+            content = json.dumps({'results': [dict(id=item['id'], **simulate_analysis(item['text']))
+                                              for item in batch]}, ensure_ascii=False)
+        else:
+            content = json.dumps(simulate_analysis(user_content), ensure_ascii=False)
+
+        prompt_tokens = sum(len(message['content']) // 4 + 1 for message in messages)
+        completion_tokens = len(content) // 4 + 1
+        return 200, {
+            'id': f"chatcmpl-stub-{time.time_ns()}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request_data.get('model', 'gpt-3.5-turbo'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens
+            }
+        }
+
+## Produit une analyse de sentiment déterministe pour un texte
+def simulate_analysis(text: str) -> Dict[str, Any]:
+    """
+    Produit une analyse de sentiment déterministe pour un texte, au format
+    attendu par parse_analysis.
+
+    Args:
+        text (str): Texte de l'avis
+
+    Returns:
+        Dict[str, Any]: Score, sentiment, confiance et sujets
+    """
+    lowered = text.lower()
+    positive = sum(word in lowered for word in POSITIVE_WORDS)
+    negative = sum(word in lowered for word in NEGATIVE_WORDS)
+    score = 0.5 + 0.5 * (positive - negative) / max(1, positive + negative)
+    sentiment = 'positive' if score >= 0.6 else 'negative' if score <= 0.4 else 'neutral'
+    topics = [topic for topic, words in TOPIC_WORDS.items() if any(word in lowered for word in words)]
+    return {'score': round(score, 2), 'sentiment': sentiment, 'confidence': 0.9, 'topics': topics[:3]}
+
+## Démarre le serveur simulé dans un thread
+def start_stub_server(config: StubConfig) -> ThreadingHTTPServer:
+    """
+    Démarre le serveur simulé sur un port libre de 127.0.0.1, dans un thread.
+
+    Args:
+        config (StubConfig): Jeu de données, latence et taux d'erreur
+
+    Returns:
+        ThreadingHTTPServer: Serveur démarré (server_address donne le port)
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.config = config
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+## Redirige le module vers le serveur simulé puis l'importe
+def load_prototype(base_url: str, workdir: str):
+    """
+    Redirige le module vers le serveur simulé puis l'importe.
+
+    Les URLs et les stockages sont fixés avant l'import car le module lit sa
+    configuration au chargement. Les limites de débit LLM et les délais de
+    backoff sont relâchés sauf s'ils sont déjà définis dans l'environnement.
+
+    Args:
+        base_url (str): URL du serveur simulé
+        workdir (str): Répertoire des bases SQLite temporaires
+
+    Returns:
+        module: Module code_prototype configuré
+    """
+    os.environ.update({
+        'GOOGLE_PLACES_BASE_URL': f"{base_url}/google",
+        'APPSTORE_BASE_URL': f"{base_url}/appstore",
+        'TRUSTPILOT_BASE_URL': f"{base_url}/trustpilot",
+        'OPENAI_API_BASE': f"{base_url}/openai",
+        'OPENAI_API_KEY': 'sk-benchmark',
+        'GOOGLE_API_KEY': 'benchmark',
+        'REVIEW_DB_PATH': os.path.join(workdir, 'reviews.sqlite3'),
+        'SENTIMENT_CACHE_PATH': '',
+        'RESOLUTION_CACHE_PATH': '',
+        'PROFILE_TOKEN': 'benchmark'
+    })
+    for key, value in (('LLM_REQUESTS_PER_MINUTE', '1000000'),
+                       ('LLM_TOKENS_PER_MINUTE', '1000000000'),
+                       ('LLM_BACKOFF_FACTOR', '0.05'),
+                       ('HTTP_BACKOFF_FACTOR', '0.05')):
+        os.environ.setdefault(key, value)
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    return importlib.import_module('code_prototype')
+
+## Calcule un percentile par interpolation linéaire
+def percentile(values: List[float], q: float) -> float:
+    """
+    Calcule un percentile par interpolation linéaire.
+
+    Args:
+        values (List[float]): Échantillon (non vide)
+        q (float): Percentile entre 0 et 100
+
+    Returns:
+        float: Valeur du percentile
+    """
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100.0
+    lower, upper = math.floor(position), math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+## Mesure un scénario: latences, débit et pic mémoire
+def run_scenario(name: str, func: Callable[[Any], Any], iterations: int,
+                 setup: Optional[Callable[[], Any]] = None, warmup: int = 1) -> Dict[str, Any]:
+    """
+    Mesure un scénario : latences, débit et pic mémoire.
+
+    setup prépare l'état de chaque itération hors chronométrage. func reçoit
+    cet état et retourne le nombre d'éléments traités (pour le débit) ou un
+    tuple (éléments, succès). Une dernière itération est exécutée sous
+    tracemalloc, séparément pour ne pas fausser les latences.
+
+    Args:
+        name (str): Nom du scénario
+        func (Callable[[Any], Any]): Opération mesurée
+        iterations (int): Nombre d'itérations chronométrées
+        setup (Optional[Callable[[], Any]]): Préparation de chaque itération
+        warmup (int): Itérations de chauffe non mesurées
+
+    Returns:
+        Dict[str, Any]: Percentiles (ms), débits, pic mémoire (Kio) et échecs
+    """
+    setup = setup or (lambda: None)
+
+    def call(state):
+        outcome = func(state)
+        if isinstance(outcome, tuple):
+            return outcome
+        return outcome, True
+
+    for _ in range(warmup):
+        call(setup())
+
+    samples, items, failures = [], 0, 0
+    for _ in range(iterations):
+        state = setup()
+        started = time.perf_counter()
+        count, ok = call(state)
+        samples.append(time.perf_counter() - started)
+        items += count or 0
+        failures += 0 if ok else 1
+
+    state = setup()
+    tracemalloc.start()
+    try:
+        # reset_peak n'existe qu'à partir de Python 3.9 (start() repart déjà
+        # d'un pic nul puisque le suivi était arrêté)
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        call(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    total = sum(samples)
+    return {
+        'name': name,
+        'iterations': iterations,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p90_ms': round(percentile(samples, 90) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+        'mean_ms': round(total / iterations * 1000, 3),
+        'ops_per_s': round(iterations / total, 2) if total else None,
+        'items_per_s': round(items / total, 1) if total and items else None,
+        'peak_kib': round(peak / 1024, 1),
+        'failures': failures
+    }
+
+## Scénarios des méthodes de ReviewScraper
+def benchmark_scraper(cp, args, results: List[Dict[str, Any]]) -> None:
+    """
+    Mesure collect_reviews, analyze_reviews et calculate_kpis.
+
+    Chaque itération de collecte utilise une entreprise neuve (pas de
+    marqueurs ni de doublons); les identifiants de plateforme restent en
+    cache après la première résolution. Chaque analyse part d'un cache
+    d'analyse vide, sauf le scénario [cache]. L'analyse et calculate_kpis
+    portent sur un scraper sans stockage durable (agrégateur en mémoire);
+    calculate_kpis[storage] mesure l'initialisation des KPIs depuis SQLite
+    par un scraper neuf à chaque itération.
+
+    Args:
+        cp: Module code_prototype
+        args: Options de la ligne de commande
+        results (List[Dict[str, Any]]): Résultats complétés par les scénarios
+    """
+    storage = cp.get_review_storage()
+    counter = iter(range(10 ** 9))
+
+    def fresh_scraper():
+        return cp.ReviewScraper('Benchmark', storage=storage,
+                                company_id=f"bench-collect-{next(counter)}")
+
+    def collect(concurrent):
+        def run(scraper):
+            collection = scraper.collect_reviews(max_results=args.reviews, concurrent=concurrent)
+            return sum(collection['reviews_per_platform'].values())
+        return run
+
+    results.append(run_scenario('collect_reviews', collect(True), args.iterations, fresh_scraper))
+    results.append(run_scenario('collect_reviews[sequential]', collect(False), args.iterations, fresh_scraper))
+
+    # Scraper de référence pour l'analyse et les KPIs, en mémoire seulement
+    scraper = cp.ReviewScraper('Benchmark', storage=None, company_id='bench-analysis')
+    collection = scraper.collect_reviews(max_results=args.reviews)
+    count = sum(collection['reviews_per_platform'].values())
+
+    def cold_cache():
+        scraper.sentiment_cache = cp.SentimentCache(path=None)
+        return scraper
+
+    def analyze(**options):
+        def run(target):
+            target.analyze_reviews(force=True, **options)
+            return count
+        return run
+
+    results.append(run_scenario('analyze_reviews', analyze(), args.iterations, cold_cache))
+    results.append(run_scenario('analyze_reviews[batch]', analyze(batch=True), args.iterations, cold_cache))
+    results.append(run_scenario('analyze_reviews[local_first]', analyze(local_first=True),
+                                args.iterations, cold_cache))
+    results.append(run_scenario('analyze_reviews[cache]', analyze(), args.iterations, lambda: scraper))
+
+    results.append(run_scenario('calculate_kpis', lambda target: (target.calculate_kpis(), count)[1],
+                                args.iterations, lambda: scraper))
+
+    # Mêmes avis analysés dans le stockage durable
+    if storage is not None:
+        storage.upsert_reviews('bench-kpis', scraper.reviews.to_dicts())
+        results.append(run_scenario(
+            'calculate_kpis[storage]', lambda target: (target.calculate_kpis(), count)[1],
+            args.iterations, lambda: cp.ReviewScraper('Benchmark', storage=storage, company_id='bench-kpis')
+        ))
+
+## Attend la fin d'une tâche de fond soumise par une route
+def wait_for_job(client, response, timeout: float = 600) -> tuple:
+    """
+    Attend la fin d'une tâche de fond soumise par une route (réponse 202).
+
+    Args:
+        client: Client de test Flask
+        response: Réponse de la route de soumission
+        timeout (float): Délai maximum d'attente en secondes
+
+    Returns:
+        tuple: (état final de la tâche ou None, succès)
+    """
+    if response.status_code != 202:
+        return None, False
+    job_id = response.get_json()['job']['job_id']
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/jobs/{job_id}").get_json()
+        if job['status'] not in ('pending', 'running'):
+            return job, job['status'] == 'succeeded'
+        time.sleep(0.002)
+    return None, False
+
+## Scénarios des routes Flask
+def benchmark_routes(cp, args, results: List[Dict[str, Any]]) -> None:
+    """
+    Mesure chaque route Flask via le client de test.
+
+    Les routes qui soumettent une tâche de fond sont mesurées de bout en
+    bout (soumission puis attente de la fin de la tâche). Une route qui
+    n'est couverte par aucun scénario est signalée.
+
+    Args:
+        cp: Module code_prototype
+        args: Options de la ligne de commande
+        results (List[Dict[str, Any]]): Résultats complétés par les scénarios
+    """
+    client = cp.app.test_client()
+    company = {'name': 'Benchmark Routes', 'location': 'Paris', 'app_name': 'Benchmark',
+               'domain': 'benchmark.example', 'company_id': 'bench-routes'}
+    client.post('/api/companies', json=company)
+    collected, _ = wait_for_job(client, client.post('/api/reviews/collect', json={
+        'company_id': 'bench-routes', 'limit_per_platform': args.reviews, 'full_refresh': True}))
+    wait_for_job(client, client.post('/api/reviews/analyze', json={'company_id': 'bench-routes'}))
+    count = collected['result']['total_reviews'] if collected else 0
+    sample_text = "Livraison rapide mais service client injoignable, remboursement en attente."
+
+    def call(method, path, expected=200, items=None, rule=None, variant=None, **kwargs):
+        def run(_):
+            response = client.open(path, method=method, **kwargs)
+            response.get_data()
+            return items, response.status_code == expected
+        return method, rule or path.split('?')[0], variant, run
+
+    def job(path, payload, items=None):
+        def run(_):
+            _, ok = wait_for_job(client, client.post(path, json=payload))
+            return items, ok
+        return 'POST', path, None, run
+
+    finished_job = client.get('/api/jobs').get_json()['jobs'][0]['job_id']
+    scenarios = [
+        call('GET', '/api/health'),
+        call('GET', '/api/metrics'),
+        call('GET', '/api/profiling'),
+        call('POST', '/api/profiling', json={}, headers={'X-Profile': 'benchmark'}),
+        call('POST', '/api/companies', json=company),
+        job('/api/reviews/collect', {'company_id': 'bench-routes', 'limit_per_platform': args.reviews,
+                                     'full_refresh': True}),
+        job('/api/reviews/analyze', {'company_id': 'bench-routes', 'force': True}, count),
+        job('/api/reviews/topics', {'company_id': 'bench-routes', 'overwrite': True}, count),
+        call('POST', '/api/resolutions/warm', expected=202, json={'company_ids': ['bench-routes']}),
+        call('GET', '/api/jobs'),
+        call('GET', f"/api/jobs/{finished_job}", rule='/api/jobs/<job_id>'),
+        call('DELETE', f"/api/jobs/{finished_job}", rule='/api/jobs/<job_id>'),
+        call('GET', '/api/reviews?company_id=bench-routes&limit=100', items=min(100, count)),
+        call('GET', '/api/trends?company_id=bench-routes&granularity=week'),
+        call('POST', '/api/reports/generate', items=count, json={'company_id': 'bench-routes'}),
+        call('POST', '/api/reports/generate', items=count, variant='ndjson',
+             json={'company_id': 'bench-routes', 'format': 'ndjson'}),
+        call('POST', '/api/sentiment', json={'text': sample_text}),
+        call('POST', '/api/topics', json={'text': sample_text}),
+        call('POST', '/api/topics', variant='local', json={'text': sample_text, 'engine': 'local'})
+    ]
+
+    covered = set()
+    for method, rule, variant, run in scenarios:
+        covered.add((method, rule))
+        label = f"{method} {rule}" + (f" [{variant}]" if variant else '')
+        # Le cache d'analyse partagé est vidé pour mesurer les appels LLM
+        results.append(run_scenario(label, run, args.iterations, cp.get_sentiment_cache().clear))
+
+    for rule in cp.app.url_map.iter_rules():
+        if rule.endpoint == 'static':
+            continue
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            if (method, rule.rule) not in covered:
+                print(f"Route non couverte par le banc d'essai: {method} {rule.rule}")
+
+## Affiche les résultats sous forme de tableau
+def print_results(results: List[Dict[str, Any]], config: StubConfig) -> None:
+    """
+    Affiche les résultats sous forme de tableau, suivis des compteurs du
+    serveur simulé.
+
+    Args:
+        results (List[Dict[str, Any]]): Résultats des scénarios
+        config (StubConfig): Configuration et compteurs du serveur simulé
+    """
+    header = f"{'scénario':<44}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'ops/s':>10}{'items/s':>11}{'pic Kio':>11}{'échecs':>8}"
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        items_per_s = f"{result['items_per_s']:.1f}" if result['items_per_s'] else '-'
+        print(f"{result['name']:<44}{result['p50_ms']:>10.2f}{result['p90_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+              f"{result['ops_per_s'] or 0:>10.2f}{items_per_s:>11}"
+              f"{result['peak_kib']:>11.1f}{result['failures']:>8}")
+    print()
+    print("Requêtes servies par le serveur simulé (erreurs injectées):")
+    for endpoint, served in sorted(config.requests.items()):
+        print(f"  {endpoint:<20}{served:>8} ({config.errors[endpoint]})")
+
+## Compare les résultats à une référence enregistrée
+def compare_baseline(results: List[Dict[str, Any]], baseline_path: str, tolerance: float) -> List[str]:
+    """
+    Compare les p50 aux résultats d'une exécution de référence.
+
+    Args:
+        results (List[Dict[str, Any]]): Résultats de l'exécution courante
+        baseline_path (str): Fichier JSON produit par --json
+        tolerance (float): Dégradation relative admise (0.2 = 20 %)
+
+    Returns:
+        List[str]: Description des scénarios en régression
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {result['name']: result for result in json.load(f)['results']}
+
+    regressions = []
+    for result in results:
+        reference = baseline.get(result['name'])
+        if not reference or not reference['p50_ms']:
+            continue
+        ratio = result['p50_ms'] / reference['p50_ms']
+        if ratio > 1 + tolerance:
+            regressions.append(f"{result['name']}: p50 {reference['p50_ms']:.2f} -> "
+                               f"{result['p50_ms']:.2f} ms (x{ratio:.2f})")
+    return regressions
+
+## Point d'entrée du banc d'essai
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Point d'entrée du banc d'essai.
+
+    Args:
+        argv (Optional[List[str]]): Arguments (défaut: ligne de commande)
+
+    Returns:
+        int: Code de sortie (1 en cas de régression détectée)
+    """
+    parser = argparse.ArgumentParser(description="Banc d'essai hors ligne de code_prototype")
+    parser.add_argument('--reviews', type=int, default=200, help="Nombre d'avis servis par plateforme")
+    parser.add_argument('--latency-ms', type=float, default=5.0, help="Latence de chaque réponse simulée")
+    parser.add_argument('--jitter-ms', type=float, default=2.0, help="Variation maximale de la latence")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Proportion de réponses 503 (0 à 1)")
+    parser.add_argument('--iterations', type=int, default=5, help="Itérations chronométrées par scénario")
+    parser.add_argument('--only', choices=('scraper', 'routes'), help="Limite le banc à un groupe de scénarios")
+    parser.add_argument('--seed', type=int, default=42, help="Graine du jeu de données et des erreurs")
+    parser.add_argument('--json', dest='json_path', help="Enregistre les résultats dans ce fichier")
+    parser.add_argument('--baseline', help="Résultats de référence (fichier produit par --json)")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Dégradation admise du p50 (0.2 = 20 %%)")
+    args = parser.parse_args(argv)
+
+    config = StubConfig(StubDataset(args.reviews, args.seed), args.latency_ms / 1000.0,
+                        args.jitter_ms / 1000.0, args.error_rate, args.seed)
+    server = start_stub_server(config)
+
+    with tempfile.TemporaryDirectory(prefix='benchmark-prototype-') as workdir:
+        cp = load_prototype(f"http://127.0.0.1:{server.server_address[1]}", workdir)
+        results = []
+        try:
+            if args.only in (None, 'scraper'):
+                benchmark_scraper(cp, args, results)
+            if args.only in (None, 'routes'):
+                benchmark_routes(cp, args, results)
+        finally:
+            server.shutdown()
+
+    print()
+    print_results(results, config)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': datetime.now().isoformat(),
+                'settings': {key: value for key, value in vars(args).items()
+                             if key not in ('json_path', 'baseline')},
+                'results': results
+            }, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        regressions = compare_baseline(results, args.baseline, args.tolerance)
+        if regressions:
+            print()
+            print("Régressions détectées:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -33,17 +33,44 @@ Auteur: Data Consulting Team
 Date: 2025
 """
 
+import base64
+import binascii
+import bisect
+import contextvars
+import copy
+import cProfile
+import functools
+import glob
+import hashlib
+import hmac
+import heapq
 import json
+import math
+import pstats
 import re
 import random
-from datetime import datetime, timedelta
+import sqlite3
+import sys
+import time
+import unicodedata
+import uuid
+from abc import ABC, abstractmethod
+from array import array
+from datetime import date, datetime, timedelta
 import os
-from collections import Counter
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from email.utils import parsedate_to_datetime
+from itertools import chain, islice
 import requests
-from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Any, Optional, Iterator, Callable, Container
 from urllib.parse import urlencode
 import openai
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 
 # Configuration des clés API et variables d'environnement
@@ -52,6 +79,124 @@ OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', 'sk-2M0zMNJdausPwaEcsV04T3Blbk
 
 # Configuration de l'API OpenAI
 openai.api_key = OPENAI_API_KEY
+openai.api_base = os.environ.get('OPENAI_API_BASE', openai.api_base)
+OPENAI_MODEL = os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo')
+ANALYSIS_PROMPT = (
+    "Analysez le sentiment de l'avis suivant et attribuez-lui une note entre 0 et 1, "
+    "0 étant très négatif et 1 très positif. Identifiez également les principaux sujets "
+    "mentionnés. Répondez uniquement avec un objet JSON de la forme {\"score\": <nombre "
+    "entre 0 et 1>, \"sentiment\": \"positive\" | \"neutral\" | \"negative\", "
+    "\"confidence\": <confiance entre 0 et 1>, \"topics\": [\"<sujet principal>\", ...]}."
+)
+
+# Configuration du cache des analyses LLM
+SENTIMENT_CACHE_PATH = os.environ.get('SENTIMENT_CACHE_PATH', 'sentiment_cache.sqlite3')
+SENTIMENT_CACHE_MAX_ENTRIES = int(os.environ.get('SENTIMENT_CACHE_MAX_ENTRIES', 10000))
+SENTIMENT_CACHE_MAX_DISK_ENTRIES = int(os.environ.get('SENTIMENT_CACHE_MAX_DISK_ENTRIES', 500000))
+SENTIMENT_CACHE_TTL = float(os.environ.get('SENTIMENT_CACHE_TTL', 30 * 24 * 3600))
+
+# Base SQLite des avis collectés et analysés (vide: stockage en mémoire seulement)
+REVIEW_DB_PATH = os.environ.get('REVIEW_DB_PATH', 'reviews.sqlite3')
+
+# Budget du registre des entreprises (instances en mémoire et mémoire des avis)
+REGISTRY_MAX_TENANTS = int(os.environ.get('REGISTRY_MAX_TENANTS', 200))
+REGISTRY_MEMORY_BUDGET = int(os.environ.get('REGISTRY_MEMORY_BUDGET', 512 * 1024 * 1024))
+
+# Configuration de l'analyse groupée (plusieurs avis par requête LLM)
+BATCH_PROMPT = (
+    "Analysez le sentiment de chacun des avis fournis en JSON. Répondez uniquement "
+    "avec un objet JSON de la forme {\"results\": [{\"id\": \"<id de l'avis>\", "
+    "\"score\": <nombre entre 0 et 1, 0 étant très négatif et 1 très positif>, "
+    "\"sentiment\": \"positive\" | \"neutral\" | \"negative\", "
+    "\"confidence\": <confiance entre 0 et 1>, "
+    "\"topics\": [\"<sujet principal>\", ...]}]} avec exactement une entrée par avis."
+)
+BATCH_TOKEN_BUDGET = int(os.environ.get('BATCH_TOKEN_BUDGET', 3000))
+BATCH_MAX_SIZE = int(os.environ.get('BATCH_MAX_SIZE', 25))
+BATCH_OUTPUT_TOKENS_PER_REVIEW = 40
+
+# Configuration du débit et de la concurrence des appels LLM (quota à 0: illimité)
+LLM_MAX_IN_FLIGHT = int(os.environ.get('LLM_MAX_IN_FLIGHT', 8))
+LLM_REQUESTS_PER_MINUTE = int(os.environ.get('LLM_REQUESTS_PER_MINUTE', 3500))
+LLM_TOKENS_PER_MINUTE = int(os.environ.get('LLM_TOKENS_PER_MINUTE', 90000))
+LLM_MAX_RETRIES = int(os.environ.get('LLM_MAX_RETRIES', 5))
+LLM_BACKOFF_FACTOR = float(os.environ.get('LLM_BACKOFF_FACTOR', 1.0))
+LLM_MAX_BACKOFF = float(os.environ.get('LLM_MAX_BACKOFF', 30))
+LLM_DEFAULT_COMPLETION_TOKENS = 256
+
+# Moteur d'extraction des sujets de extract_topics ('llm' ou 'local')
+TOPIC_ENGINE = os.environ.get('TOPIC_ENGINE', 'llm')
+
+# Seuil de confiance en deçà duquel un avis noté localement est envoyé au LLM
+LOCAL_CONFIDENCE_THRESHOLD = float(os.environ.get('LOCAL_CONFIDENCE_THRESHOLD', 0.6))
+LLM_RETRYABLE_ERRORS = (
+    openai.error.RateLimitError,
+    openai.error.ServiceUnavailableError,
+    openai.error.APIConnectionError,
+    openai.error.Timeout
+)
+
+# Configuration de la collecte concurrente
+COLLECTION_MAX_WORKERS = int(os.environ.get('COLLECTION_MAX_WORKERS', 3))
+PLATFORM_TIMEOUTS = {
+    'google': float(os.environ.get('GOOGLE_TIMEOUT', 15)),
+    'appstore': float(os.environ.get('APPSTORE_TIMEOUT', 20)),
+    'trustpilot': float(os.environ.get('TRUSTPILOT_TIMEOUT', 20))
+}
+
+# URLs de base des plateformes (surchargeables, par exemple vers des serveurs de test)
+GOOGLE_PLACES_BASE_URL = os.environ.get('GOOGLE_PLACES_BASE_URL', 'https://maps.googleapis.com/maps/api/place')
+APPSTORE_BASE_URL = os.environ.get('APPSTORE_BASE_URL', 'https://itunes.apple.com')
+TRUSTPILOT_BASE_URL = os.environ.get('TRUSTPILOT_BASE_URL', 'https://api.trustpilot.com/v1')
+
+# Configuration de la couche de transport HTTP partagée
+HTTP_POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', 10))
+HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', 20))
+HTTP_MAX_RETRIES = int(os.environ.get('HTTP_MAX_RETRIES', 3))
+HTTP_BACKOFF_FACTOR = float(os.environ.get('HTTP_BACKOFF_FACTOR', 0.5))
+HTTP_MAX_BACKOFF = float(os.environ.get('HTTP_MAX_BACKOFF', 30))
+HTTP_TIMEOUT = float(os.environ.get('HTTP_TIMEOUT', 10))
+
+# Cache des identifiants de plateforme (durées en secondes; chemin vide: mémoire seule)
+RESOLUTION_CACHE_PATH = os.environ.get('RESOLUTION_CACHE_PATH', 'resolution_cache.sqlite3')
+RESOLUTION_CACHE_TTL = float(os.environ.get('RESOLUTION_CACHE_TTL', 7 * 24 * 3600))
+RESOLUTION_CACHE_NEGATIVE_TTL = float(os.environ.get('RESOLUTION_CACHE_NEGATIVE_TTL', 3600))
+
+# Nombre maximum de pages App Store récupérées simultanément
+APPSTORE_MAX_FANOUT = int(os.environ.get('APPSTORE_MAX_FANOUT', 5))
+
+# Storefronts App Store interrogés par défaut (codes pays séparés par des virgules)
+APPSTORE_COUNTRIES = [country.strip().lower() for country in
+                      os.environ.get('APPSTORE_COUNTRIES', 'fr').split(',') if country.strip()]
+
+# Nombre maximum de périodes d'une série de GET /api/trends
+TRENDS_MAX_BUCKETS = int(os.environ.get('TRENDS_MAX_BUCKETS', 1000))
+
+# Taille des pages de GET /api/reviews (par défaut et maximum)
+REVIEWS_PAGE_SIZE = int(os.environ.get('REVIEWS_PAGE_SIZE', 50))
+REVIEWS_PAGE_MAX = int(os.environ.get('REVIEWS_PAGE_MAX', 500))
+
+# Nombre d'avis sérialisés par morceau dans les rapports en flux
+REPORT_STREAM_CHUNK = int(os.environ.get('REPORT_STREAM_CHUNK', 100))
+
+# Configuration des tâches de fond (collecte et analyse)
+JOB_MAX_WORKERS = int(os.environ.get('JOB_MAX_WORKERS', 4))
+JOB_RETENTION = float(os.environ.get('JOB_RETENTION', 3600))
+# Nombre d'avis analysés entre deux points de progression/annulation
+ANALYSIS_CHUNK_SIZE = int(os.environ.get('ANALYSIS_CHUNK_SIZE', 50))
+
+# Profilage des requêtes et des tâches (modifiable à chaud via POST /api/profiling)
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes')
+SLOW_REQUEST_THRESHOLD = float(os.environ.get('SLOW_REQUEST_THRESHOLD', 2.0))
+# Proportion de requêtes profilées avec cProfile (0: sur demande uniquement)
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0.0))
+# En-tête portant PROFILE_TOKEN : demande la capture d'une requête et autorise
+# la modification des réglages (sans jeton défini, ni l'un ni l'autre n'est permis)
+PROFILE_HEADER = 'X-Profile'
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+# Nombre maximum de captures conservées dans PROFILE_DIR (les plus anciennes sont supprimées)
+PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 50))
 
 # Initialisation de l'application Flask
 app = Flask(__name__)
@@ -61,487 +206,6612 @@ CORS(app)  # Active CORS pour permettre les requêtes cross-origin
 app.config['JSON_AS_ASCII'] = False  # Support UTF-8
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # Limite 16MB
 
-## Classe principale pour la gestion des avis Google Places
-## Gère toutes les interactions avec l'API Google Places
+# Préfixe des métriques exposées sur /api/metrics
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'reviews')
+# Bornes par défaut des histogrammes de durée (secondes)
+METRICS_DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
 
-class GoogleReviewsAPI:
+## Formate une valeur numérique au format d'exposition Prometheus
+def format_metric_value(value: float) -> str:
     """
-    Client pour l'API Google Places Reviews.
+    Formate une valeur numérique au format d'exposition Prometheus.
     
-    Cette classe gère l'interaction avec l'API Google Places pour:
-    - Rechercher des entreprises
-    - Récupérer leurs avis
-    - Formater les données pour l'analyse
+    Args:
+        value (float): Valeur à formater
+        
+    Returns:
+        str: Entier sans décimale, +Inf/-Inf/NaN ou flottant
+    """
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+## Métrique Prometheus à étiquettes
+class Metric:
+    """
+    Métrique à étiquettes au format d'exposition texte de Prometheus.
+    
+    Chaque combinaison de valeurs d'étiquettes forme une série. Les
+    mises à jour sont protégées par un verrou (appels depuis plusieurs
+    threads de collecte et d'analyse).
     
     Attributes:
-        api_key (str): Clé d'API Google Places
-        base_url (str): URL de base pour les requêtes API
+        name (str): Nom complet de la métrique
+        help_text (str): Description affichée dans # HELP
+        labelnames (tuple): Noms des étiquettes, dans l'ordre d'exposition
     """
-
-     ## Initialise le client API avec la clé d'authentification
     
-    def __init__(self, api_key: str = GOOGLE_API_KEY):
+    # Type Prometheus (counter, gauge, histogram)
+    TYPE = 'untyped'
+    
+    ## Initialise une métrique sans série
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
         """
-        Initialise le client API avec la clé d'authentification.
+        Initialise une métrique sans série.
         
         Args:
-            api_key (str): Clé d'API Google Places
+            name (str): Nom complet de la métrique
+            help_text (str): Description de la métrique
+            labelnames (tuple): Noms des étiquettes
         """
-        self.api_key = api_key
-        self.base_url = "https://maps.googleapis.com/maps/api/place"
-
-      ## Recherche l'ID unique d'un lieu sur Google Places
-    def get_place_id(self, business_name: str, location: str) -> Optional[str]:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+    
+    ## Calcule la clé d'une série à partir de ses étiquettes
+    def _key(self, labels: Dict[str, Any]) -> tuple:
         """
-        Recherche l'ID unique d'un lieu sur Google Places.
+        Calcule la clé d'une série à partir de ses étiquettes.
         
         Args:
-            business_name (str): Nom de l'entreprise
-            location (str): Localisation (ville, pays)
+            labels (Dict[str, Any]): Valeurs des étiquettes
             
         Returns:
-            Optional[str]: ID du lieu ou None si non trouvé
+            tuple: Valeurs des étiquettes dans l'ordre de labelnames
+            
+        Raises:
+            ValueError: Étiquettes manquantes ou inconnues
         """
-        endpoint = f"{self.base_url}/findplacefromtext/json"
-        params = {
-            'input': f"{business_name} {location}",
-            'inputtype': 'textquery',
-            'fields': 'place_id',
-            'key': self.api_key
-        }
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Étiquettes attendues pour {self.name}: {', '.join(self.labelnames)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    ## Formate les étiquettes d'une série
+    def _format_labels(self, key: tuple, extra: Optional[tuple] = None) -> str:
+        """
+        Formate les étiquettes d'une série ({nom="valeur",...}).
         
-        try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data['status'] == 'OK' and data['candidates']:
-                return data['candidates'][0]['place_id']
-            return None
+        Args:
+            key (tuple): Valeurs des étiquettes
+            extra (Optional[tuple]): Étiquette supplémentaire (nom, valeur)
             
-        except requests.exceptions.RequestException as e:
-            print(f"Erreur lors de la recherche du lieu: {e}")
-            return None
+        Returns:
+            str: Étiquettes échappées, ou chaîne vide sans étiquette
+        """
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ''
+        escaped = (
+            f'{name}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+            for name, value in pairs
+        )
+        return '{' + ','.join(escaped) + '}'
+    
+    ## Produit les lignes d'exposition des séries
+    def _samples(self) -> List[str]:
+        """Produit les lignes d'exposition des séries (sans # HELP ni # TYPE)."""
+        with self._lock:
+            return [f"{self.name}{self._format_labels(key)} {format_metric_value(value)}"
+                    for key, value in sorted(self._series.items())]
+    
+    ## Produit le bloc d'exposition complet de la métrique
+    def render(self) -> List[str]:
+        """
+        Produit le bloc d'exposition complet de la métrique.
         
-## Récupère les avis clients pour un lieu donné
-    def get_reviews(self, place_id: str, max_results: int = 100) -> List[Dict[str, Any]]:
+        Returns:
+            List[str]: Lignes # HELP, # TYPE et séries
         """
-        Récupère les avis clients pour un lieu donné.
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.TYPE}"] + self._samples()
+
+## Compteur monotone
+class CounterMetric(Metric):
+    """Compteur monotone (nombre de requêtes, de tokens, d'avis...)."""
+    
+    TYPE = 'counter'
+    
+    ## Incrémente le compteur d'une série
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """
+        Incrémente le compteur d'une série.
         
         Args:
-            place_id (str): ID du lieu Google
-            max_results (int): Nombre maximum d'avis à récupérer
+            amount (float): Incrément (positif ou nul)
+            **labels: Valeurs des étiquettes
             
+        Raises:
+            ValueError: Incrément négatif ou étiquettes invalides
+        """
+        if amount < 0:
+            raise ValueError("Un compteur ne peut pas décroître")
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+    
+    ## Aligne le compteur sur un total tenu ailleurs
+    def sync(self, total: float, **labels) -> None:
+        """
+        Aligne le compteur sur un total tenu ailleurs (statistiques d'un cache).
+        
+        Args:
+            total (float): Total cumulé depuis le démarrage
+            **labels: Valeurs des étiquettes
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = total
+
+## Jauge (valeur instantanée)
+class GaugeMetric(Metric):
+    """Jauge pouvant monter et descendre (requêtes en cours, entrées en cache...)."""
+    
+    TYPE = 'gauge'
+    
+    ## Fixe la valeur d'une série
+    def set(self, value: float, **labels) -> None:
+        """
+        Fixe la valeur d'une série.
+        
+        Args:
+            value (float): Nouvelle valeur
+            **labels: Valeurs des étiquettes
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+    
+    ## Incrémente une série
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """
+        Incrémente une série.
+        
+        Args:
+            amount (float): Incrément (négatif pour décrémenter)
+            **labels: Valeurs des étiquettes
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+    
+    ## Décrémente une série
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        """
+        Décrémente une série.
+        
+        Args:
+            amount (float): Décrément
+            **labels: Valeurs des étiquettes
+        """
+        self.inc(-amount, **labels)
+
+## Histogramme à intervalles cumulés
+class HistogramMetric(Metric):
+    """
+    Histogramme à intervalles cumulés (durées de requête).
+    
+    Attributes:
+        buckets (tuple): Bornes supérieures des intervalles, triées
+    """
+    
+    TYPE = 'histogram'
+    
+    ## Initialise l'histogramme et ses intervalles
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (),
+                 buckets: tuple = METRICS_DEFAULT_BUCKETS):
+        """
+        Initialise l'histogramme et ses intervalles.
+        
+        Args:
+            name (str): Nom complet de la métrique
+            help_text (str): Description de la métrique
+            labelnames (tuple): Noms des étiquettes
+            buckets (tuple): Bornes supérieures des intervalles (+Inf ajouté)
+        """
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    ## Enregistre une observation
+    def observe(self, value: float, **labels) -> None:
+        """
+        Enregistre une observation.
+        
+        Args:
+            value (float): Valeur observée (durée en secondes)
+            **labels: Valeurs des étiquettes
+        """
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+    
+    ## Produit les lignes _bucket, _sum et _count de chaque série
+    def _samples(self) -> List[str]:
+        """Produit les lignes _bucket (cumulées), _sum et _count de chaque série."""
+        lines = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', format_metric_value(bound)))} "
+                                 f"{cumulative}")
+                lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', '+Inf'))} {count}")
+                lines.append(f"{self.name}_sum{self._format_labels(key)} {format_metric_value(total)}")
+                lines.append(f"{self.name}_count{self._format_labels(key)} {count}")
+        return lines
+
+## Registre des métriques exposées sur /api/metrics
+class MetricsRegistry:
+    """
+    Registre des métriques de l'application.
+    
+    Les métriques sont déclarées une fois (nom préfixé par l'espace de noms)
+    puis mises à jour par les clients de plateforme, les appels LLM et les
+    routes. Les collecteurs enregistrés sont appelés avant chaque export
+    pour rafraîchir les valeurs lues ailleurs (statistiques des caches,
+    tâches).
+    
+    Attributes:
+        namespace (str): Préfixe des noms de métriques
+    """
+    
+    ## Initialise un registre vide
+    def __init__(self, namespace: str = METRICS_NAMESPACE):
+        """
+        Initialise un registre vide.
+        
+        Args:
+            namespace (str): Préfixe des noms de métriques (vide: aucun)
+        """
+        self.namespace = namespace
+        self._metrics: Dict[str, Metric] = OrderedDict()
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+    
+    ## Déclare une métrique, ou retourne celle déjà déclarée sous ce nom
+    def _register(self, metric_class: type, name: str, help_text: str, labelnames: tuple, **kwargs) -> Metric:
+        """
+        Déclare une métrique, ou retourne celle déjà déclarée sous ce nom.
+        
+        Raises:
+            ValueError: Nom déjà déclaré avec un autre type
+        """
+        full_name = f"{self.namespace}_{name}" if self.namespace else name
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = self._metrics[full_name] = metric_class(full_name, help_text, labelnames, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Métrique {full_name} déjà déclarée avec le type {metric.TYPE}")
+            return metric
+    
+    ## Déclare un compteur
+    def counter(self, name: str, help_text: str, labelnames: tuple = ()) -> CounterMetric:
+        """Déclare un compteur (voir _register)."""
+        return self._register(CounterMetric, name, help_text, labelnames)
+    
+    ## Déclare une jauge
+    def gauge(self, name: str, help_text: str, labelnames: tuple = ()) -> GaugeMetric:
+        """Déclare une jauge (voir _register)."""
+        return self._register(GaugeMetric, name, help_text, labelnames)
+    
+    ## Déclare un histogramme
+    def histogram(self, name: str, help_text: str, labelnames: tuple = (),
+                  buckets: tuple = METRICS_DEFAULT_BUCKETS) -> HistogramMetric:
+        """Déclare un histogramme (voir _register)."""
+        return self._register(HistogramMetric, name, help_text, labelnames, buckets=buckets)
+    
+    ## Enregistre une fonction appelée avant chaque export
+    def register_collector(self, collector: Callable[[], None]) -> None:
+        """
+        Enregistre une fonction appelée avant chaque export.
+        
+        Args:
+            collector (Callable[[], None]): Met à jour des métriques du registre
+        """
+        with self._lock:
+            self._collectors.append(collector)
+    
+    ## Produit l'exposition texte de toutes les métriques
+    def render(self) -> str:
+        """
+        Produit l'exposition texte de toutes les métriques.
+        
+        Un collecteur en erreur est signalé sans bloquer l'export.
+        
         Returns:
-            List[Dict[str, Any]]: Liste des avis formatés
+            str: Exposition au format texte Prometheus 0.0.4
         """
-        endpoint = f"{self.base_url}/details/json"
-        params = {
-            'place_id': place_id,
-            'fields': 'reviews,rating,user_ratings_total',
-            'key': self.api_key,
-            'language': 'fr'
-        }
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"Erreur lors de la collecte des métriques: {e}")
         
-        try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data['status'] == 'OK':
-                reviews = data['result'].get('reviews', [])
-                return [{
-                    'id': f"google_{i}",
-                    'platform': 'Google Reviews',
-                    'author': review['author_name'],
-                    'rating': review['rating'],
-                    'text': review['text'],
-                    'date': datetime.fromtimestamp(review['time']).strftime('%Y-%m-%d'),
-                    'language': review['language']
-                } for i, review in enumerate(reviews[:max_results])]
-            return []
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Erreur lors de la récupération des avis: {e}")
-            return []
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
 
-## Classe pour la gestion des avis de l'App Store
-## Gère la récupération et le formatage des avis depuis l'App Store
-class AppStoreAPI:
+# Registre des métriques de l'application et métriques instrumentées
+metrics_registry = MetricsRegistry()
+PLATFORM_REQUEST_DURATION = metrics_registry.histogram(
+    'platform_request_duration_seconds', "Durée des requêtes HTTP vers les plateformes d'avis", ('platform',))
+PLATFORM_REQUESTS = metrics_registry.counter(
+    'platform_requests_total', "Requêtes HTTP vers les plateformes d'avis par code de réponse",
+    ('platform', 'status'))
+PLATFORM_ERRORS = metrics_registry.counter(
+    'platform_errors_total', "Erreurs des plateformes d'avis (code HTTP >= 400, connection ou timeout)",
+    ('platform', 'reason'))
+PLATFORM_RETRIES = metrics_registry.counter(
+    'platform_retries_total', "Nouvelles tentatives après une erreur transitoire", ('platform',))
+LLM_REQUEST_DURATION = metrics_registry.histogram(
+    'llm_request_duration_seconds', "Durée des appels ChatCompletion", ('model',))
+LLM_REQUESTS = metrics_registry.counter(
+    'llm_requests_total', "Appels ChatCompletion par résultat (success ou classe d'erreur)", ('model', 'outcome'))
+LLM_PROMPT_TOKENS = metrics_registry.counter(
+    'llm_prompt_tokens_total', "Tokens de prompt facturés", ('model', 'company'))
+LLM_COMPLETION_TOKENS = metrics_registry.counter(
+    'llm_completion_tokens_total', "Tokens de complétion facturés", ('model', 'company'))
+REVIEWS_COLLECTED = metrics_registry.counter(
+    'collected_total', "Avis nouveaux collectés", ('company', 'platform'))
+REVIEWS_ANALYZED = metrics_registry.counter(
+    'analyzed_total', "Avis analysés par source (llm ou local)", ('company', 'source'))
+REVIEWS_ANALYSIS_FAILURES = metrics_registry.counter(
+    'analysis_failures_total', "Avis dont l'analyse a échoué", ('company',))
+API_REQUESTS_IN_FLIGHT = metrics_registry.gauge(
+    'api_requests_in_flight', "Requêtes de l'API en cours de traitement", ('endpoint',))
+API_REQUEST_DURATION = metrics_registry.histogram(
+    'api_request_duration_seconds', "Durée de traitement des requêtes de l'API", ('endpoint', 'method'))
+API_REQUESTS = metrics_registry.counter(
+    'api_requests_total', "Requêtes de l'API par code de réponse", ('endpoint', 'method', 'status'))
+
+## Enregistre la durée, le résultat et les tokens d'un appel LLM
+def record_llm_call(duration: float, outcome: str, usage: Any = None,
+                    company: Optional[str] = None) -> None:
     """
-    Client pour l'API Apple App Store.
+    Enregistre la durée, le résultat et les tokens d'un appel LLM.
     
-    Gère la récupération des avis depuis l'App Store en:
-    - Recherchant les applications
-    - Collectant leurs avis
-    - Formatant les données pour l'analyse
+    Args:
+        duration (float): Durée de l'appel en secondes
+        outcome (str): 'success' ou nom de la classe d'erreur
+        usage (Any): Champ usage de la réponse (prompt_tokens, completion_tokens)
+        company (Optional[str]): Entreprise à qui imputer les tokens
+    """
+    LLM_REQUEST_DURATION.observe(duration, model=OPENAI_MODEL)
+    record_span('llm', duration)
+    LLM_REQUESTS.inc(model=OPENAI_MODEL, outcome=outcome)
+    if usage is not None:
+        company = company or 'unknown'
+        LLM_PROMPT_TOKENS.inc(getattr(usage, 'prompt_tokens', 0) or 0, model=OPENAI_MODEL, company=company)
+        LLM_COMPLETION_TOKENS.inc(getattr(usage, 'completion_tokens', 0) or 0, model=OPENAI_MODEL, company=company)
+
+## Chronométrage par étape d'une requête ou d'une tâche
+class Trace:
+    """
+    Durées cumulées par étape (span) d'une requête ou d'une tâche.
+    
+    Une étape peut être mesurée plusieurs fois, y compris depuis les threads
+    d'un pool (appels LLM simultanés) : sa durée est alors un cumul qui peut
+    dépasser la durée totale.
     
     Attributes:
-        base_url (str): URL de base pour les requêtes API
+        name (str): Requête ou tâche tracée
+        started (float): Début de la trace (time.perf_counter)
+        spans (OrderedDict): Étape -> [nombre de mesures, durée cumulée en secondes]
+    """
+    
+    ## Démarre une trace vide
+    def __init__(self, name: str):
+        """
+        Démarre une trace vide.
+        
+        Args:
+            name (str): Requête ou tâche tracée
+        """
+        self.name = name
+        self.started = time.perf_counter()
+        self.spans: Dict[str, list] = OrderedDict()
+        self._lock = threading.Lock()
+    
+    ## Ajoute une mesure à une étape
+    def add(self, name: str, duration: float) -> None:
+        """
+        Ajoute une mesure à une étape.
+        
+        Args:
+            name (str): Nom de l'étape
+            duration (float): Durée en secondes
+        """
+        with self._lock:
+            span_totals = self.spans.setdefault(name, [0, 0.0])
+            span_totals[0] += 1
+            span_totals[1] += duration
+    
+    ## Retourne la durée écoulée depuis le début de la trace
+    def elapsed(self) -> float:
+        """Retourne la durée écoulée depuis le début de la trace, en secondes."""
+        return time.perf_counter() - self.started
+    
+    ## Retourne le détail des étapes sous forme sérialisable
+    def breakdown(self) -> Dict[str, Any]:
+        """
+        Retourne le détail des étapes sous forme sérialisable.
+        
+        Returns:
+            Dict[str, Any]: Durée totale et, par étape, nombre de mesures et
+                durée cumulée (millisecondes)
+        """
+        with self._lock:
+            spans = {name: {'count': count, 'total_ms': round(total * 1000, 2)}
+                     for name, (count, total) in self.spans.items()}
+        return {'elapsed_ms': round(self.elapsed() * 1000, 2), 'spans': spans}
+    
+    ## Résume les étapes sur une ligne
+    def summary(self) -> str:
+        """Résume les étapes sur une ligne (étape=durée, xN si mesurée N fois)."""
+        with self._lock:
+            parts = [f"{name}={total * 1000:.1f}ms" + (f" x{count}" if count > 1 else '')
+                     for name, (count, total) in self.spans.items()]
+        return ', '.join(parts) or 'aucune étape mesurée'
+
+# Trace de la requête ou de la tâche en cours (None: profilage inactif)
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('current_trace', default=None)
+
+## Ajoute une mesure à la trace courante
+def record_span(name: str, duration: float) -> None:
+    """
+    Ajoute une mesure à la trace courante, s'il y en a une.
+    
+    Args:
+        name (str): Nom de l'étape
+        duration (float): Durée en secondes
     """
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, duration)
 
-  ## Initialise le client API App Store
-    def __init__(self):
-        """Initialise le client API App Store."""
-        self.base_url = "https://itunes.apple.com"
+## Mesure un bloc comme étape de la trace courante
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Mesure un bloc comme étape de la trace courante (sans effet hors trace).
     
-## Recherche l'ID d'une application sur l'App Store
-    def get_app_id(self, app_name: str) -> Optional[str]:
+    Args:
+        name (str): Nom de l'étape
+    """
+    if _current_trace.get() is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - started)
+
+## Décore une fonction pour la mesurer comme étape de la trace courante
+def traced(name: str) -> Callable:
+    """
+    Décore une fonction pour la mesurer comme étape de la trace courante.
+    
+    Args:
+        name (str): Nom de l'étape
+        
+    Returns:
+        Callable: Décorateur
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+## Propage la trace courante à une fonction exécutée dans un autre thread
+def with_current_trace(func: Callable) -> Callable:
+    """
+    Propage la trace courante à une fonction exécutée dans un autre thread.
+    
+    Les pools de threads ne transmettent pas les variables de contexte :
+    la fonction retournée réinstalle la trace de l'appelant à chaque appel.
+    
+    Args:
+        func (Callable): Fonction soumise à un pool
+        
+    Returns:
+        Callable: func elle-même hors trace, sinon une fonction équivalente
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return func
+    
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        token = _current_trace.set(trace)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_trace.reset(token)
+    return run
+
+## Réglages du profilage des requêtes et captures cProfile
+class RequestProfiler:
+    """
+    Réglages du profilage des requêtes et des tâches, modifiables à chaud.
+    
+    Lorsque le profilage est actif, chaque requête (et chaque tâche de fond)
+    est tracée par étape et journalisée si elle dépasse le seuil de lenteur.
+    Une capture cProfile est faite pour les requêtes portant l'en-tête
+    PROFILE_HEADER, pour les profile_next prochaines requêtes et pour une
+    proportion sample_rate des requêtes; une tâche de fond soumise par une
+    requête capturée est capturée elle aussi. Seul le thread de la requête
+    ou de la tâche est profilé. Les captures sont écrites dans dump_dir au
+    format .prof (pstats, snakeviz, flameprof) accompagnées d'un résumé texte;
+    seules les max_files plus récentes sont conservées.
+    
+    L'en-tête n'est honoré que si un jeton est configuré et que sa valeur
+    correspond : sans jeton, aucune capture ne peut être demandée par un client.
+    
+    Attributes:
+        enabled (bool): Profilage actif
+        slow_threshold (float): Seuil de journalisation en secondes
+        sample_rate (float): Proportion des requêtes capturées avec cProfile
+        profile_next (int): Nombre de prochaines requêtes à capturer
+        dump_dir (str): Répertoire des captures
+        max_files (int): Nombre maximum de captures conservées
+    """
+    
+    ## Initialise les réglages depuis la configuration
+    def __init__(self, enabled: bool = PROFILING_ENABLED,
+                 slow_threshold: float = SLOW_REQUEST_THRESHOLD,
+                 sample_rate: float = PROFILE_SAMPLE_RATE,
+                 dump_dir: str = PROFILE_DIR, token: str = PROFILE_TOKEN,
+                 max_files: int = PROFILE_MAX_FILES):
+        """
+        Initialise les réglages depuis la configuration.
+        
+        Args:
+            enabled (bool): Profilage actif
+            slow_threshold (float): Seuil de journalisation en secondes
+            sample_rate (float): Proportion des requêtes capturées
+            dump_dir (str): Répertoire des captures
+            token (str): Valeur attendue de l'en-tête (vide: en-tête refusé)
+            max_files (int): Nombre maximum de captures conservées
+        """
+        self.enabled = enabled
+        self.slow_threshold = slow_threshold
+        self.sample_rate = sample_rate
+        self.profile_next = 0
+        self.dump_dir = dump_dir
+        self.max_files = max_files
+        self._token = token
+        self._lock = threading.Lock()
+        self._capture_lock = threading.Lock()
+    
+    ## Modifie les réglages
+    def configure(self, enabled: Optional[bool] = None, slow_threshold: Optional[float] = None,
+                  sample_rate: Optional[float] = None, profile_next: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Modifie les réglages (les paramètres None sont inchangés).
+        
+        Args:
+            enabled (Optional[bool]): Profilage actif
+            slow_threshold (Optional[float]): Seuil de journalisation en secondes
+            sample_rate (Optional[float]): Proportion des requêtes capturées (0 à 1)
+            profile_next (Optional[int]): Nombre de prochaines requêtes à capturer
+            
+        Returns:
+            Dict[str, Any]: Réglages après modification
+            
+        Raises:
+            ValueError: Valeur hors limites
+        """
+        if slow_threshold is not None and float(slow_threshold) < 0:
+            raise ValueError('slow_threshold doit être positif')
+        if sample_rate is not None and not 0 <= float(sample_rate) <= 1:
+            raise ValueError('sample_rate doit être compris entre 0 et 1')
+        if profile_next is not None and int(profile_next) < 0:
+            raise ValueError('profile_next doit être positif')
+        
+        with self._lock:
+            if enabled is not None:
+                self.enabled = bool(enabled)
+            if slow_threshold is not None:
+                self.slow_threshold = float(slow_threshold)
+            if sample_rate is not None:
+                self.sample_rate = float(sample_rate)
+            if profile_next is not None:
+                self.profile_next = int(profile_next)
+        return self.settings()
+    
+    ## Retourne les réglages courants
+    def settings(self) -> Dict[str, Any]:
+        """Retourne les réglages courants."""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'slow_threshold': self.slow_threshold,
+                'sample_rate': self.sample_rate,
+                'profile_next': self.profile_next,
+                'dump_dir': self.dump_dir,
+                'max_files': self.max_files
+            }
+    
+    ## Vérifie le jeton de profilage présenté par un client
+    def authorized(self, header_value: Optional[str]) -> bool:
+        """
+        Vérifie le jeton de profilage présenté par un client.
+        
+        Args:
+            header_value (Optional[str]): Valeur de l'en-tête PROFILE_HEADER
+            
+        Returns:
+            bool: True si un jeton est configuré et que la valeur correspond
+        """
+        if not self._token or not header_value:
+            return False
+        return hmac.compare_digest(header_value.encode('utf-8'), self._token.encode('utf-8'))
+    
+    ## Démarre une capture cProfile
+    def start_capture(self, wait: float = 0.0) -> Optional[cProfile.Profile]:
+        """
+        Démarre une capture cProfile du thread courant.
+        
+        Une seule capture est active à la fois : une demande concurrente est
+        ignorée plutôt que de perturber la capture en cours.
+        
+        Args:
+            wait (float): Délai maximum d'attente de la capture en cours
+                (une tâche attend la fin de la requête qui l'a soumise)
+            
+        Returns:
+            Optional[cProfile.Profile]: Capture démarrée, ou None si une
+                autre capture est en cours
+        """
+        if not self._capture_lock.acquire(timeout=wait if wait > 0 else -1, blocking=wait > 0):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Un autre outil de profilage est déjà actif
+            self._capture_lock.release()
+            print(f"Erreur lors du démarrage du profil: {e}")
+            return None
+        return profile
+    
+    ## Arrête une capture cProfile et l'enregistre
+    def finish_capture(self, profile: cProfile.Profile, label: str) -> Optional[str]:
+        """
+        Arrête une capture démarrée par start_capture et l'enregistre.
+        
+        Args:
+            profile (cProfile.Profile): Capture en cours
+            label (str): Description de la requête ou de la tâche
+            
+        Returns:
+            Optional[str]: Chemin de la capture (voir dump)
+        """
+        try:
+            profile.disable()
+        finally:
+            self._capture_lock.release()
+        return self.dump(profile, label)
+    
+    ## Décide si une requête doit être capturée avec cProfile
+    def claim_capture(self, header_value: Optional[str] = None) -> bool:
+        """
+        Décide si une requête doit être capturée avec cProfile.
+        
+        Args:
+            header_value (Optional[str]): Valeur de l'en-tête PROFILE_HEADER
+            
+        Returns:
+            bool: True pour capturer la requête
+        """
+        with self._lock:
+            if not self.enabled:
+                return False
+            if self.authorized(header_value):
+                return True
+            if self.profile_next > 0:
+                self.profile_next -= 1
+                return True
+            return self.sample_rate > 0 and random.random() < self.sample_rate
+    
+    ## Journalise une requête ou une tâche lente
+    def log_if_slow(self, trace: Trace) -> None:
+        """
+        Journalise une requête ou une tâche lente avec le détail de ses étapes.
+        
+        Args:
+            trace (Trace): Trace terminée
+        """
+        elapsed = trace.elapsed()
+        if elapsed >= self.slow_threshold:
+            print(f"Requête lente: {trace.name} {elapsed:.3f}s "
+                  f"(seuil {self.slow_threshold}s) - {trace.summary()}")
+    
+    ## Écrit une capture cProfile et son résumé
+    def dump(self, profile: cProfile.Profile, label: str) -> Optional[str]:
+        """
+        Écrit une capture cProfile (.prof) et son résumé texte (.txt).
+        
+        Args:
+            profile (cProfile.Profile): Capture arrêtée
+            label (str): Description de la requête ou de la tâche
+            
+        Returns:
+            Optional[str]: Chemin de la capture, ou None en cas d'erreur
+        """
+        name = re.sub(r'[^A-Za-z0-9_.-]+', '_', label).strip('_')
+        path = os.path.join(self.dump_dir, f"{datetime.now():%Y%m%d-%H%M%S}-{name}-{uuid.uuid4().hex[:6]}.prof")
+        try:
+            os.makedirs(self.dump_dir, exist_ok=True)
+            profile.dump_stats(path)
+            with open(path[:-len('.prof')] + '.txt', 'w', encoding='utf-8') as f:
+                pstats.Stats(profile, stream=f).sort_stats('cumulative').print_stats(40)
+        except OSError as e:
+            print(f"Erreur lors de l'écriture du profil: {e}")
+            return None
+        print(f"Profil enregistré: {path} ({label})")
+        self._prune()
+        return path
+    
+    ## Supprime les captures au-delà de max_files
+    def _prune(self) -> None:
+        """Supprime les captures les plus anciennes au-delà de max_files."""
+        captures = sorted(glob.glob(os.path.join(self.dump_dir, '*.prof')), key=os.path.getmtime)
+        for path in captures[:max(len(captures) - self.max_files, 0)]:
+            for stale in (path, path[:-len('.prof')] + '.txt'):
+                try:
+                    os.remove(stale)
+                except OSError as e:
+                    print(f"Erreur lors de la suppression du profil: {e}")
+
+# Réglages de profilage partagés par l'application et les tâches de fond
+request_profiler = RequestProfiler()
+# Capture cProfile demandée par la requête en cours (transmise aux tâches soumises)
+_profile_requested: contextvars.ContextVar = contextvars.ContextVar('profile_requested', default=False)
+
+## Couche de transport HTTP partagée par tous les clients de plateforme
+## Réutilise les connexions keep-alive et rejoue les erreurs transitoires
+class HTTPTransport:
+    """
+    Transport HTTP mutualisé avec pools de connexions et rejeu automatique.
+    
+    Une seule session requests est partagée par les clients Google, App Store
+    et Trustpilot afin de réutiliser les connexions TCP/TLS (un pool
+    keep-alive par hôte). Les réponses 429/5xx et les erreurs réseau sont
+    rejouées avec un backoff exponentiel avec gigue, en respectant l'en-tête
+    Retry-After lorsqu'il est présent.
+    
+    Attributes:
+        session (requests.Session): Session HTTP partagée
+        max_retries (int): Nombre maximum de nouvelles tentatives
+        backoff_factor (float): Délai de base du backoff exponentiel (secondes)
+        max_backoff (float): Délai maximum entre deux tentatives (secondes)
+        timeout (float): Délai par défaut d'une requête (secondes)
+    """
+    
+    # Codes HTTP considérés comme transitoires
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    
+    ## Initialise la session et monte les adaptateurs à pool de connexions
+    def __init__(self, pool_connections: int = HTTP_POOL_CONNECTIONS,
+                 pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 max_retries: int = HTTP_MAX_RETRIES,
+                 backoff_factor: float = HTTP_BACKOFF_FACTOR,
+                 max_backoff: float = HTTP_MAX_BACKOFF,
+                 timeout: float = HTTP_TIMEOUT):
+        """
+        Initialise la session et monte les adaptateurs à pool de connexions.
+        
+        Args:
+            pool_connections (int): Nombre d'hôtes gardés en cache de pools
+            pool_maxsize (int): Nombre maximum de connexions par hôte
+            max_retries (int): Nombre maximum de nouvelles tentatives
+            backoff_factor (float): Délai de base du backoff exponentiel
+            max_backoff (float): Délai maximum entre deux tentatives
+            timeout (float): Délai par défaut d'une requête
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    ## Exécute une requête GET avec rejeu des erreurs transitoires
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            platform: str = 'other', **kwargs) -> requests.Response:
+        """
+        Exécute une requête GET avec rejeu des erreurs transitoires.
+        
+        Chaque tentative alimente les métriques de la plateforme (durée,
+        code de réponse, erreurs et nouvelles tentatives).
+        
+        Args:
+            url (str): URL à interroger
+            params (Optional[Dict[str, Any]]): Paramètres de requête
+            platform (str): Plateforme interrogée (étiquette des métriques)
+            **kwargs: Arguments supplémentaires passés à requests
+            
+        Returns:
+            requests.Response: Dernière réponse obtenue (à vérifier avec
+                raise_for_status par l'appelant)
+            
+        Raises:
+            requests.exceptions.RequestException: Erreur réseau persistante
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                PLATFORM_REQUEST_DURATION.observe(time.perf_counter() - started, platform=platform)
+                record_span(f"http.{platform}", time.perf_counter() - started)
+                PLATFORM_ERRORS.inc(platform=platform,
+                                    reason='timeout' if isinstance(e, requests.exceptions.Timeout) else 'connection')
+                if attempt >= self.max_retries:
+                    raise
+                PLATFORM_RETRIES.inc(platform=platform)
+                time.sleep(self._retry_delay(attempt))
+                continue
+            
+            PLATFORM_REQUEST_DURATION.observe(time.perf_counter() - started, platform=platform)
+            record_span(f"http.{platform}", time.perf_counter() - started)
+            PLATFORM_REQUESTS.inc(platform=platform, status=response.status_code)
+            if response.status_code >= 400:
+                PLATFORM_ERRORS.inc(platform=platform, reason=response.status_code)
+            
+            if response.status_code not in self.RETRY_STATUSES or attempt >= self.max_retries:
+                return response
+            
+            PLATFORM_RETRIES.inc(platform=platform)
+            delay = self._retry_delay(attempt, response)
+            response.close()
+            time.sleep(delay)
+        
+        return response
+    
+    ## Calcule le délai avant la prochaine tentative
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """
+        Calcule le délai avant la prochaine tentative.
+        
+        Utilise Retry-After si le serveur le fournit, sinon un backoff
+        exponentiel avec gigue complète (full jitter).
+        
+        Args:
+            attempt (int): Numéro de la tentative (0 pour la première)
+            response (Optional[requests.Response]): Réponse ayant échoué
+            
+        Returns:
+            float: Délai en secondes
+        """
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    wait = float(retry_after)
+                    if math.isfinite(wait):
+                        return min(max(wait, 0.0), self.max_backoff)
+                except ValueError:
+                    # Retry-After peut aussi être une date HTTP
+                    try:
+                        retry_at = parsedate_to_datetime(retry_after)
+                        wait = (retry_at - datetime.now(retry_at.tzinfo)).total_seconds()
+                        return min(max(wait, 0.0), self.max_backoff)
+                    except (TypeError, ValueError):
+                        pass
+        
+        backoff = min(self.backoff_factor * (2 ** attempt), self.max_backoff)
+        return random.uniform(0, backoff)
+    
+    ## Ferme toutes les connexions du pool
+    def close(self) -> None:
+        """Ferme toutes les connexions du pool."""
+        self.session.close()
+
+# Transport partagé, créé à la première utilisation
+_http_transport: Optional[HTTPTransport] = None
+_http_transport_lock = threading.Lock()
+
+## Retourne le transport HTTP partagé par tous les clients
+def get_http_transport() -> HTTPTransport:
+    """
+    Retourne le transport HTTP partagé par tous les clients.
+    
+    Returns:
+        HTTPTransport: Instance unique du transport
+    """
+    global _http_transport
+    with _http_transport_lock:
+        if _http_transport is None:
+            _http_transport = HTTPTransport()
+        return _http_transport
+
+## Cache des identifiants de plateforme (lieu Google, application, entreprise Trustpilot)
+class ResolutionCache:
+    """
+    Cache des résolutions nom -> identifiant de plateforme.
+    
+    Les identifiants changent très rarement : une résolution réussie est
+    conservée ttl secondes. Une recherche sans résultat est aussi mémorisée
+    (cache négatif), pendant negative_ttl secondes seulement. Les erreurs
+    réseau ou de quota ne sont jamais mises en cache. Les entrées sont
+    gardées en mémoire et dans une table SQLite persistante entre les
+    redémarrages.
+    
+    Attributes:
+        ttl (float): Durée de vie d'une résolution réussie en secondes
+        negative_ttl (float): Durée de vie d'une résolution sans résultat
+        path (Optional[str]): Chemin du fichier SQLite (None: mémoire seule)
+        hits (int): Nombre de lectures servies par le cache
+        misses (int): Nombre de lectures absentes ou expirées
+    """
+    
+    ## Initialise le cache et charge les entrées encore valides
+    def __init__(self, path: Optional[str] = RESOLUTION_CACHE_PATH,
+                 ttl: float = RESOLUTION_CACHE_TTL,
+                 negative_ttl: float = RESOLUTION_CACHE_NEGATIVE_TTL):
+        """
+        Initialise le cache et charge les entrées encore valides.
+        
+        Args:
+            path (Optional[str]): Chemin du fichier SQLite (None ou vide:
+                pas de persistance)
+            ttl (float): Durée de vie d'une résolution réussie en secondes
+            negative_ttl (float): Durée de vie d'une résolution sans résultat
+        """
+        self.path = path or None
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._db = None
+        
+        if self.path:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS resolution_cache ("
+                "key TEXT PRIMARY KEY, value TEXT, expires_at REAL NOT NULL)"
+            )
+            now = time.time()
+            self._db.execute("DELETE FROM resolution_cache WHERE expires_at < ?", (now,))
+            self._db.commit()
+            for key, value, expires_at in self._db.execute(
+                    "SELECT key, value, expires_at FROM resolution_cache"):
+                self._entries[key] = (expires_at, value)
+    
+    ## Calcule la clé de cache d'une recherche
+    @staticmethod
+    def make_key(platform: str, *query: str) -> str:
+        """
+        Calcule la clé de cache d'une recherche.
+        
+        Args:
+            platform (str): Plateforme interrogée
+            *query (str): Termes de la recherche (nom, localisation...)
+            
+        Returns:
+            str: Clé normalisée (minuscules, espaces réduits)
+        """
+        terms = (' '.join(unicodedata.normalize('NFC', str(term)).lower().split()) for term in query)
+        return '\x1f'.join((platform, *terms))
+    
+    ## Lit une résolution
+    def get(self, key: str) -> tuple:
+        """
+        Lit une résolution.
+        
+        Args:
+            key (str): Clé calculée par make_key
+            
+        Returns:
+            tuple: (True, identifiant ou None pour un résultat négatif) si
+                l'entrée est valide, sinon (False, None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= time.time():
+                self.hits += 1
+                return True, entry[1]
+            self.misses += 1
+            return False, None
+    
+    ## Enregistre une résolution
+    def set(self, key: str, value: Optional[str]) -> None:
+        """
+        Enregistre une résolution (None: recherche sans résultat).
+        
+        Args:
+            key (str): Clé calculée par make_key
+            value (Optional[str]): Identifiant trouvé, ou None
+        """
+        expires_at = time.time() + (self.ttl if value is not None else self.negative_ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO resolution_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, value, expires_at)
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"Erreur lors de l'enregistrement de la résolution: {e}")
+    
+    ## Supprime les résolutions pointant vers un identifiant devenu invalide
+    def invalidate_value(self, platform: str, value: str) -> int:
+        """
+        Supprime les résolutions d'une plateforme pointant vers un identifiant
+        devenu invalide (lieu, application ou entreprise supprimés).
+        
+        Les clients de plateforme ne connaissent que l'identifiant lors de la
+        récupération des avis : les clés concernées sont retrouvées par valeur.
+        
+        Args:
+            platform (str): Plateforme de l'identifiant
+            value (str): Identifiant rejeté par la plateforme
+            
+        Returns:
+            int: Nombre de résolutions supprimées
+        """
+        prefix = platform + '\x1f'
+        with self._lock:
+            keys = [key for key, (_, cached) in self._entries.items()
+                    if cached == value and key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            if keys and self._db is not None:
+                try:
+                    self._db.executemany("DELETE FROM resolution_cache WHERE key = ?", [(key,) for key in keys])
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"Erreur lors de la suppression de la résolution: {e}")
+        if keys:
+            print(f"Résolution invalidée: {platform} {value}")
+        return len(keys)
+    
+    ## Retourne les compteurs d'utilisation du cache
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les compteurs d'utilisation du cache.
+        
+        Returns:
+            Dict[str, Any]: Succès, échecs, taux de succès et nombre d'entrées
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries)
+            }
+
+# Cache des résolutions partagé, créé à la première utilisation
+_resolution_cache: Optional[ResolutionCache] = None
+_resolution_cache_lock = threading.Lock()
+
+## Retourne le cache des résolutions partagé par tous les clients
+def get_resolution_cache() -> ResolutionCache:
+    """
+    Retourne le cache des résolutions partagé par tous les clients.
+    
+    Returns:
+        ResolutionCache: Instance unique du cache
+    """
+    global _resolution_cache
+    with _resolution_cache_lock:
+        if _resolution_cache is None:
+            _resolution_cache = ResolutionCache()
+        return _resolution_cache
+
+## Calcule l'identifiant stable d'un avis
+def stable_review_id(prefix: str, native_id: Any = None, *content: Any) -> str:
+    """
+    Calcule l'identifiant stable d'un avis, identique d'une collecte à l'autre.
+    
+    L'identifiant natif de la plateforme est utilisé s'il existe; sinon une
+    empreinte du contenu (auteur, date, texte...) le remplace.
+    
+    Args:
+        prefix (str): Préfixe de la plateforme ('google', 'appstore'...)
+        native_id (Any): Identifiant de l'avis sur la plateforme
+        *content (Any): Champs identifiant l'avis, à défaut d'identifiant natif
+        
+    Returns:
+        str: Identifiant de la forme '<prefix>_<id>'
+    """
+    if native_id not in (None, ''):
+        return f"{prefix}_{native_id}"
+    digest = hashlib.sha1(
+        '\x1f'.join('' if part is None else str(part) for part in content).encode('utf-8')
+    ).hexdigest()[:16]
+    return f"{prefix}_{digest}"
+
+## Indique si une erreur HTTP signale une ressource introuvable
+def is_not_found(error: Exception) -> bool:
+    """
+    Indique si une erreur HTTP signale une ressource introuvable (404).
+    
+    Args:
+        error (Exception): Erreur levée par le transport
+        
+    Returns:
+        bool: True pour une réponse 404
+    """
+    response = getattr(error, 'response', None)
+    return response is not None and response.status_code == 404
+
+## Classe principale pour la gestion des avis Google Places
+## Gère toutes les interactions avec l'API Google Places
+
+class GoogleReviewsAPI:
+    """
+    Client pour l'API Google Places Reviews.
+    
+    Cette classe gère l'interaction avec l'API Google Places pour:
+    - Rechercher des entreprises
+    - Récupérer leurs avis
+    - Formater les données pour l'analyse
+    
+    Attributes:
+        api_key (str): Clé d'API Google Places
+        base_url (str): URL de base pour les requêtes API
+        transport (HTTPTransport): Transport HTTP partagé
+        resolution_cache (ResolutionCache): Cache des identifiants de lieu
+    """
+
+     ## Initialise le client API avec la clé d'authentification
+    
+    def __init__(self, api_key: str = GOOGLE_API_KEY, transport: Optional[HTTPTransport] = None,
+                 resolution_cache: Optional[ResolutionCache] = None):
+        """
+        Initialise le client API avec la clé d'authentification.
+        
+        Args:
+            api_key (str): Clé d'API Google Places
+            transport (Optional[HTTPTransport]): Transport HTTP (défaut: partagé)
+            resolution_cache (Optional[ResolutionCache]): Cache des
+                identifiants (défaut: partagé)
+        """
+        self.api_key = api_key
+        self.base_url = GOOGLE_PLACES_BASE_URL
+        self.transport = transport or get_http_transport()
+        self.resolution_cache = resolution_cache or get_resolution_cache()
+
+      ## Recherche l'ID unique d'un lieu sur Google Places
+    def get_place_id(self, business_name: str, location: str) -> Optional[str]:
+        """
+        Recherche l'ID unique d'un lieu sur Google Places.
+        
+        Le résultat, y compris une recherche sans résultat, est mis en cache.
+        
+        Args:
+            business_name (str): Nom de l'entreprise
+            location (str): Localisation (ville, pays)
+            
+        Returns:
+            Optional[str]: ID du lieu ou None si non trouvé
+        """
+        cache_key = ResolutionCache.make_key('google', business_name, location)
+        found, place_id = self.resolution_cache.get(cache_key)
+        if found:
+            return place_id
+        
+        endpoint = f"{self.base_url}/findplacefromtext/json"
+        params = {
+            'input': f"{business_name} {location}",
+            'inputtype': 'textquery',
+            'fields': 'place_id',
+            'key': self.api_key
+        }
+        
+        try:
+            response = self.transport.get(endpoint, params=params, platform='google')
+            response.raise_for_status()
+            data = response.json()
+            
+            if data['status'] == 'OK' and data['candidates']:
+                place_id = data['candidates'][0]['place_id']
+            elif data['status'] not in ('OK', 'ZERO_RESULTS'):
+                # Quota ou clé invalide : réponse non mise en cache
+                print(f"Erreur lors de la recherche du lieu: {data['status']}")
+                return None
+            
+        except requests.exceptions.RequestException as e:
+            print(f"Erreur lors de la recherche du lieu: {e}")
+            return None
+        
+        self.resolution_cache.set(cache_key, place_id)
+        return place_id
+        
+## Récupère les avis clients pour un lieu donné
+    def get_reviews(self, place_id: str, max_results: int = 100,
+                    since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Récupère les avis clients pour un lieu donné.
+        
+        Args:
+            place_id (str): ID du lieu Google
+            max_results (int): Nombre maximum d'avis à récupérer
+            since (Optional[str]): Date limite (YYYY-MM-DD) en deçà de laquelle
+                les avis sont ignorés
+            
+        Returns:
+            List[Dict[str, Any]]: Liste des avis formatés
+        """
+        endpoint = f"{self.base_url}/details/json"
+        params = {
+            'place_id': place_id,
+            'fields': 'reviews,rating,user_ratings_total',
+            'key': self.api_key,
+            'language': 'fr'
+        }
+        
+        try:
+            response = self.transport.get(endpoint, params=params, platform='google')
+            response.raise_for_status()
+            data = response.json()
+            
+            if data['status'] == 'OK':
+                reviews = data['result'].get('reviews', [])
+                if since:
+                    reviews = [review for review in reviews
+                               if datetime.fromtimestamp(review['time']).strftime('%Y-%m-%d') >= since]
+                # L'API Places ne fournit pas d'identifiant d'avis
+                return [{
+                    'id': stable_review_id('google', None, review.get('author_url') or review['author_name'],
+                                           review['time'], review['text']),
+                    'platform': 'Google Reviews',
+                    'author': review['author_name'],
+                    'rating': review['rating'],
+                    'text': review['text'],
+                    'date': datetime.fromtimestamp(review['time']).strftime('%Y-%m-%d'),
+                    'language': review['language']
+                } for review in reviews[:max_results]]
+            if data['status'] in ('NOT_FOUND', 'INVALID_REQUEST'):
+                # Lieu supprimé ou fusionné : il sera résolu de nouveau
+                self.resolution_cache.invalidate_value('google', place_id)
+            return []
+            
+        except requests.exceptions.RequestException as e:
+            print(f"Erreur lors de la récupération des avis: {e}")
+            if is_not_found(e):
+                self.resolution_cache.invalidate_value('google', place_id)
+            return []
+
+## Classe pour la gestion des avis de l'App Store
+## Gère la récupération et le formatage des avis depuis l'App Store
+class AppStoreAPI:
+    """
+    Client pour l'API Apple App Store.
+    
+    Gère la récupération des avis depuis l'App Store en:
+    - Recherchant les applications
+    - Collectant leurs avis
+    - Formatant les données pour l'analyse
+    
+    Attributes:
+        base_url (str): URL de base pour les requêtes API
+        country (str): Storefront par défaut
+        transport (HTTPTransport): Transport HTTP partagé
+        resolution_cache (ResolutionCache): Cache des identifiants d'application
+    """
+    
+    # Pagination du flux RSS customerreviews
+    PAGE_SIZE = 50
+    MAX_PAGES = 10
+
+  ## Initialise le client API App Store
+    def __init__(self, transport: Optional[HTTPTransport] = None,
+                 resolution_cache: Optional[ResolutionCache] = None):
+        """
+        Initialise le client API App Store.
+        
+        Args:
+            transport (Optional[HTTPTransport]): Transport HTTP (défaut: partagé)
+            resolution_cache (Optional[ResolutionCache]): Cache des
+                identifiants (défaut: partagé)
+        """
+        self.base_url = APPSTORE_BASE_URL
+        self.country = 'fr'
+        self.transport = transport or get_http_transport()
+        self.resolution_cache = resolution_cache or get_resolution_cache()
+    
+## Recherche l'ID d'une application sur l'App Store
+    def get_app_id(self, app_name: str) -> Optional[str]:
+        """
+        Recherche l'ID d'une application sur l'App Store.
+        
+        Le résultat, y compris une recherche sans résultat, est mis en cache.
+        
+        Args:
+            app_name (str): Nom de l'application
+            
+        Returns:
+            Optional[str]: ID de l'application ou None si non trouvée
+        """
+        cache_key = ResolutionCache.make_key('appstore', app_name, self.country)
+        found, app_id = self.resolution_cache.get(cache_key)
+        if found:
+            return app_id
+        
+        endpoint = f"{self.base_url}/search"
+        params = {
+            'term': app_name,
+            'entity': 'software',
+            'country': self.country
+        }
+        
+        try:
+            response = self.transport.get(endpoint, params=params, platform='appstore')
+            response.raise_for_status()
+            data = response.json()
+            
+            app_id = str(data['results'][0]['trackId']) if data['resultCount'] > 0 else None
+            
+        except requests.exceptions.RequestException as e:
+            print(f"Erreur lors de la recherche de l'application: {e}")
+            return None
+        
+        self.resolution_cache.set(cache_key, app_id)
+        return app_id
+
+  ## Récupère et formate les avis d'une application
+    def get_reviews(self, app_id: str, max_results: int = 100,
+                    countries: Optional[List[str]] = None,
+                    max_workers: int = APPSTORE_MAX_FANOUT,
+                    since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Récupère les avis pour une application donnée.
+        
+        Le flux RSS est paginé (50 avis par page, 10 pages au plus par pays).
+        Les pages nécessaires de chaque pays sont récupérées en parallèle
+        avec un nombre de requêtes simultanées borné, puis fusionnées du plus
+        récent au plus ancien.
+        
+        Avec since, les pages sont demandées une à une pour chaque pays (les
+        pays restant en parallèle) et le parcours d'un pays s'arrête dès
+        qu'une page atteint des avis antérieurs à since.
+        
+        Args:
+            app_id (str): ID de l'application
+            max_results (int): Nombre maximum d'avis à récupérer
+            countries (Optional[List[str]]): Codes pays des storefronts
+                (défaut: storefront du client)
+            max_workers (int): Nombre maximum de pages récupérées simultanément
+            since (Optional[str]): Date limite (YYYY-MM-DD) en deçà de laquelle
+                les avis sont ignorés
+            
+        Returns:
+            List[Dict[str, Any]]: Liste des avis formatés
+        """
+        countries = countries or [self.country]
+        pages = min(self.MAX_PAGES, max(1, -(-max_results // self.PAGE_SIZE)))
+        
+        entries = []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(countries) * pages))) as executor:
+            if not since:
+                tasks = [(country, page) for country in countries for page in range(1, pages + 1)]
+                entries = self._fetch_pages(executor, app_id, tasks)
+            else:
+                active = list(countries)
+                for page in range(1, pages + 1):
+                    fetched = self._fetch_pages(executor, app_id, [(country, page) for country in active])
+                    entries.extend(item for item in fetched if item[1]['updated']['label'][:10] >= since)
+                    # Un pays s'arrête à sa première page vide ou atteignant since
+                    reached = {country for country, review in fetched
+                               if review['updated']['label'][:10] < since}
+                    returned = {country for country, _ in fetched}
+                    active = [country for country in active
+                              if country in returned and country not in reached]
+                    if not active:
+                        break
+        
+        # Fusion par date décroissante, sans doublons entre pages ou pays
+        seen = set()
+        merged = []
+        for country, review in sorted(entries, key=lambda item: item[1]['updated']['label'], reverse=True):
+            entry_id = review.get('id', {}).get('label')
+            if entry_id is not None:
+                if entry_id in seen:
+                    continue
+                seen.add(entry_id)
+            merged.append((country, review))
+        
+        return [{
+            'id': stable_review_id('appstore', review.get('id', {}).get('label'),
+                                   review['author']['name']['label'], review['updated']['label'],
+                                   review['content']['label']),
+            'platform': 'Apple App Store',
+            'author': review['author']['name']['label'],
+            'rating': int(review['im:rating']['label']),
+            'text': review['content']['label'],
+            'date': review['updated']['label'][:10],
+            'title': review['title']['label'],
+            'country': country
+        } for country, review in merged[:max_results]]
+    
+  ## Récupère un ensemble de pages en parallèle
+    def _fetch_pages(self, executor: ThreadPoolExecutor, app_id: str,
+                     tasks: List[tuple]) -> List[tuple]:
+        """
+        Récupère un ensemble de pages en parallèle; une page en erreur est ignorée.
+        
+        Si la première page de tous les pays demandés répond 404, l'application
+        n'existe plus : sa résolution est retirée du cache.
+        
+        Args:
+            executor (ThreadPoolExecutor): Pool des requêtes
+            app_id (str): ID de l'application
+            tasks (List[tuple]): Couples (pays, numéro de page)
+            
+        Returns:
+            List[tuple]: Couples (pays, entrée brute), dans l'ordre des tâches
+        """
+        entries = []
+        first_pages = sum(1 for _, page in tasks if page == 1)
+        not_found = 0
+        futures = [executor.submit(with_current_trace(self._fetch_page), app_id, country, page) for country, page in tasks]
+        for (_, page), future in zip(tasks, futures):
+            try:
+                entries.extend(future.result())
+            except requests.exceptions.RequestException as e:
+                print(f"Erreur lors de la récupération des avis: {e}")
+                if page == 1 and is_not_found(e):
+                    not_found += 1
+        if first_pages and not_found == first_pages:
+            self.resolution_cache.invalidate_value('appstore', app_id)
+        return entries
+    
+  ## Récupère une page du flux RSS des avis pour un pays
+    def _fetch_page(self, app_id: str, country: str, page: int) -> List[tuple]:
+        """
+        Récupère une page du flux RSS des avis pour un pays.
+        
+        Args:
+            app_id (str): ID de l'application
+            country (str): Code pays du storefront
+            page (int): Numéro de page (1 à 10)
+            
+        Returns:
+            List[tuple]: Couples (pays, entrée brute) contenant un avis
+        """
+        endpoint = (f"{self.base_url}/{country}/rss/customerreviews/page={page}"
+                    f"/id={app_id}/sortBy=mostRecent/json")
+        
+        response = self.transport.get(endpoint, platform='appstore')
+        response.raise_for_status()
+        data = response.json()
+        
+        reviews = data.get('feed', {}).get('entry', [])
+        if not isinstance(reviews, list):
+            reviews = [reviews]
+        
+        # Certaines pages commencent par une entrée décrivant l'application
+        return [(country, review) for review in reviews if 'im:rating' in review]
+
+## Classe pour la gestion des avis Trustpilot
+## Gère l'interaction avec l'API Trustpilot et le formatage des données
+class TrustpilotAPI:
+    """
+    Client pour l'API Trustpilot.
+    
+    Gère l'interaction avec l'API Trustpilot pour:
+    - Identifier les entreprises
+    - Collecter leurs avis
+    - Formater les données pour l'analyse
+    
+    Attributes:
+        base_url (str): URL de base de l'API
+        business_units_url (str): URL pour les endpoints business
+        reviews_url (str): URL pour les endpoints des avis
+        transport (HTTPTransport): Transport HTTP partagé
+        resolution_cache (ResolutionCache): Cache des identifiants d'entreprise
+    """
+    
+    # Taille de page maximale acceptée par l'API
+    MAX_PER_PAGE = 100
+    
+   ## Initialise le client API Trustpilot avec les URLs de base  
+    def __init__(self, transport: Optional[HTTPTransport] = None,
+                 resolution_cache: Optional[ResolutionCache] = None):
+        """
+        Initialise le client API Trustpilot.
+        
+        Args:
+            transport (Optional[HTTPTransport]): Transport HTTP (défaut: partagé)
+            resolution_cache (Optional[ResolutionCache]): Cache des
+                identifiants (défaut: partagé)
+        """
+        self.base_url = TRUSTPILOT_BASE_URL
+        self.business_units_url = f"{self.base_url}/business-units"
+        self.reviews_url = f"{self.base_url}/reviews"
+        self.transport = transport or get_http_transport()
+        self.resolution_cache = resolution_cache or get_resolution_cache()
+
+    ## Recherche l'ID d'une entreprise sur Trustpilot
+    def get_business_unit(self, domain: str) -> Optional[str]:
+        """
+        Recherche l'ID d'une entreprise sur Trustpilot.
+        
+        Le résultat, y compris un domaine inconnu (404), est mis en cache.
+        
+        Args:
+            domain (str): Nom de domaine de l'entreprise
+            
+        Returns:
+            Optional[str]: ID de l'entreprise ou None si non trouvée
+        """
+        cache_key = ResolutionCache.make_key('trustpilot', domain)
+        found, business_unit_id = self.resolution_cache.get(cache_key)
+        if found:
+            return business_unit_id
+        
+        endpoint = f"{self.business_units_url}/find"
+        params = {'domain': domain}
+        
+        try:
+            response = self.transport.get(endpoint, params=params, platform='trustpilot')
+            if response.status_code == 404:
+                business_unit_id = None
+            else:
+                response.raise_for_status()
+                business_unit_id = response.json()['id']
+            
+        except requests.exceptions.RequestException as e:
+            print(f"Erreur lors de la recherche de l'entreprise: {e}")
+            return None
+        
+        self.resolution_cache.set(cache_key, business_unit_id)
+        return business_unit_id
+        
+    ## Récupère et formate les avis d'une entreprise
+    def get_reviews(self, business_unit_id: str = None, max_results: int = 100,
+                    since: Optional[str] = None,
+                    until_id: Optional[str] = None,
+                    skip_ids: Optional[Container] = None) -> List[Dict[str, Any]]:
+        """
+        Récupère les avis pour une entreprise donnée.
+        
+        Parcourt autant de pages que nécessaire pour atteindre max_results
+        (voir iter_reviews pour un parcours en flux).
+        
+        Args:
+            business_unit_id (str): ID de l'entreprise
+            max_results (int): Nombre maximum d'avis à récupérer
+            since (Optional[str]): Date limite (YYYY-MM-DD) en deçà de laquelle
+                les avis sont ignorés
+            until_id (Optional[str]): Identifiant de l'avis le plus récent déjà
+                connu; la collecte s'arrête dès qu'elle l'atteint
+            skip_ids (Optional[Container]): Identifiants d'avis déjà collectés,
+                ignorés sans compter dans max_results
+            
+        Returns:
+            List[Dict[str, Any]]: Liste des avis formatés
+        """
+        if not business_unit_id:
+            return []
+        return list(self.iter_reviews(business_unit_id, limit=max_results, since=since,
+                                      until_id=until_id, skip_ids=skip_ids))
+    
+    ## Parcourt toutes les pages d'avis d'une entreprise sous forme de flux
+    def iter_reviews(self, business_unit_id: str, limit: Optional[int] = None,
+                     since: Optional[str] = None,
+                     until_id: Optional[str] = None,
+                     per_page: int = 100,
+                     skip_ids: Optional[Container] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Parcourt toutes les pages d'avis d'une entreprise sous forme de flux.
+        
+        Les avis sont demandés du plus récent au plus ancien et produits au
+        fur et à mesure, page par page. La page suivante est préchargée dans
+        un thread pendant que la page courante est consommée, ce qui garde
+        une empreinte mémoire constante (deux pages au plus).
+        
+        Args:
+            business_unit_id (str): ID de l'entreprise
+            limit (Optional[int]): Nombre maximum d'avis à produire
+            since (Optional[str]): Date limite (YYYY-MM-DD); le parcours
+                s'arrête au premier avis plus ancien
+            until_id (Optional[str]): Identifiant d'avis déjà connu; le
+                parcours s'arrête en l'atteignant
+            per_page (int): Taille des pages demandées (100 maximum)
+            skip_ids (Optional[Container]): Identifiants d'avis ignorés sans
+                compter dans limit
+            
+        Yields:
+            Dict[str, Any]: Avis formaté
+        """
+        if limit is not None and limit <= 0:
+            return
+        
+        per_page = max(1, min(per_page, self.MAX_PER_PAGE, limit or self.MAX_PER_PAGE))
+        executor = ThreadPoolExecutor(max_workers=1)
+        pending = None
+        try:
+            page = 1
+            pending = executor.submit(with_current_trace(self._fetch_page), business_unit_id, page, per_page)
+            index = 0
+            
+            while pending is not None:
+                try:
+                    reviews = pending.result()
+                except requests.exceptions.RequestException as e:
+                    print(f"Erreur lors de la récupération des avis: {e}")
+                    if page == 1 and is_not_found(e):
+                        # Entreprise supprimée : elle sera résolue de nouveau
+                        self.resolution_cache.invalidate_value('trustpilot', business_unit_id)
+                    return
+                
+                # Préchargement de la page suivante pendant le traitement
+                pending = None
+                if len(reviews) >= per_page:
+                    page += 1
+                    pending = executor.submit(with_current_trace(self._fetch_page), business_unit_id, page, per_page)
+                
+                for review in reviews:
+                    formatted = self._format_review(review)
+                    if since and formatted['date'] < since:
+                        return
+                    if until_id and formatted['id'] == until_id:
+                        return
+                    if skip_ids is not None and formatted['id'] in skip_ids:
+                        continue
+                    yield formatted
+                    index += 1
+                    if limit is not None and index >= limit:
+                        return
+        finally:
+            # Page préchargée inutile : annulée si elle n'a pas démarré
+            # (cancel_futures n'existe qu'à partir de Python 3.9)
+            if pending is not None:
+                pending.cancel()
+            executor.shutdown(wait=False)
+    
+    ## Récupère une page brute d'avis
+    def _fetch_page(self, business_unit_id: str, page: int, per_page: int) -> List[Dict[str, Any]]:
+        """
+        Récupère une page brute d'avis.
+        
+        Args:
+            business_unit_id (str): ID de l'entreprise
+            page (int): Numéro de page (à partir de 1)
+            per_page (int): Nombre d'avis par page
+            
+        Returns:
+            List[Dict[str, Any]]: Avis bruts renvoyés par l'API
+        """
+        endpoint = f"{self.reviews_url}/business-unit/{business_unit_id}"
+        params = {
+            'language': 'fr',
+            'orderBy': 'createdat.desc',
+            'page': page,
+            'perPage': per_page
+        }
+        
+        response = self.transport.get(endpoint, params=params, platform='trustpilot')
+        response.raise_for_status()
+        return response.json().get('reviews', [])
+    
+    ## Formate un avis brut Trustpilot
+    @staticmethod
+    def _format_review(review: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Formate un avis brut Trustpilot.
+        
+        Args:
+            review (Dict[str, Any]): Avis brut renvoyé par l'API
+            
+        Returns:
+            Dict[str, Any]: Avis formaté
+        """
+        return {
+            'id': stable_review_id('trustpilot', review.get('id'), review['consumer']['displayName'],
+                                   review['createdAt'], review['text']),
+            'platform': 'Trustpilot',
+            'author': review['consumer']['displayName'],
+            'rating': review['stars'],
+            'text': review['text'],
+            'date': review['createdAt'][:10],
+            'title': review.get('title', '')
+        }
+
+## Estime grossièrement le nombre de tokens d'un texte
+def estimate_tokens(text: str) -> int:
+    """
+    Estime grossièrement le nombre de tokens d'un texte (environ 4 caractères par token).
+    
+    Args:
+        text (str): Texte à estimer
+        
+    Returns:
+        int: Nombre de tokens estimé
+    """
+    return len(text) // 4 + 1
+
+## Déduit le sentiment d'un score entre 0 et 1
+def sentiment_from_score(score: float) -> str:
+    """
+    Déduit le sentiment d'un score entre 0 et 1.
+    
+    Args:
+        score (float): Score de sentiment
+        
+    Returns:
+        str: 'positive', 'neutral' ou 'negative'
+    """
+    return 'positive' if score >= 0.7 else 'negative' if score <= 0.3 else 'neutral'
+
+## Identifie la version d'un moteur d'analyse et de son prompt
+def analysis_version(engine: str, prompt: str = '') -> str:
+    """
+    Identifie la version d'un moteur d'analyse et de son prompt.
+    
+    Args:
+        engine (str): Nom du modèle ou du moteur local
+        prompt (str): Prompt système utilisé (vide pour un moteur local)
+        
+    Returns:
+        str: Identifiant de version enregistré avec chaque analyse
+    """
+    if not prompt:
+        return engine
+    return f"{engine}:{hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8]}"
+
+# Mots vides français (et mots d'opinion génériques) exclus des sujets
+FRENCH_STOPWORDS = frozenset("""
+a afin ai aie aient aies ait al alors as au aucun aucune aupres auquel aura aurai auraient aurais
+aurait auras aurez auriez aurions aurons auront aussi autre autres aux auxquelles auxquels avaient
+avais avait avant avec avez aviez avions avoir avons ayant ayez ayons bon bonne c ça ca car ce ceci
+cela celle celles celui cependant certain certaine certains ces cet cette ceux chaque chez ci
+comme comment d dans de des deux doit donc dont du elle elles en encore es est et etaient etais
+etait etant ete etes etiez etions etre eu eue eues eumes eurent eus eusse eussent eusses eussiez
+eussions eut eux fait faire fais faut fois font furent fus fusse fussent fusses fussiez fussions
+fut ici il ils j je jusqu jusque l la le les leur leurs lui m ma mais me meme memes mes moi moins
+mon n ne ni non nos notre nous on ont ou où par parce pas peu peut plus pour pourquoi qu quand que
+quel quelle quelles quels qui quoi s sa sans se sera serai seraient serais serait seras serez
+seriez serions serons seront ses si sien son sont sous soyez soyons suis sur t ta te tes toi ton
+tous tout toute toutes tres très trop tu un une unes uns va vais vont vos votre vous vu y à é
+été être avis bien mal super top vraiment tellement toujours jamais rien chose choses merci
+bonjour cordialement déjà deja là après apres depuis
+""".split())
+
+# Mots dont la forme se termine par s ou x au singulier
+INVARIABLE_WORDS = frozenset({
+    'accès', 'acces', 'avis', 'bras', 'cas', 'choix', 'colis', 'corps', 'dos', 'fois', 'frais',
+    'mois', 'pays', 'poids', 'prix', 'procès', 'process', 'souris', 'succès', 'temps', 'voix'
+})
+
+# Pluriels en -x ramenés au singulier par une liste fermée : la plupart des
+# mots en -eux/-oux sont des singuliers ("heureux", "doux") et seuls
+# certains -aux sont des pluriels de -al ("travaux" n'en est pas un)
+IRREGULAR_PLURALS = {
+    **{word: word[:-3] + 'al' for word in (
+        'animaux', 'canaux', 'chevaux', 'généraux', 'hôpitaux', 'journaux', 'locaux', 'normaux',
+        'principaux', 'signaux', 'sociaux', 'spéciaux', 'totaux', 'tribunaux'
+    )},
+    **{word: word[:-1] for word in (
+        'adieux', 'aveux', 'cheveux', 'enjeux', 'feux', 'jeux', 'lieux', 'milieux', 'neveux', 'voeux', 'vœux',
+        'bijoux', 'cailloux', 'choux', 'genoux', 'hiboux', 'joujoux', 'poux'
+    )}
+}
+
+# Noms en -ai dont le pluriel en -ais est ramené au singulier (les autres
+# mots en -ais sont le plus souvent invariables : "mauvais", "français")
+AI_NOUNS = frozenset({'balai', 'délai', 'delai', 'essai', 'minerai', 'quai', 'remblai'})
+
+## Réduit un mot à une forme de base (lemmatisation légère)
+def light_lemma(word: str) -> str:
+    """
+    Réduit un mot français à une forme de base par quelques règles simples.
+    
+    Seuls les pluriels réguliers sont ramenés au singulier (-s, -x après
+    -eau, -ais des noms de AI_NOUNS) ainsi que les pluriels en -x connus
+    (IRREGULAR_PLURALS) : les variantes fréquentes d'un même sujet
+    ("livraisons", "livraison") partagent ainsi la même forme, sans
+    altérer les singuliers en -x ("heureux", "travaux").
+    
+    Args:
+        word (str): Mot en minuscules
+        
+    Returns:
+        str: Forme de base
+    """
+    if len(word) <= 3 or word in INVARIABLE_WORDS:
+        return word
+    if word in IRREGULAR_PLURALS:
+        return IRREGULAR_PLURALS[word]
+    if word.endswith('eaux'):
+        return word[:-1]
+    if word.endswith('ais') and word[:-1] in AI_NOUNS:
+        return word[:-1]
+    if word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+## Ramène un libellé de sujet à sa forme canonique
+def canonical_topic(label: str) -> str:
+    """
+    Ramène un libellé de sujet à sa forme canonique.
+    
+    Les articles et mots vides sont retirés et chaque mot est ramené à sa
+    forme de base : "Les livraisons", "livraison" et "la livraison"
+    deviennent "livraison".
+    
+    Args:
+        label (str): Libellé en minuscules
+        
+    Returns:
+        str: Libellé canonique (le libellé d'origine s'il ne contient que des mots vides)
+    """
+    words = [light_lemma(word) for word in re.findall(r"\w+", label) if word not in FRENCH_STOPWORDS]
+    return ' '.join(words) or label
+
+## Normalise une liste de sujets renvoyée par le LLM
+def normalize_topics(topics: Any) -> List[str]:
+    """
+    Normalise une liste de sujets renvoyée par le LLM.
+    
+    Les sujets sont mis en minuscules, débarrassés de la ponctuation et des
+    espaces superflus, ramenés à leur forme canonique (canonical_topic) puis
+    dédoublonnés en conservant leur ordre.
+    
+    Args:
+        topics (Any): Liste de sujets (toute autre valeur est ignorée)
+        
+    Returns:
+        List[str]: Sujets normalisés
+    """
+    if not isinstance(topics, list):
+        return []
+    
+    normalized = []
+    for topic in topics:
+        label = ' '.join(unicodedata.normalize('NFC', str(topic)).lower().split())
+        label = canonical_topic(label.strip(' .,;:!?"\'-()[]'))
+        if label and label not in normalized:
+            normalized.append(label)
+    return normalized
+
+## Valide et normalise une analyse structurée renvoyée par le LLM
+def parse_analysis(item: Any) -> Optional[Dict[str, Any]]:
+    """
+    Valide et normalise une analyse structurée renvoyée par le LLM.
+    
+    Args:
+        item (Any): Objet JSON décodé (score, sentiment, confidence, topics)
+        
+    Returns:
+        Optional[Dict[str, Any]]: Analyse normalisée ou None si le score est invalide
+    """
+    if not isinstance(item, dict):
+        return None
+    try:
+        score = min(max(float(item['score']), 0.0), 1.0)
+    except (KeyError, TypeError, ValueError):
+        return None
+    
+    sentiment = item.get('sentiment')
+    if sentiment not in ('positive', 'neutral', 'negative'):
+        sentiment = sentiment_from_score(score)
+    try:
+        confidence = min(max(float(item.get('confidence', 0.8)), 0.0), 1.0)
+    except (TypeError, ValueError):
+        confidence = 0.8
+    
+    return {
+        'sentiment': sentiment,
+        'score': score,
+        'topics': normalize_topics(item.get('topics')),
+        'confidence': confidence
+    }
+
+## Extrait le premier objet JSON d'une réponse textuelle du LLM
+def extract_json_object(content: str) -> Dict[str, Any]:
+    """
+    Extrait le premier objet JSON d'une réponse textuelle du LLM.
+    
+    Args:
+        content (str): Réponse brute du modèle
+        
+    Returns:
+        Dict[str, Any]: Objet JSON décodé
+        
+    Raises:
+        ValueError: Aucun objet JSON exploitable dans la réponse
+    """
+    start, end = content.find('{'), content.rfind('}')
+    if start < 0 or end < start:
+        raise ValueError("Réponse sans objet JSON")
+    data = json.loads(content[start:end + 1])
+    if not isinstance(data, dict):
+        raise ValueError("La réponse n'est pas un objet JSON")
+    return data
+
+## Moteur de sentiment local, sans appel réseau
+## Sert de premier niveau avant l'escalade vers le LLM
+class LocalSentimentScorer:
+    """
+    Moteur de sentiment local basé sur un lexique français et la note.
+    
+    Chaque avis reçoit un score lexical (somme des polarités des mots, avec
+    gestion des négations et des intensificateurs), combiné à la note en
+    étoiles lorsqu'elle est connue. La confiance est élevée quand la note est
+    tranchée et que le texte va dans le même sens; elle chute quand les deux
+    signaux se contredisent. Les avis peu sûrs sont destinés au LLM.
+    
+    Attributes:
+        rating_weight (float): Poids de la note dans le score final
+    """
+    
+    # Identifiant du moteur, enregistré avec chaque analyse locale
+    MODEL_NAME = 'local-lexicon-v1'
+    
+    # Polarité des mots courants dans les avis clients (-1 à 1)
+    LEXICON = {
+        'excellent': 1.0, 'excellente': 1.0, 'parfait': 1.0, 'parfaite': 1.0,
+        'génial': 1.0, 'géniale': 1.0, 'super': 0.8, 'top': 0.8, 'bravo': 0.8,
+        'merci': 0.5, 'bien': 0.5, 'bon': 0.5, 'bonne': 0.5, 'efficace': 0.7,
+        'rapide': 0.6, 'rapidement': 0.5, 'satisfait': 0.8, 'satisfaite': 0.8,
+        'recommande': 0.8, 'agréable': 0.7, 'aimable': 0.7, 'sympathique': 0.6,
+        'pratique': 0.5, 'simple': 0.4, 'fiable': 0.7, 'professionnel': 0.6,
+        'parfaitement': 0.8, 'impeccable': 0.9, 'ravi': 0.9, 'ravie': 0.9,
+        'adore': 0.9, 'aime': 0.6, 'facile': 0.5, 'qualité': 0.4, 'utile': 0.5,
+        'mauvais': -0.8, 'mauvaise': -0.8, 'nul': -1.0, 'nulle': -1.0,
+        'horrible': -1.0, 'catastrophique': -1.0, 'catastrophe': -1.0,
+        'déçu': -0.8, 'déçue': -0.8, 'décevant': -0.8, 'déception': -0.8,
+        'lent': -0.6, 'lente': -0.6, 'cher': -0.4, 'chère': -0.4,
+        'arnaque': -1.0, 'escroquerie': -1.0, 'inadmissible': -0.9,
+        'inacceptable': -0.9, 'problème': -0.5, 'problèmes': -0.5,
+        'bug': -0.6, 'bugs': -0.6, 'plante': -0.6, 'impossible': -0.6,
+        'retard': -0.6, 'attente': -0.3, 'fuir': -0.9,
+        'honteux': -1.0, 'incompétent': -0.9, 'incompétents': -0.9,
+        'désagréable': -0.7, 'médiocre': -0.8, 'pire': -0.9, 'éviter': -0.9,
+        'remboursement': -0.3, 'panne': -0.6, 'erreur': -0.5, 'inutile': -0.7
+    }
+    
+    # Mots qui inversent la polarité des mots suivants ('plus' n'en fait
+    # partie qu'après 'ne' : seul, c'est un comparatif)
+    NEGATIONS = frozenset({'pas', 'ne', 'n', 'jamais', 'aucun', 'aucune', 'sans', 'ni'})
+    
+    # Mots qui amplifient la polarité du mot suivant
+    INTENSIFIERS = {'très': 1.5, 'vraiment': 1.5, 'extrêmement': 2.0, 'tellement': 1.5, 'trop': 1.3}
+    
+    # Nombre de mots couverts par une négation (dans la même proposition)
+    NEGATION_WINDOW = 3
+    
+    ## Initialise le moteur
+    def __init__(self, rating_weight: float = 0.6):
+        """
+        Initialise le moteur.
+        
+        Args:
+            rating_weight (float): Poids de la note dans le score final
+        """
+        self.rating_weight = rating_weight
+    
+    ## Calcule la polarité lexicale brute d'un texte
+    def _lexical_polarity(self, text: str) -> float:
+        """
+        Calcule la polarité lexicale brute d'un texte.
+        
+        Args:
+            text (str): Texte de l'avis
+            
+        Returns:
+            float: Somme des polarités (positive ou négative, non bornée)
+        """
+        polarity = 0.0
+        negation = 0
+        boost = 1.0
+        for word in re.findall(r"\w+|[.,;:!?]", text.lower()):
+            if word in '.,;:!?':
+                # La ponctuation termine la portée d'une négation
+                negation = 0
+                boost = 1.0
+                continue
+            if word in self.NEGATIONS or (word == 'plus' and negation):
+                negation = self.NEGATION_WINDOW
+                continue
+            if word in self.INTENSIFIERS:
+                boost = self.INTENSIFIERS[word]
+                continue
+            
+            value = self.LEXICON.get(word)
+            if value is not None:
+                polarity += -value * boost if negation else value * boost
+            boost = 1.0
+            negation = max(0, negation - 1)
+        return polarity
+    
+    ## Évalue un lot d'avis en une passe
+    @traced('analysis.local')
+    def score_batch(self, texts: List[str], ratings: List[Optional[float]]) -> List[Dict[str, Any]]:
+        """
+        Évalue un lot d'avis en une passe.
+        
+        Args:
+            texts (List[str]): Textes des avis
+            ratings (List[Optional[float]]): Notes de 1 à 5 (None si inconnue)
+            
+        Returns:
+            List[Dict[str, Any]]: Sentiment, score, confiance et sujets (vides)
+                de chaque avis, dans l'ordre des textes
+        """
+        polarities = [self._lexical_polarity(text or '') for text in texts]
+        
+        # Score lexical ramené dans [0, 1] par une fonction softsign
+        lexical_scores = [0.5 + 0.5 * p / (abs(p) + 2.0) for p in polarities]
+        rating_scores = [
+            min(max((float(rating) - 1) / 4, 0.0), 1.0) if rating is not None else None
+            for rating in ratings
+        ]
+        
+        results = []
+        for lexical, rated in zip(lexical_scores, rating_scores):
+            lexical_strength = abs(lexical - 0.5) * 2
+            if rated is None:
+                score = lexical
+                confidence = lexical_strength
+            else:
+                rating_strength = abs(rated - 0.5) * 2
+                score = self.rating_weight * rated + (1 - self.rating_weight) * lexical
+                confidence = self.rating_weight * rating_strength + (1 - self.rating_weight) * lexical_strength
+                # Note et texte contradictoires: l'avis est ambigu
+                if (rated - 0.5) * (lexical - 0.5) < 0:
+                    confidence *= 0.3
+            
+            results.append({
+                'sentiment': sentiment_from_score(score),
+                'score': round(score, 4),
+                'topics': [],
+                'confidence': round(confidence, 4)
+            })
+        return results
+
+## Moteur local d'extraction de sujets (TF-IDF sur les n-grammes)
+class LocalTopicExtractor:
+    """
+    Moteur local d'extraction de sujets, sans appel au LLM.
+    
+    Les textes sont découpés en mots, débarrassés des mots vides et ramenés
+    à leur forme de base (light_lemma). Les unigrammes et bigrammes de mots
+    consécutifs sont pondérés par TF-IDF sur l'ensemble du corpus (tous les
+    avis de l'entreprise) : les termes propres à un avis ressortent, les
+    termes présents partout sont atténués.
+    
+    Les termes proches sont ensuite regroupés sous un même libellé à
+    l'échelle du corpus : variantes d'accent ou de genre ("délai"/"delai",
+    "livraison lente"/"livraison lent"). Le libellé d'un groupe est sa
+    variante la plus fréquente (accentuée à égalité), de sorte que
+    top_topics ne disperse pas un même thème.
+    
+    Attributes:
+        top_k (int): Nombre de sujets retenus par texte
+        min_df (int): Nombre minimum d'avis contenant un terme (grands corpus)
+    """
+    
+    # Identifiant du moteur
+    MODEL_NAME = 'local-tfidf-v2'
+    
+    # Bonus des bigrammes, plus informatifs que les mots isolés
+    BIGRAM_BOOST = 1.5
+    
+    # Taille de corpus à partir de laquelle min_df s'applique
+    MIN_DF_CORPUS = 20
+    
+    ## Initialise le moteur
+    def __init__(self, top_k: int = 3, min_df: int = 2):
+        """
+        Initialise le moteur.
+        
+        Args:
+            top_k (int): Nombre de sujets retenus par texte
+            min_df (int): Nombre minimum d'avis contenant un terme pour qu'il
+                soit retenu (ignoré sur les petits corpus)
+        """
+        self.top_k = top_k
+        self.min_df = min_df
+    
+    ## Découpe un texte en termes (unigrammes et bigrammes)
+    @staticmethod
+    def terms(text: str) -> Counter:
+        """
+        Découpe un texte en termes (unigrammes et bigrammes lemmatisés).
+        
+        Les bigrammes ne franchissent pas les mots vides ni la ponctuation :
+        "service client" est un terme, "service de la livraison" non.
+        
+        Args:
+            text (str): Texte de l'avis
+            
+        Returns:
+            Counter: Nombre d'occurrences de chaque terme
+        """
+        counts = Counter()
+        for fragment in re.split(r"[.,;:!?()\[\]\n]+", (text or '').lower()):
+            previous = None
+            for word in re.findall(r"\w+", fragment):
+                if word in FRENCH_STOPWORDS or len(word) < 3 or word.isdigit():
+                    previous = None
+                    continue
+                lemma = light_lemma(word)
+                counts[lemma] += 1
+                if previous is not None:
+                    counts[f"{previous} {lemma}"] += 1
+                previous = lemma
+        return counts
+    
+    ## Calcule la clé de regroupement d'un terme
+    @staticmethod
+    def group_key(term: str) -> str:
+        """
+        Calcule la clé de regroupement d'un terme.
+        
+        Les accents et le e final des mots longs sont retirés : les
+        variantes d'orthographe et de genre d'un même terme partagent la clé.
+        
+        Args:
+            term (str): Terme lemmatisé (unigramme ou bigramme)
+            
+        Returns:
+            str: Clé de regroupement
+        """
+        folded = unicodedata.normalize('NFKD', term).encode('ascii', 'ignore').decode('ascii')
+        return ' '.join(word[:-1] if len(word) > 4 and word.endswith('e') else word
+                        for word in folded.split())
+    
+    ## Regroupe les termes proches du corpus sous un même libellé
+    def group_terms(self, document_frequency: Counter) -> Dict[str, str]:
+        """
+        Regroupe les termes proches du corpus sous un même libellé.
+        
+        Args:
+            document_frequency (Counter): Nombre d'avis contenant chaque terme
+            
+        Returns:
+            Dict[str, str]: Libellé retenu pour chaque terme
+        """
+        variants: Dict[str, List[str]] = {}
+        for term in document_frequency:
+            variants.setdefault(self.group_key(term), []).append(term)
+        labels = {}
+        for terms in variants.values():
+            # Variante la plus fréquente, puis la plus accentuée
+            label = min(terms, key=lambda term: (-document_frequency[term],
+                                                 -sum(not char.isascii() for char in term), term))
+            for term in terms:
+                labels[term] = label
+        return labels
+    
+    ## Extrait les sujets d'un lot de textes en une passe
+    @traced('topics.local')
+    def extract_batch(self, texts: List[str], corpus: Optional[List[str]] = None) -> List[List[str]]:
+        """
+        Extrait les sujets d'un lot de textes en une passe.
+        
+        Args:
+            texts (List[str]): Textes à analyser
+            corpus (Optional[List[str]]): Corpus de référence pour l'IDF
+                (défaut: les textes eux-mêmes)
+            
+        Returns:
+            List[List[str]]: Sujets canoniques de chaque texte, dans l'ordre des textes
+        """
+        text_terms = [self.terms(text) for text in texts]
+        corpus_terms = text_terms if corpus is None else [self.terms(text) for text in corpus]
+        
+        document_frequency = Counter()
+        for counts in corpus_terms:
+            document_frequency.update(counts.keys())
+        size = len(corpus_terms)
+        min_df = self.min_df if size >= self.MIN_DF_CORPUS else 1
+        idf = {
+            term: math.log((1 + size) / (1 + df)) + 1.0
+            for term, df in document_frequency.items() if df >= min_df
+        }
+        labels = self.group_terms(document_frequency)
+        
+        results = []
+        for counts in text_terms:
+            # Un groupe est noté par le meilleur score de ses termes, sous son libellé
+            scores = Counter()
+            for term, tf in counts.items():
+                if term in idf:
+                    label = labels.get(term, term)
+                    scores[label] = max(scores[label], tf * idf[term] * (self.BIGRAM_BOOST if ' ' in label else 1.0))
+            topics = []
+            for term, _ in sorted(scores.items(), key=lambda item: (-item[1], item[0])):
+                # Un mot déjà couvert par un bigramme retenu est redondant
+                if any(term in topic.split() or topic in term.split() for topic in topics):
+                    continue
+                topics.append(term)
+                if len(topics) >= self.top_k:
+                    break
+            results.append(topics)
+        return results
+
+## Seau à jetons thread-safe pour limiter un débit
+class TokenBucket:
+    """
+    Seau à jetons thread-safe pour limiter un débit.
+    
+    Le seau se remplit continûment à raison de rate jetons par seconde,
+    jusqu'à capacity. acquire bloque tant que le nombre de jetons demandé
+    n'est pas disponible.
+    
+    Attributes:
+        capacity (float): Nombre maximum de jetons accumulés
+        rate (float): Jetons ajoutés par seconde
+    """
+    
+    ## Initialise un seau plein
+    def __init__(self, capacity: float, rate: float):
+        """
+        Initialise un seau plein.
+        
+        Args:
+            capacity (float): Nombre maximum de jetons accumulés
+            rate (float): Jetons ajoutés par seconde
+        """
+        self.capacity = capacity
+        self.rate = rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    ## Prélève des jetons en attendant si nécessaire
+    def acquire(self, amount: float = 1) -> None:
+        """
+        Prélève des jetons en attendant si nécessaire.
+        
+        Une demande supérieure à la capacité est ramenée à la capacité pour
+        ne pas bloquer indéfiniment.
+        
+        Args:
+            amount (float): Nombre de jetons à prélever
+        """
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            time.sleep(wait)
+
+## Limiteur de débit des appels LLM (requêtes et tokens par minute)
+class LLMRateLimiter:
+    """
+    Limiteur de débit des appels LLM.
+    
+    Combine un seau de requêtes par minute et un seau de tokens par minute
+    pour rester sous les quotas du fournisseur, quel que soit le nombre de
+    threads d'analyse. Un quota à 0 désactive la limite correspondante.
+    
+    Attributes:
+        requests (Optional[TokenBucket]): Seau des requêtes (None: illimité)
+        tokens (Optional[TokenBucket]): Seau des tokens (None: illimité)
+    """
+    
+    ## Initialise les deux seaux à partir des quotas par minute
+    def __init__(self, requests_per_minute: int = LLM_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: int = LLM_TOKENS_PER_MINUTE):
+        """
+        Initialise les deux seaux à partir des quotas par minute.
+        
+        Args:
+            requests_per_minute (int): Nombre maximum de requêtes par minute
+                (0: illimité)
+            tokens_per_minute (int): Nombre maximum de tokens par minute
+                (0: illimité)
+            
+        Raises:
+            ValueError: Si un quota est négatif
+        """
+        if requests_per_minute < 0 or tokens_per_minute < 0:
+            raise ValueError(
+                f"Les quotas LLM doivent être positifs ou nuls (0 = illimité), reçu "
+                f"{requests_per_minute} requêtes et {tokens_per_minute} tokens par minute"
+            )
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60) if tokens_per_minute else None
+    
+    ## Attend la disponibilité d'une requête de la taille donnée
+    def acquire(self, tokens: int) -> None:
+        """
+        Attend la disponibilité d'une requête de la taille donnée.
+        
+        Args:
+            tokens (int): Nombre de tokens estimé de la requête
+        """
+        if self.requests is not None:
+            self.requests.acquire(1)
+        if self.tokens is not None:
+            self.tokens.acquire(tokens)
+
+# Limiteur partagé, créé à la première utilisation
+_llm_rate_limiter: Optional[LLMRateLimiter] = None
+_llm_rate_limiter_lock = threading.Lock()
+
+## Retourne le limiteur de débit LLM partagé par tous les scrapers
+def get_llm_rate_limiter() -> LLMRateLimiter:
+    """
+    Retourne le limiteur de débit LLM partagé par tous les scrapers.
+    
+    Returns:
+        LLMRateLimiter: Instance unique du limiteur
+    """
+    global _llm_rate_limiter
+    with _llm_rate_limiter_lock:
+        if _llm_rate_limiter is None:
+            _llm_rate_limiter = LLMRateLimiter()
+        return _llm_rate_limiter
+
+## Cache des résultats d'analyse LLM adressé par contenu
+## Évite de refacturer l'analyse d'un texte déjà évalué
+class SentimentCache:
+    """
+    Cache à deux niveaux des résultats d'analyse de sentiment.
+    
+    La clé est une empreinte SHA-256 du texte normalisé, du modèle et du
+    prompt: un même avis analysé avec le même modèle et le même prompt n'est
+    envoyé qu'une fois au LLM. Le premier niveau est un LRU en mémoire, le
+    second une table SQLite persistante entre les redémarrages. Les deux
+    niveaux sont bornés en taille et les entrées expirent après ttl secondes.
+    
+    Attributes:
+        max_entries (int): Taille maximale du niveau mémoire
+        max_disk_entries (int): Taille maximale du niveau disque
+        ttl (float): Durée de vie d'une entrée en secondes
+        path (Optional[str]): Chemin du fichier SQLite (None: mémoire seule)
+        hits (int): Nombre de lectures servies par le cache
+        disk_hits (int): Nombre de lectures servies par le niveau disque
+        misses (int): Nombre de lectures absentes ou expirées
+    """
+    
+    # Nombre d'écritures entre deux purges du niveau disque
+    PURGE_INTERVAL = 100
+    
+    ## Initialise les deux niveaux du cache
+    def __init__(self, path: Optional[str] = SENTIMENT_CACHE_PATH,
+                 max_entries: int = SENTIMENT_CACHE_MAX_ENTRIES,
+                 max_disk_entries: int = SENTIMENT_CACHE_MAX_DISK_ENTRIES,
+                 ttl: float = SENTIMENT_CACHE_TTL):
+        """
+        Initialise les deux niveaux du cache.
+        
+        Args:
+            path (Optional[str]): Chemin du fichier SQLite (None ou vide:
+                pas de niveau disque)
+            max_entries (int): Taille maximale du niveau mémoire
+            max_disk_entries (int): Taille maximale du niveau disque
+            ttl (float): Durée de vie d'une entrée en secondes
+        """
+        self.path = path or None
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._db = None
+        
+        if self.path:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sentiment_cache_accessed "
+                "ON sentiment_cache (accessed_at)"
+            )
+            self._db.commit()
+    
+    ## Calcule la clé de cache d'un texte
+    @staticmethod
+    def make_key(text: str, model: str, prompt: str) -> str:
+        """
+        Calcule la clé de cache d'un texte.
+        
+        Le texte est normalisé (Unicode NFC, minuscules, espaces réduits)
+        pour que des variantes triviales partagent la même entrée.
+        
+        Args:
+            text (str): Texte analysé
+            model (str): Modèle LLM utilisé
+            prompt (str): Prompt système utilisé
+            
+        Returns:
+            str: Empreinte SHA-256 hexadécimale
+        """
+        normalized = ' '.join(unicodedata.normalize('NFC', text).lower().split())
+        payload = '\x1f'.join((model, prompt, normalized))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    ## Lit une entrée du cache
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Lit une entrée du cache.
+        
+        Args:
+            key (str): Clé calculée par make_key
+            
+        Returns:
+            Optional[Dict[str, Any]]: Copie du résultat ou None si absent/expiré
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(value)
+                del self._memory[key]
+            
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM sentiment_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if now - row[1] <= self.ttl:
+                        value = json.loads(row[0])
+                        self._db.execute(
+                            "UPDATE sentiment_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                        )
+                        self._db.commit()
+                        self._remember(key, row[1], value)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return copy.deepcopy(value)
+                    self._db.execute("DELETE FROM sentiment_cache WHERE key = ?", (key,))
+                    self._db.commit()
+            
+            self.misses += 1
+            return None
+    
+    ## Enregistre une entrée dans les deux niveaux
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Enregistre une entrée dans les deux niveaux.
+        
+        Args:
+            key (str): Clé calculée par make_key
+            value (Dict[str, Any]): Résultat d'analyse sérialisable en JSON
+        """
+        now = time.time()
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._remember(key, now, value)
+            
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sentiment_cache (key, value, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), now, now)
+                )
+                self._writes += 1
+                if self._writes % self.PURGE_INTERVAL == 0:
+                    self._purge_disk(now)
+                self._db.commit()
+    
+    ## Ajoute une entrée au niveau mémoire en respectant la borne LRU
+    def _remember(self, key: str, created_at: float, value: Dict[str, Any]) -> None:
+        """
+        Ajoute une entrée au niveau mémoire en respectant la borne LRU.
+        
+        Args:
+            key (str): Clé de l'entrée
+            created_at (float): Horodatage de création
+            value (Dict[str, Any]): Résultat d'analyse
+        """
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    ## Supprime les entrées expirées puis les moins récemment utilisées
+    def _purge_disk(self, now: float) -> None:
+        """
+        Supprime les entrées disque expirées puis les moins récemment utilisées.
+        
+        Args:
+            now (float): Horodatage courant
+        """
+        self._db.execute("DELETE FROM sentiment_cache WHERE created_at < ?", (now - self.ttl,))
+        count = self._db.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+        if count > self.max_disk_entries:
+            self._db.execute(
+                "DELETE FROM sentiment_cache WHERE key IN ("
+                "SELECT key FROM sentiment_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.max_disk_entries,)
+            )
+    
+    ## Retourne les compteurs d'utilisation du cache
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les compteurs d'utilisation du cache.
+        
+        Returns:
+            Dict[str, Any]: Succès, échecs, taux de succès et tailles
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory)
+            }
+    
+    ## Vide les deux niveaux du cache
+    def clear(self) -> None:
+        """Vide les deux niveaux du cache."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM sentiment_cache")
+                self._db.commit()
+
+# Cache partagé, créé à la première utilisation
+_sentiment_cache: Optional[SentimentCache] = None
+_sentiment_cache_lock = threading.Lock()
+
+## Retourne le cache d'analyse partagé par tous les scrapers
+def get_sentiment_cache() -> SentimentCache:
+    """
+    Retourne le cache d'analyse partagé par tous les scrapers.
+    
+    Returns:
+        SentimentCache: Instance unique du cache
+    """
+    global _sentiment_cache
+    with _sentiment_cache_lock:
+        if _sentiment_cache is None:
+            _sentiment_cache = SentimentCache()
+        return _sentiment_cache
+
+# Marqueur d'absence de valeur dans une colonne
+_MISSING = object()
+
+## Colonne numérique compacte (array de doubles)
+class _NumberColumn:
+    """
+    Colonne numérique stockée dans un array('d'); NaN marque l'absence.
+    
+    Attributes:
+        data (array): Valeurs, une par avis
+        integral (bool): Restitue les valeurs entières en int (notes)
+    """
+    
+    __slots__ = ('data', 'integral')
+    
+    ## Initialise une colonne vide
+    def __init__(self, integral: bool = False):
+        """
+        Initialise une colonne vide.
+        
+        Args:
+            integral (bool): Restitue les valeurs entières en int
+        """
+        self.data = array('d')
+        self.integral = integral
+    
+    ## Ajoute une ligne sans valeur
+    def append_missing(self) -> None:
+        """Ajoute une ligne sans valeur."""
+        self.data.append(math.nan)
+    
+    ## Indique si une ligne a une valeur
+    def has(self, index: int) -> bool:
+        """Indique si une ligne a une valeur (NaN n'est jamais égal à lui-même)."""
+        return self.data[index] == self.data[index]
+    
+    ## Lit la valeur d'une ligne
+    def get(self, index: int) -> Any:
+        """
+        Lit la valeur d'une ligne.
+        
+        Args:
+            index (int): Position de l'avis
+            
+        Returns:
+            Any: Valeur, ou _MISSING si la ligne n'en a pas
+        """
+        value = self.data[index]
+        if value != value:
+            return _MISSING
+        return int(value) if self.integral and value.is_integer() else value
+    
+    ## Écrit la valeur d'une ligne
+    def set(self, index: int, value: Any) -> bool:
+        """
+        Écrit la valeur d'une ligne.
+        
+        Args:
+            index (int): Position de l'avis
+            value (Any): Valeur à écrire
+            
+        Returns:
+            bool: False si la valeur n'est pas un nombre représentable
+                (elle est alors rangée dans les champs d'appoint)
+        """
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+            return False
+        self.data[index] = value
+        return True
+    
+    ## Efface la valeur d'une ligne
+    def clear(self, index: int) -> None:
+        """Efface la valeur d'une ligne."""
+        self.data[index] = math.nan
+    
+    ## Estime la mémoire occupée par la colonne
+    def nbytes(self) -> int:
+        """Estime la mémoire occupée par la colonne (en octets)."""
+        return self.data.itemsize * len(self.data)
+
+## Colonne de chaînes internées (codes entiers + table de valeurs)
+class _CategoryColumn:
+    """
+    Colonne de valeurs répétées (plateforme, sentiment...) stockées par code.
+    
+    Les codes sont des entiers 32 bits (array('i')) : le nombre de valeurs
+    distinctes n'est pas limité en pratique. -1 marque l'absence.
+    
+    Attributes:
+        codes (array): Code de la valeur de chaque avis
+        values (List[Optional[str]]): Valeur de chaque code
+        index (Dict[Optional[str], int]): Code de chaque valeur
+    """
+    
+    __slots__ = ('codes', 'values', 'index')
+    
+    ## Initialise une colonne vide
+    def __init__(self):
+        """Initialise une colonne vide."""
+        self.codes = array('i')
+        self.values = []
+        self.index = {}
+    
+    ## Ajoute une ligne sans valeur
+    def append_missing(self) -> None:
+        """Ajoute une ligne sans valeur."""
+        self.codes.append(-1)
+    
+    ## Indique si une ligne a une valeur
+    def has(self, index: int) -> bool:
+        """Indique si une ligne a une valeur."""
+        return self.codes[index] >= 0
+    
+    ## Lit la valeur d'une ligne
+    def get(self, index: int) -> Any:
+        """
+        Lit la valeur d'une ligne.
+        
+        Args:
+            index (int): Position de l'avis
+            
+        Returns:
+            Any: Valeur, ou _MISSING si la ligne n'en a pas
+        """
+        code = self.codes[index]
+        return self.values[code] if code >= 0 else _MISSING
+    
+    ## Écrit la valeur d'une ligne
+    def set(self, index: int, value: Any) -> bool:
+        """
+        Écrit la valeur d'une ligne, en attribuant un code aux valeurs nouvelles.
+        
+        Args:
+            index (int): Position de l'avis
+            value (Any): Chaîne ou None
+            
+        Returns:
+            bool: False si la valeur n'est pas une chaîne (elle est alors
+                rangée dans les champs d'appoint)
+        """
+        if value is not None and not isinstance(value, str):
+            return False
+        code = self.index.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(sys.intern(value) if value is not None else None)
+            self.index[value] = code
+        self.codes[index] = code
+        return True
+    
+    ## Efface la valeur d'une ligne
+    def clear(self, index: int) -> None:
+        """Efface la valeur d'une ligne."""
+        self.codes[index] = -1
+    
+    ## Compte les occurrences de chaque valeur présente
+    def counts(self) -> Counter:
+        """Compte les occurrences de chaque valeur présente."""
+        counts = Counter(self.codes)
+        counts.pop(-1, None)
+        return Counter({self.values[code]: count for code, count in counts.items()})
+    
+    ## Estime la mémoire occupée par la colonne
+    def nbytes(self) -> int:
+        """Estime la mémoire occupée par la colonne (en octets)."""
+        return self.codes.itemsize * len(self.codes) + sum(sys.getsizeof(v) for v in self.values)
+
+## Colonne de dates (ordinal du calendrier grégorien)
+class _DateColumn:
+    """
+    Colonne de dates YYYY-MM-DD stockées en entiers; 0 marque l'absence.
+    
+    Attributes:
+        data (array): Ordinal de la date de chaque avis
+    """
+    
+    __slots__ = ('data',)
+    
+    ## Initialise une colonne vide
+    def __init__(self):
+        """Initialise une colonne vide."""
+        self.data = array('i')
+    
+    ## Ajoute une ligne sans valeur
+    def append_missing(self) -> None:
+        """Ajoute une ligne sans valeur."""
+        self.data.append(0)
+    
+    ## Indique si une ligne a une valeur
+    def has(self, index: int) -> bool:
+        """Indique si une ligne a une valeur."""
+        return self.data[index] > 0
+    
+    ## Lit la valeur d'une ligne
+    def get(self, index: int) -> Any:
+        """
+        Lit la valeur d'une ligne.
+        
+        Args:
+            index (int): Position de l'avis
+            
+        Returns:
+            Any: Date au format YYYY-MM-DD, ou _MISSING si la ligne n'en a pas
+        """
+        ordinal = self.data[index]
+        return date.fromordinal(ordinal).isoformat() if ordinal > 0 else _MISSING
+    
+    ## Écrit la valeur d'une ligne
+    def set(self, index: int, value: Any) -> bool:
+        """
+        Écrit la valeur d'une ligne.
+        
+        Args:
+            index (int): Position de l'avis
+            value (Any): Date au format YYYY-MM-DD
+            
+        Returns:
+            bool: False si la valeur n'est pas une date de ce format (elle
+                est alors rangée dans les champs d'appoint)
+        """
+        if not isinstance(value, str) or len(value) != 10:
+            return False
+        try:
+            self.data[index] = date.fromisoformat(value).toordinal()
+        except ValueError:
+            return False
+        return True
+    
+    ## Efface la valeur d'une ligne
+    def clear(self, index: int) -> None:
+        """Efface la valeur d'une ligne."""
+        self.data[index] = 0
+    
+    ## Estime la mémoire occupée par la colonne
+    def nbytes(self) -> int:
+        """Estime la mémoire occupée par la colonne (en octets)."""
+        return self.data.itemsize * len(self.data)
+
+## Colonne de textes stockés bout à bout dans une arène d'octets
+class _ArenaColumn:
+    """
+    Colonne de textes encodés en UTF-8 dans une arène unique.
+    
+    Un texte remplacé ou effacé laisse ses octets dans l'arène; ils sont
+    comptés dans garbage, et l'arène est compactée (textes vivants recopiés
+    bout à bout) dès qu'ils en représentent plus de la moitié.
+    
+    Attributes:
+        arena (bytearray): Textes encodés bout à bout
+        starts (array): Début du texte de chaque avis (-1: absent)
+        lengths (array): Longueur en octets du texte de chaque avis
+        garbage (int): Octets de l'arène qui ne sont plus référencés
+    """
+    
+    __slots__ = ('arena', 'starts', 'lengths', 'garbage')
+    
+    # Taille minimale des octets perdus avant une compaction
+    COMPACT_MIN_BYTES = 1 << 16
+    
+    ## Initialise une colonne vide
+    def __init__(self):
+        """Initialise une colonne vide."""
+        self.arena = bytearray()
+        self.starts = array('q')
+        self.lengths = array('q')
+        self.garbage = 0
+    
+    ## Ajoute une ligne sans valeur
+    def append_missing(self) -> None:
+        """Ajoute une ligne sans valeur."""
+        self.starts.append(-1)
+        self.lengths.append(0)
+    
+    ## Indique si une ligne a une valeur
+    def has(self, index: int) -> bool:
+        """Indique si une ligne a une valeur."""
+        return self.starts[index] >= 0
+    
+    ## Lit la valeur d'une ligne
+    def get(self, index: int) -> Any:
+        """
+        Lit la valeur d'une ligne.
+        
+        Args:
+            index (int): Position de l'avis
+            
+        Returns:
+            Any: Texte décodé, ou _MISSING si la ligne n'en a pas
+        """
+        start = self.starts[index]
+        if start < 0:
+            return _MISSING
+        return self.arena[start:start + self.lengths[index]].decode('utf-8')
+    
+    ## Écrit la valeur d'une ligne
+    def set(self, index: int, value: Any) -> bool:
+        """
+        Écrit la valeur d'une ligne à la fin de l'arène.
+        
+        Args:
+            index (int): Position de l'avis
+            value (Any): Texte à écrire
+            
+        Returns:
+            bool: False si la valeur n'est pas une chaîne (elle est alors
+                rangée dans les champs d'appoint)
+        """
+        if not isinstance(value, str):
+            return False
+        encoded = value.encode('utf-8')
+        self.clear(index)
+        self.starts[index] = len(self.arena)
+        self.lengths[index] = len(encoded)
+        self.arena.extend(encoded)
+        return True
+    
+    ## Efface la valeur d'une ligne
+    def clear(self, index: int) -> None:
+        """Efface la valeur d'une ligne et compacte l'arène si nécessaire."""
+        if self.starts[index] < 0:
+            return
+        self.garbage += self.lengths[index]
+        self.starts[index] = -1
+        self.lengths[index] = 0
+        if self.garbage >= self.COMPACT_MIN_BYTES and self.garbage * 2 > len(self.arena):
+            self.compact()
+    
+    ## Recopie les textes vivants bout à bout
+    def compact(self) -> None:
+        """Recopie les textes vivants bout à bout et libère les octets perdus."""
+        arena = bytearray()
+        for index, start in enumerate(self.starts):
+            if start >= 0:
+                self.starts[index] = len(arena)
+                arena += self.arena[start:start + self.lengths[index]]
+        self.arena = arena
+        self.garbage = 0
+    
+    ## Estime la mémoire occupée par la colonne
+    def nbytes(self) -> int:
+        """Estime la mémoire occupée par la colonne (en octets)."""
+        return len(self.arena) + 16 * len(self.starts)
+
+## Colonne d'objets Python (identifiants, auteurs, listes de sujets)
+class _ObjectColumn:
+    """
+    Colonne générique d'objets Python, avec chaînes et tuples internés.
+    
+    La taille des objets référencés est tenue à jour à chaque écriture :
+    une chaîne de sujet partagée par plusieurs avis n'est comptée qu'une fois.
+    
+    Attributes:
+        data (List[Any]): Valeur de chaque avis (_MISSING: absente)
+        as_tuple (bool): Range les listes de chaînes en tuples internés
+            (sujets) et les restitue en listes
+        value_bytes (int): Taille des objets référencés par data (octets)
+        refs (Dict[str, int]): Nombre de références à chaque chaîne de
+            sujet (as_tuple seulement)
+    """
+    
+    __slots__ = ('data', 'as_tuple', 'value_bytes', 'refs')
+    
+    ## Initialise une colonne vide
+    def __init__(self, as_tuple: bool = False):
+        """
+        Initialise une colonne vide.
+        
+        Args:
+            as_tuple (bool): Range les listes de chaînes en tuples internés
+        """
+        self.data = []
+        self.as_tuple = as_tuple
+        self.value_bytes = 0
+        self.refs = {}
+    
+    ## Ajoute une ligne sans valeur
+    def append_missing(self) -> None:
+        """Ajoute une ligne sans valeur."""
+        self.data.append(_MISSING)
+    
+    ## Indique si une ligne a une valeur
+    def has(self, index: int) -> bool:
+        """Indique si une ligne a une valeur."""
+        return self.data[index] is not _MISSING
+    
+    ## Lit la valeur d'une ligne
+    def get(self, index: int) -> Any:
+        """
+        Lit la valeur d'une ligne.
+        
+        Args:
+            index (int): Position de l'avis
+            
+        Returns:
+            Any: Valeur (nouvelle liste pour as_tuple), ou _MISSING
+        """
+        value = self.data[index]
+        return list(value) if self.as_tuple and value is not _MISSING else value
+    
+    ## Écrit la valeur d'une ligne
+    def set(self, index: int, value: Any) -> bool:
+        """
+        Écrit la valeur d'une ligne.
+        
+        Args:
+            index (int): Position de l'avis
+            value (Any): Valeur à écrire
+            
+        Returns:
+            bool: False si as_tuple et que la valeur n'est pas une liste de
+                chaînes (elle est alors rangée dans les champs d'appoint)
+        """
+        if self.as_tuple:
+            if not isinstance(value, (list, tuple)) or not all(isinstance(v, str) for v in value):
+                return False
+            value = tuple(sys.intern(v) for v in value)
+        self._release(self.data[index])
+        self._retain(value)
+        self.data[index] = value
+        return True
+    
+    ## Efface la valeur d'une ligne
+    def clear(self, index: int) -> None:
+        """Efface la valeur d'une ligne."""
+        self._release(self.data[index])
+        self.data[index] = _MISSING
+    
+    ## Compte la taille d'une valeur écrite
+    def _retain(self, value: Any) -> None:
+        """Ajoute la taille d'une valeur écrite (chaînes partagées comptées une fois)."""
+        self.value_bytes += sys.getsizeof(value)
+        if self.as_tuple:
+            for item in value:
+                count = self.refs.get(item, 0)
+                if not count:
+                    self.value_bytes += sys.getsizeof(item)
+                self.refs[item] = count + 1
+    
+    ## Décompte la taille d'une valeur remplacée ou effacée
+    def _release(self, value: Any) -> None:
+        """Retire la taille d'une valeur remplacée ou effacée."""
+        if value is _MISSING:
+            return
+        self.value_bytes -= sys.getsizeof(value)
+        if self.as_tuple:
+            for item in value:
+                count = self.refs[item] - 1
+                if count:
+                    self.refs[item] = count
+                else:
+                    del self.refs[item]
+                    self.value_bytes -= sys.getsizeof(item)
+    
+    ## Estime la mémoire occupée par la colonne
+    def nbytes(self) -> int:
+        """Estime la mémoire occupée par la colonne et les objets référencés (en octets)."""
+        return sys.getsizeof(self.data) + self.value_bytes + sys.getsizeof(self.refs)
+
+## Vue légère sur une ligne du stockage en colonnes
+class ReviewRow(MutableMapping):
+    """
+    Vue légère, au comportement de dictionnaire, sur un avis du ReviewStore.
+    
+    La vue ne copie aucune donnée: lectures et écritures sont redirigées
+    vers les colonnes du stockage. Les listes renvoyées (sujets) sont des
+    copies; pour les modifier, réaffecter la clé.
+    """
+    
+    __slots__ = ('_store', '_index')
+    
+    def __init__(self, store: 'ReviewStore', index: int):
+        self._store = store
+        self._index = index
+    
+    def __getitem__(self, key: str) -> Any:
+        return self._store._get(self._index, key)
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._store._set(self._index, key, value)
+    
+    def __delitem__(self, key: str) -> None:
+        self._store._delete(self._index, key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store._keys(self._index))
+    
+    def __len__(self) -> int:
+        return len(self._store._keys(self._index))
+    
+    def __repr__(self) -> str:
+        return f"ReviewRow({self.to_dict()!r})"
+    
+    ## Copie l'avis dans un dictionnaire indépendant
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Copie l'avis dans un dictionnaire indépendant (sérialisable en JSON).
+        
+        Returns:
+            Dict[str, Any]: Champs de l'avis
+        """
+        return {key: self._store._get(self._index, key) for key in self._store._keys(self._index)}
+
+## Stockage compact des avis en colonnes typées
+## Remplace la liste de dictionnaires de ReviewScraper
+class ReviewStore:
+    """
+    Stockage compact des avis en colonnes typées.
+    
+    Chaque champ connu est rangé dans une colonne adaptée: codes internés
+    pour les valeurs répétées (plateforme, sentiment, langue...), arrays
+    pour les notes, scores et dates, arène d'octets UTF-8 pour les textes.
+    Les champs inconnus sont conservés par ligne dans un dictionnaire
+    d'appoint. L'accès façon dictionnaire reste disponible via des vues
+    ReviewRow, et le stockage se comporte comme une liste d'avis
+    (len, itération, indexation, append, extend).
+    """
+    
+    ## Initialise des colonnes vides
+    def __init__(self, reviews: Optional[List[Dict[str, Any]]] = None):
+        """
+        Initialise des colonnes vides.
+        
+        Args:
+            reviews (Optional[List[Dict[str, Any]]]): Avis initiaux
+        """
+        self._columns = {
+            'id': _ObjectColumn(),
+            'platform': _CategoryColumn(),
+            'author': _ObjectColumn(),
+            'rating': _NumberColumn(integral=True),
+            'text': _ArenaColumn(),
+            'date': _DateColumn(),
+            'title': _ArenaColumn(),
+            'language': _CategoryColumn(),
+            'country': _CategoryColumn(),
+            'sentiment': _CategoryColumn(),
+            'score': _NumberColumn(),
+            'confidence': _NumberColumn(),
+            'topics': _ObjectColumn(as_tuple=True),
+            'analysis_source': _CategoryColumn(),
+            'analysis_version': _CategoryColumn()
+        }
+        self._extras: Dict[int, Dict[str, Any]] = {}
+        self._size = 0
+        if reviews:
+            self.extend(reviews)
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self) -> Iterator[ReviewRow]:
+        for index in range(self._size):
+            yield ReviewRow(self, index)
+    
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [ReviewRow(self, i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("Index d'avis hors limites")
+        return ReviewRow(self, index)
+    
+    ## Ajoute un avis
+    def append(self, review: Dict[str, Any]) -> None:
+        """
+        Ajoute un avis.
+        
+        Args:
+            review (Dict[str, Any]): Avis au format dictionnaire
+        """
+        index = self._size
+        for column in self._columns.values():
+            column.append_missing()
+        self._size += 1
+        for key, value in review.items():
+            self._set(index, key, value)
+    
+    ## Ajoute plusieurs avis
+    def extend(self, reviews: List[Dict[str, Any]]) -> None:
+        """
+        Ajoute plusieurs avis.
+        
+        Args:
+            reviews (List[Dict[str, Any]]): Avis au format dictionnaire
+        """
+        for review in reviews:
+            self.append(review)
+    
+    ## Copie tous les avis dans des dictionnaires indépendants
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Copie tous les avis dans des dictionnaires indépendants.
+        
+        Returns:
+            List[Dict[str, Any]]: Avis sérialisables en JSON
+        """
+        return [row.to_dict() for row in self]
+    
+    ## Compte les valeurs d'une colonne de catégories
+    def category_counts(self, field: str) -> Counter:
+        """
+        Compte les valeurs d'une colonne de catégories (plateforme, sentiment...).
+        
+        Args:
+            field (str): Nom du champ
+            
+        Returns:
+            Counter: Nombre d'avis par valeur (avis sans valeur exclus)
+        """
+        return self._columns[field].counts()
+    
+    ## Retourne les valeurs présentes d'une colonne numérique
+    def numbers(self, field: str) -> List[float]:
+        """
+        Retourne les valeurs présentes d'une colonne numérique.
+        
+        Args:
+            field (str): Nom du champ (rating, score, confidence)
+            
+        Returns:
+            List[float]: Valeurs, sans les avis sans valeur
+        """
+        return [value for value in self._columns[field].data if value == value]
+    
+    ## Itère sur les listes de sujets de tous les avis
+    def topic_lists(self) -> Iterator[tuple]:
+        """
+        Itère sur les listes de sujets de tous les avis analysés.
+        
+        Yields:
+            tuple: Sujets (internés) d'un avis
+        """
+        return (topics for topics in self._columns['topics'].data if topics is not _MISSING)
+    
+    ## Estime la mémoire occupée par le stockage
+    def memory_usage(self) -> int:
+        """
+        Estime la mémoire occupée par le stockage (en octets).
+        
+        Returns:
+            int: Taille approximative des colonnes et des champs d'appoint
+        """
+        extras = sum(sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values.values())
+                     for values in self._extras.values())
+        return sum(column.nbytes() for column in self._columns.values()) + extras
+    
+    ## Lit un champ d'un avis
+    def _get(self, index: int, key: str) -> Any:
+        """
+        Lit un champ d'un avis, dans sa colonne ou dans les champs d'appoint.
+        
+        Args:
+            index (int): Position de l'avis
+            key (str): Nom du champ
+            
+        Returns:
+            Any: Valeur du champ
+            
+        Raises:
+            KeyError: Champ absent
+        """
+        column = self._columns.get(key)
+        if column is not None:
+            value = column.get(index)
+            if value is not _MISSING:
+                return value
+        extras = self._extras.get(index)
+        if extras is not None and key in extras:
+            return extras[key]
+        raise KeyError(key)
+    
+    ## Écrit un champ d'un avis
+    def _set(self, index: int, key: str, value: Any) -> None:
+        """
+        Écrit un champ d'un avis.
+        
+        La valeur va dans la colonne du champ si elle en a le type, sinon
+        dans les champs d'appoint de l'avis (l'autre emplacement est effacé).
+        
+        Args:
+            index (int): Position de l'avis
+            key (str): Nom du champ
+            value (Any): Valeur à écrire
+        """
+        column = self._columns.get(key)
+        if column is not None and column.set(index, value):
+            extras = self._extras.get(index)
+            if extras is not None:
+                extras.pop(key, None)
+            return
+        if column is not None:
+            column.clear(index)
+        self._extras.setdefault(index, {})[key] = value
+    
+    ## Supprime un champ d'un avis
+    def _delete(self, index: int, key: str) -> None:
+        """
+        Supprime un champ d'un avis.
+        
+        Args:
+            index (int): Position de l'avis
+            key (str): Nom du champ
+            
+        Raises:
+            KeyError: Champ absent
+        """
+        found = False
+        column = self._columns.get(key)
+        if column is not None and column.has(index):
+            column.clear(index)
+            found = True
+        extras = self._extras.get(index)
+        if extras is not None and key in extras:
+            del extras[key]
+            found = True
+        if not found:
+            raise KeyError(key)
+    
+    ## Liste les champs présents d'un avis
+    def _keys(self, index: int) -> List[str]:
+        """
+        Liste les champs présents d'un avis (colonnes puis champs d'appoint).
+        
+        Args:
+            index (int): Position de l'avis
+            
+        Returns:
+            List[str]: Noms des champs
+        """
+        keys = [name for name, column in self._columns.items() if column.has(index)]
+        extras = self._extras.get(index)
+        if extras:
+            keys.extend(extras)
+        return keys
+
+## Agrégateur incrémental des KPIs
+## Maintient des compteurs à jour au fil de la collecte et de l'analyse
+class KPIAggregator:
+    """
+    Agrégateur incrémental des KPIs d'un ensemble d'avis.
+    
+    Les sommes et compteurs (notes, plateformes, sentiments, sujets) sont
+    mis à jour à chaque ajout d'avis et à chaque (ré)analyse, si bien que
+    la lecture des KPIs ne dépend plus du nombre d'avis. Le classement des
+    sujets les plus fréquents (compteur décroissant, puis nom croissant en
+    cas d'égalité) est tenu à jour sur un petit ensemble de candidats : le
+    dernier classement et les sujets passés devant son seuil (le rang du
+    dernier sujet classé). Tous les sujets ne sont reparcourus que si trop
+    de sujets classés sont passés derrière ce seuil, ou après une
+    reconstruction complète.
+    
+    Attributes:
+        review_count (int): Nombre d'avis
+        rating_sum (float): Somme des notes
+        rating_count (int): Nombre d'avis notés
+        platform_counts (Counter): Nombre d'avis par plateforme
+        sentiment_counts (Counter): Nombre d'avis par sentiment
+        topic_counts (Counter): Nombre d'occurrences par sujet
+    """
+    
+    # Nombre de sujets retenus dans top_topics
+    TOP_TOPICS = 5
+    
+    ## Initialise des compteurs vides
+    def __init__(self):
+        """Initialise des compteurs vides."""
+        self._lock = threading.Lock()
+        self.reset()
+    
+    ## Remet tous les compteurs à zéro
+    def reset(self) -> None:
+        """Remet tous les compteurs à zéro."""
+        self.review_count = 0
+        self.rating_sum = 0.0
+        self.rating_count = 0
+        self.platform_counts = Counter()
+        self.sentiment_counts = Counter()
+        self.topic_counts = Counter()
+        self._top_topics = []
+        # Candidats au classement; tout autre sujet est classé après
+        # _top_floor (None: moins de TOP_TOPICS sujets, tous candidats)
+        self._top_candidates = set()
+        self._top_floor = None
+        self._topics_dirty = False
+    
+    ## Reconstruit les compteurs à partir d'une liste complète d'avis
+    def rebuild(self, reviews: Any) -> None:
+        """
+        Reconstruit les compteurs à partir d'une liste complète d'avis.
+        
+        Pour un ReviewStore, le calcul se fait colonne par colonne (sommes
+        et comptages sur les arrays et les codes internés) sans matérialiser
+        les avis.
+        
+        Args:
+            reviews (Any): ReviewStore ou liste d'avis à agréger
+        """
+        if not isinstance(reviews, ReviewStore):
+            with self._lock:
+                self.reset()
+            for review in reviews:
+                self.add_review(review)
+            return
+        
+        with self._lock:
+            self.reset()
+            ratings = reviews.numbers('rating')
+            self.review_count = len(reviews)
+            self.rating_sum = math.fsum(ratings)
+            self.rating_count = len(ratings)
+            self.platform_counts = reviews.category_counts('platform')
+            missing_platform = self.review_count - sum(self.platform_counts.values())
+            if missing_platform:
+                self.platform_counts[None] = missing_platform
+            self.sentiment_counts = reviews.category_counts('sentiment')
+            self.topic_counts = Counter(chain.from_iterable(reviews.topic_lists()))
+            self._topics_dirty = True
+    
+    ## Initialise les compteurs à partir d'agrégats déjà calculés
+    def load(self, counters: Dict[str, Any]) -> None:
+        """
+        Initialise les compteurs à partir d'agrégats déjà calculés, sans
+        parcourir les avis (voir ReviewStorageBackend.aggregate_kpis).
+        
+        Args:
+            counters (Dict[str, Any]): review_count, rating_sum, rating_count,
+                platform_counts, sentiment_counts et topic_counts
+        """
+        with self._lock:
+            self.reset()
+            self.review_count = counters['review_count']
+            self.rating_sum = counters['rating_sum']
+            self.rating_count = counters['rating_count']
+            self.platform_counts = Counter(counters['platform_counts'])
+            self.sentiment_counts = Counter(counters['sentiment_counts'])
+            self.topic_counts = Counter(counters['topic_counts'])
+            self._topics_dirty = True
+    
+    ## Ajoute un avis (et son analyse éventuelle) aux compteurs
+    def add_review(self, review: Dict[str, Any]) -> None:
+        """
+        Ajoute un avis (et son analyse éventuelle) aux compteurs.
+        
+        Args:
+            review (Dict[str, Any]): Avis collecté
+        """
+        with self._lock:
+            self.review_count += 1
+            if review.get('rating') is not None:
+                self.rating_sum += review['rating']
+                self.rating_count += 1
+            self.platform_counts[review.get('platform')] += 1
+            self._count_analysis(review, 1)
+    
+    ## Remplace la contribution de l'analyse d'un avis
+    def update_analysis(self, review: Dict[str, Any], analysis: Dict[str, Any]) -> None:
+        """
+        Remplace la contribution de l'analyse d'un avis et l'applique à l'avis.
+        
+        Args:
+            review (Dict[str, Any]): Avis déjà comptabilisé
+            analysis (Dict[str, Any]): Nouvelle analyse (sentiment, sujets...)
+        """
+        with self._lock:
+            self._count_analysis(review, -1)
+            review.update(analysis)
+            self._count_analysis(review, 1)
+    
+    ## Ajoute ou retire la contribution de l'analyse d'un avis
+    def _count_analysis(self, review: Dict[str, Any], delta: int) -> None:
+        """
+        Ajoute ou retire la contribution de l'analyse d'un avis.
+        
+        Args:
+            review (Dict[str, Any]): Avis concerné
+            delta (int): 1 pour ajouter, -1 pour retirer
+        """
+        if 'sentiment' in review:
+            self._bump(self.sentiment_counts, review['sentiment'], delta)
+        for topic in review.get('topics') or []:
+            self._bump(self.topic_counts, topic, delta)
+            if delta > 0 and (self._top_floor is None
+                              or self._rank((topic, self.topic_counts[topic])) < self._top_floor):
+                self._top_candidates.add(topic)
+    
+    ## Clé de classement d'un sujet (la plus petite est la meilleure)
+    @staticmethod
+    def _rank(item: tuple) -> tuple:
+        """
+        Clé de classement d'un sujet : compteur décroissant, puis nom.
+        
+        Args:
+            item (tuple): (sujet, compteur)
+            
+        Returns:
+            tuple: Clé à trier par ordre croissant
+        """
+        return -item[1], item[0]
+    
+    ## Modifie un compteur en supprimant les clés tombées à zéro
+    @staticmethod
+    def _bump(counter: Counter, key: Any, delta: int) -> None:
+        """
+        Modifie un compteur en supprimant les clés tombées à zéro.
+        
+        Args:
+            counter (Counter): Compteur à modifier
+            key (Any): Clé à modifier
+            delta (int): Variation
+        """
+        counter[key] += delta
+        if counter[key] <= 0:
+            del counter[key]
+    
+    ## Met à jour le classement des sujets les plus fréquents
+    def _refresh_top_topics(self) -> None:
+        """
+        Met à jour le classement des sujets les plus fréquents.
+        
+        Le classement est calculé sur les seuls candidats lorsqu'au moins
+        TOP_TOPICS d'entre eux sont encore classés au seuil ou devant (aucun
+        autre sujet ne peut alors les dépasser); sinon, sur tous les sujets.
+        """
+        top = None
+        if not self._topics_dirty:
+            candidates = [(topic, self.topic_counts[topic]) for topic in self._top_candidates
+                          if self.topic_counts[topic] > 0]
+            if (self._top_floor is None
+                    or sum(self._rank(item) <= self._top_floor for item in candidates) >= self.TOP_TOPICS):
+                top = heapq.nsmallest(self.TOP_TOPICS, candidates, key=self._rank)
+        if top is None:
+            top = heapq.nsmallest(self.TOP_TOPICS, self.topic_counts.items(), key=self._rank)
+        self._top_topics = top
+        self._top_candidates = {topic for topic, _ in top}
+        self._top_floor = self._rank(top[-1]) if len(top) >= self.TOP_TOPICS else None
+        self._topics_dirty = False
+    
+    ## Retourne les KPIs courants
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Retourne les KPIs courants, au même format que ReviewScraper.calculate_kpis.
+        
+        Returns:
+            Dict[str, Any]: KPIs calculés (moyennes, distributions)
+        """
+        with self._lock:
+            if not self.review_count:
+                return {
+                    'average_rating': 0,
+                    'sentiment_score': 0,
+                    'review_count': 0,
+                    'platform_distribution': {},
+                    'sentiment_distribution': {},
+                    'top_topics': []
+                }
+            
+            self._refresh_top_topics()
+            
+            analyzed = sum(self.sentiment_counts.values())
+            sentiment_distribution = {
+                sentiment: count / analyzed * 100
+                for sentiment, count in self.sentiment_counts.items()
+            }
+            
+            return {
+                'average_rating': self.rating_sum / self.rating_count if self.rating_count else 0,
+                'sentiment_score': sentiment_distribution.get('positive', 0),
+                'review_count': self.review_count,
+                'platform_distribution': {
+                    platform: count / self.review_count * 100
+                    for platform, count in self.platform_counts.items()
+                },
+                'sentiment_distribution': sentiment_distribution,
+                'top_topics': list(self._top_topics)
+            }
+
+## Agrégats temporels (jour, semaine, mois) des avis
+class TrendAggregator:
+    """
+    Séries temporelles des avis par jour, semaine et mois, par plateforme.
+    
+    Chaque avis daté alimente un compartiment par granularité, pour sa
+    plateforme et pour l'ensemble des plateformes : somme et nombre des
+    notes, nombre d'avis par sentiment et par sujet. Les compartiments sont
+    mis à jour à chaque ajout et à chaque (ré)analyse, si bien qu'une série
+    se lit en un temps proportionnel au nombre de compartiments demandés.
+    
+    Attributes:
+        first_date (Optional[date]): Date du plus ancien avis agrégé
+        last_date (Optional[date]): Date du plus récent avis agrégé
+    """
+    
+    # Granularités disponibles
+    GRANULARITIES = ('day', 'week', 'month')
+    
+    # Nombre de sujets retenus par compartiment
+    TOP_TOPICS = 5
+    
+    ## Initialise des séries vides
+    def __init__(self):
+        """Initialise des séries vides."""
+        self._lock = threading.Lock()
+        self.reset()
+    
+    ## Vide toutes les séries
+    def reset(self) -> None:
+        """Vide toutes les séries."""
+        self._buckets: Dict[tuple, Dict[str, Any]] = {}
+        self.first_date: Optional[date] = None
+        self.last_date: Optional[date] = None
+    
+    ## Reconstruit les séries à partir d'une liste complète d'avis
+    def rebuild(self, reviews: Any) -> None:
+        """
+        Reconstruit les séries à partir d'une liste complète d'avis.
+        
+        Args:
+            reviews (Any): ReviewStore ou liste d'avis
+        """
+        with self._lock:
+            self.reset()
+        for review in reviews:
+            self.add_review(review)
+    
+    ## Ajoute un avis (et son analyse éventuelle) aux séries
+    def add_review(self, review: Dict[str, Any]) -> None:
+        """
+        Ajoute un avis (et son analyse éventuelle) aux séries.
+        
+        Args:
+            review (Dict[str, Any]): Avis collecté
+        """
+        day = self._review_date(review)
+        if day is None:
+            return
+        with self._lock:
+            if self.first_date is None or day < self.first_date:
+                self.first_date = day
+            if self.last_date is None or day > self.last_date:
+                self.last_date = day
+            for bucket in self._review_buckets(review, day):
+                bucket['review_count'] += 1
+                if review.get('rating') is not None:
+                    bucket['rating_sum'] += review['rating']
+                    bucket['rating_count'] += 1
+                self._count(bucket, review, 1)
+    
+    ## Ajoute ou retire la contribution de l'analyse d'un avis
+    def count_analysis(self, review: Dict[str, Any], delta: int) -> None:
+        """
+        Ajoute ou retire la contribution de l'analyse d'un avis.
+        
+        À appeler avec -1 avant de remplacer l'analyse d'un avis, puis avec
+        1 une fois la nouvelle analyse appliquée.
+        
+        Args:
+            review (Dict[str, Any]): Avis déjà agrégé
+            delta (int): 1 pour ajouter, -1 pour retirer
+        """
+        day = self._review_date(review)
+        if day is None:
+            return
+        with self._lock:
+            for bucket in self._review_buckets(review, day):
+                self._count(bucket, review, delta)
+    
+    ## Retourne une série temporelle
+    def series(self, granularity: str = 'day', date_from: Optional[date] = None,
+               date_to: Optional[date] = None, platform: Optional[str] = None,
+               max_buckets: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Retourne une série temporelle, compartiments vides compris.
+        
+        Args:
+            granularity (str): 'day', 'week' ou 'month'
+            date_from (Optional[date]): Début de la période (défaut: plus ancien avis)
+            date_to (Optional[date]): Fin de la période (défaut: plus récent avis)
+            platform (Optional[str]): Plateforme (défaut: toutes)
+            max_buckets (Optional[int]): Nombre maximum de compartiments
+            
+        Returns:
+            List[Dict[str, Any]]: Un élément par période (début de période,
+                nombre d'avis, note moyenne, sentiments, sujets principaux)
+            
+        Raises:
+            ValueError: Granularité inconnue ou période trop longue
+        """
+        with self._lock:
+            periods = self.periods(granularity, date_from or self.first_date,
+                                   date_to or self.last_date, max_buckets)
+            return [self.summarize_bucket(period, self._buckets.get((granularity, period, platform)))
+                    for period in periods]
+    
+    ## Liste les périodes d'une série
+    @classmethod
+    def periods(cls, granularity: str, date_from: Optional[date], date_to: Optional[date],
+                max_buckets: Optional[int] = None) -> List[date]:
+        """
+        Liste les débuts de période d'une série, sans lire aucun compartiment.
+        
+        Args:
+            granularity (str): 'day', 'week' ou 'month'
+            date_from (Optional[date]): Début de la période (None: série vide)
+            date_to (Optional[date]): Fin de la période (None: série vide)
+            max_buckets (Optional[int]): Nombre maximum de compartiments
+            
+        Returns:
+            List[date]: Premier jour de chaque période, dans l'ordre
+            
+        Raises:
+            ValueError: Granularité inconnue ou période trop longue
+        """
+        if granularity not in cls.GRANULARITIES:
+            raise ValueError(f"Granularité inconnue: {granularity}")
+        if date_from is None or date_to is None or date_from > date_to:
+            return []
+        
+        start = cls._bucket_start(granularity, date_from)
+        if max_buckets is not None and cls._bucket_count(granularity, start, date_to) > max_buckets:
+            raise ValueError(f"Période trop longue (plus de {max_buckets} périodes)")
+        
+        periods = []
+        period = start
+        while period <= date_to:
+            periods.append(period)
+            period = cls._next_period(granularity, period)
+        return periods
+    
+    ## Résume un compartiment
+    @classmethod
+    def summarize_bucket(cls, period: date, bucket: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Résume un compartiment pour la réponse de series.
+        
+        Args:
+            period (date): Début de la période
+            bucket (Optional[Dict[str, Any]]): Compartiment, None s'il est vide
+            
+        Returns:
+            Dict[str, Any]: Résumé de la période
+        """
+        if bucket is None:
+            return {
+                'period': period.isoformat(),
+                'review_count': 0,
+                'average_rating': None,
+                'sentiment_counts': {},
+                'top_topics': []
+            }
+        return {
+            'period': period.isoformat(),
+            'review_count': bucket['review_count'],
+            'average_rating': (bucket['rating_sum'] / bucket['rating_count']
+                               if bucket['rating_count'] else None),
+            'sentiment_counts': dict(bucket['sentiments']),
+            'top_topics': heapq.nsmallest(cls.TOP_TOPICS, bucket['topics'].items(), key=KPIAggregator._rank)
+        }
+    
+    ## Retourne les compartiments alimentés par un avis
+    def _review_buckets(self, review: Dict[str, Any], day: date) -> List[Dict[str, Any]]:
+        """
+        Retourne (en les créant) les compartiments alimentés par un avis.
+        
+        Args:
+            review (Dict[str, Any]): Avis
+            day (date): Date de l'avis
+            
+        Returns:
+            List[Dict[str, Any]]: Compartiments de chaque granularité, pour la
+                plateforme de l'avis et pour l'ensemble des plateformes
+        """
+        buckets = []
+        for granularity in self.GRANULARITIES:
+            period = self._bucket_start(granularity, day)
+            for platform in (review.get('platform'), None):
+                key = (granularity, period, platform)
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = {
+                        'review_count': 0,
+                        'rating_sum': 0.0,
+                        'rating_count': 0,
+                        'sentiments': Counter(),
+                        'topics': Counter()
+                    }
+                buckets.append(bucket)
+        return buckets
+    
+    ## Ajoute ou retire le sentiment et les sujets d'un avis d'un compartiment
+    @staticmethod
+    def _count(bucket: Dict[str, Any], review: Dict[str, Any], delta: int) -> None:
+        """
+        Ajoute ou retire le sentiment et les sujets d'un avis d'un compartiment.
+        
+        Args:
+            bucket (Dict[str, Any]): Compartiment
+            review (Dict[str, Any]): Avis
+            delta (int): 1 pour ajouter, -1 pour retirer
+        """
+        if 'sentiment' in review:
+            KPIAggregator._bump(bucket['sentiments'], review['sentiment'], delta)
+        for topic in review.get('topics') or []:
+            KPIAggregator._bump(bucket['topics'], topic, delta)
+    
+    ## Lit la date d'un avis
+    @staticmethod
+    def _review_date(review: Dict[str, Any]) -> Optional[date]:
+        """
+        Lit la date d'un avis.
+        
+        Args:
+            review (Dict[str, Any]): Avis
+            
+        Returns:
+            Optional[date]: Date de l'avis, None si absente ou invalide
+        """
+        try:
+            return date.fromisoformat(str(review.get('date'))[:10])
+        except ValueError:
+            return None
+    
+    ## Calcule le début de la période contenant une date
+    @staticmethod
+    def _bucket_start(granularity: str, day: date) -> date:
+        """
+        Calcule le début de la période contenant une date.
+        
+        Args:
+            granularity (str): 'day', 'week' (semaines ISO, du lundi) ou 'month'
+            day (date): Date
+            
+        Returns:
+            date: Premier jour de la période
+        """
+        if granularity == 'week':
+            return day - timedelta(days=day.weekday())
+        if granularity == 'month':
+            return day.replace(day=1)
+        return day
+    
+    ## Calcule le début de la période suivante
+    @staticmethod
+    def _next_period(granularity: str, period: date) -> date:
+        """
+        Calcule le début de la période suivante.
+        
+        Args:
+            granularity (str): Granularité
+            period (date): Début de la période courante
+            
+        Returns:
+            date: Début de la période suivante
+        """
+        if granularity == 'week':
+            return period + timedelta(days=7)
+        if granularity == 'month':
+            return date(period.year + period.month // 12, period.month % 12 + 1, 1)
+        return period + timedelta(days=1)
+    
+    ## Compte les périodes entre deux dates
+    @staticmethod
+    def _bucket_count(granularity: str, start: date, end: date) -> int:
+        """
+        Compte les périodes entre le début d'une période et une date de fin.
+        
+        Args:
+            granularity (str): Granularité
+            start (date): Début de la première période
+            end (date): Date de fin incluse
+            
+        Returns:
+            int: Nombre de périodes
+        """
+        if granularity == 'week':
+            return (end - start).days // 7 + 1
+        if granularity == 'month':
+            return (end.year - start.year) * 12 + end.month - start.month + 1
+        return (end - start).days + 1
+
+## Interface des backends de stockage durable des avis
+class ReviewStorageBackend(ABC):
+    """
+    Interface des backends de stockage durable des avis.
+    
+    Un backend conserve les avis collectés et analysés de chaque entreprise
+    au-delà de la durée de vie du processus et exécute lui-même les
+    requêtes filtrées, sans charger tout l'historique en mémoire.
+    """
+    
+    ## Insère ou met à jour des avis
+    @abstractmethod
+    def upsert_reviews(self, company: str, reviews: List[Dict[str, Any]]) -> int:
+        """
+        Insère ou met à jour des avis dans une seule transaction.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            reviews (List[Dict[str, Any]]): Avis à enregistrer (clé: 'id')
+            
+        Returns:
+            int: Nombre d'avis écrits
+        """
+        raise NotImplementedError
+    
+    ## Recherche des avis filtrés
+    @abstractmethod
+    def query_reviews(self, company: str, platform: Optional[str] = None,
+                      date_from: Optional[str] = None, date_to: Optional[str] = None,
+                      sentiment: Optional[str] = None, min_rating: Optional[float] = None,
+                      max_rating: Optional[float] = None, topic: Optional[str] = None,
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Recherche des avis filtrés, du plus récent au plus ancien.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            platform (Optional[str]): Plateforme exacte
+            date_from (Optional[str]): Date minimale incluse (YYYY-MM-DD)
+            date_to (Optional[str]): Date maximale incluse (YYYY-MM-DD)
+            sentiment (Optional[str]): Sentiment exact
+            min_rating (Optional[float]): Note minimale incluse
+            max_rating (Optional[float]): Note maximale incluse
+            topic (Optional[str]): Sujet que l'avis doit mentionner
+            limit (Optional[int]): Nombre maximum d'avis
+            
+        Returns:
+            List[Dict[str, Any]]: Avis correspondants
+        """
+        raise NotImplementedError
+    
+    ## Parcourt des avis filtrés sans les charger tous en mémoire
+    @abstractmethod
+    def iter_query_reviews(self, company: str, after: Optional[tuple] = None,
+                           **filters) -> Iterator[Dict[str, Any]]:
+        """
+        Parcourt des avis filtrés, du plus récent au plus ancien, par blocs.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            after (Optional[tuple]): Clé (date, id) après laquelle reprendre
+            **filters: Filtres de query_reviews (sauf limit)
+            
+        Yields:
+            Dict[str, Any]: Avis correspondant
+        """
+        raise NotImplementedError
+    
+    ## Itère sur tous les avis d'une entreprise
+    @abstractmethod
+    def iter_reviews(self, company: str) -> Iterator[Dict[str, Any]]:
+        """
+        Itère sur tous les avis d'une entreprise, dans l'ordre d'insertion.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            
+        Yields:
+            Dict[str, Any]: Avis enregistré
+        """
+        raise NotImplementedError
+    
+    ## Lit les identifiants des avis d'une entreprise
+    @abstractmethod
+    def get_review_ids(self, company: str) -> set:
+        """
+        Lit les identifiants des avis d'une entreprise (déduplication).
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            
+        Returns:
+            set: Identifiants des avis enregistrés
+        """
+        raise NotImplementedError
+    
+    ## Compte les avis d'une entreprise
+    @abstractmethod
+    def count_reviews(self, company: str) -> int:
+        """
+        Compte les avis d'une entreprise.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            
+        Returns:
+            int: Nombre d'avis enregistrés
+        """
+        raise NotImplementedError
+    
+    ## Enregistre la configuration d'une entreprise
+    @abstractmethod
+    def save_company(self, company_id: str, config: Dict[str, Any]) -> None:
+        """
+        Enregistre la configuration d'une entreprise.
+        
+        Args:
+            company_id (str): Identifiant de l'entreprise
+            config (Dict[str, Any]): Configuration (nom, localisation...)
+        """
+        raise NotImplementedError
+    
+    ## Lit la configuration d'une entreprise
+    @abstractmethod
+    def get_company(self, company_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Lit la configuration d'une entreprise.
+        
+        Args:
+            company_id (str): Identifiant de l'entreprise
+            
+        Returns:
+            Optional[Dict[str, Any]]: Configuration, ou None si inconnue
+        """
+        raise NotImplementedError
+    
+    ## Lit les marqueurs de collecte d'une entreprise
+    @abstractmethod
+    def get_watermarks(self, company: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Lit les marqueurs de collecte par plateforme.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: {plateforme: {'date': ..., 'id': ...}},
+                avec 'resume' et 'head' si une collecte est inachevée
+                (voir ReviewScraper._advance_watermark)
+        """
+        raise NotImplementedError
+    
+    ## Enregistre le marqueur de collecte d'une plateforme
+    @abstractmethod
+    def save_watermark(self, company: str, platform: str, review_date: str, review_id: str,
+                       pending: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Enregistre le marqueur de collecte d'une plateforme.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            platform (str): Clé de la plateforme
+            review_date (str): Date de l'avis le plus récent collecté sans
+                lacune (YYYY-MM-DD)
+            review_id (str): Identifiant de cet avis
+            pending (Optional[Dict[str, Any]]): Point de reprise d'une
+                collecte inachevée ('resume' et 'head'), None sinon
+        """
+        raise NotImplementedError
+    
+    ## Calcule les compteurs des KPIs d'une entreprise dans le backend
+    @abstractmethod
+    def aggregate_kpis(self, company: str) -> Dict[str, Any]:
+        """
+        Calcule les compteurs des KPIs d'une entreprise dans le backend.
+        
+        Sert à initialiser (ou reconstruire) le KPIAggregator d'une
+        entreprise sans charger ses avis; l'agrégateur est ensuite tenu à
+        jour au fil des ajouts et des analyses.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            
+        Returns:
+            Dict[str, Any]: Compteurs au format de KPIAggregator.load
+        """
+        raise NotImplementedError
+    
+    ## Lit la période couverte par les séries temporelles d'une entreprise
+    @abstractmethod
+    def trend_bounds(self, company: str) -> tuple:
+        """
+        Lit la période couverte par les séries temporelles d'une entreprise.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            
+        Returns:
+            tuple: (date du plus ancien avis, date du plus récent), (None, None) sans avis daté
+        """
+        raise NotImplementedError
+    
+    ## Lit les compartiments d'une série temporelle
+    @abstractmethod
+    def trend_buckets(self, company: str, granularity: str, date_from: date, date_to: date,
+                      platform: Optional[str] = None) -> Dict[date, Dict[str, Any]]:
+        """
+        Lit les compartiments non vides d'une série temporelle, tenus à jour
+        à chaque écriture d'avis (voir TrendAggregator).
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            granularity (str): 'day', 'week' ou 'month'
+            date_from (date): Début de la première période
+            date_to (date): Date de fin incluse
+            platform (Optional[str]): Plateforme (défaut: toutes)
+            
+        Returns:
+            Dict[date, Dict[str, Any]]: Compartiment par début de période, au
+                format de TrendAggregator (review_count, rating_sum,
+                rating_count, sentiments, topics)
+        """
+        raise NotImplementedError
+
+## Backend de stockage SQLite (backend par défaut)
+class SQLiteReviewStorage(ReviewStorageBackend):
+    """
+    Backend de stockage SQLite des avis.
+    
+    Les colonnes filtrables (entreprise, plateforme, date, note, sentiment)
+    sont indexées; l'avis complet est conservé en JSON. Les écritures
+    groupées passent par une transaction unique et les filtres sont
+    traduits en SQL. Les compartiments des séries temporelles (jour,
+    semaine, mois; par plateforme et toutes plateformes, plateforme '')
+    sont mis à jour dans la même transaction que les avis.
+    
+    Attributes:
+        path (str): Chemin du fichier SQLite
+    """
+    
+    ## Ouvre la base et crée le schéma si nécessaire
+    def __init__(self, path: str = REVIEW_DB_PATH):
+        """
+        Ouvre la base et crée le schéma si nécessaire.
+        
+        Args:
+            path (str): Chemin du fichier SQLite
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        has_trends = self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'trend_buckets'"
+        ).fetchone() is not None
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS reviews ("
+            "company TEXT NOT NULL, id TEXT NOT NULL, platform TEXT, date TEXT, "
+            "rating REAL, sentiment TEXT, score REAL, topics TEXT, data TEXT NOT NULL, "
+            "updated_at REAL NOT NULL, PRIMARY KEY (company, id));"
+            "CREATE INDEX IF NOT EXISTS idx_reviews_company_date ON reviews (company, date);"
+            "CREATE INDEX IF NOT EXISTS idx_reviews_company_platform_date ON reviews (company, platform, date);"
+            "CREATE INDEX IF NOT EXISTS idx_reviews_company_sentiment ON reviews (company, sentiment);"
+            "CREATE TABLE IF NOT EXISTS companies ("
+            "company TEXT PRIMARY KEY, config TEXT NOT NULL, updated_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS watermarks ("
+            "company TEXT NOT NULL, platform TEXT NOT NULL, date TEXT NOT NULL, "
+            "review_id TEXT NOT NULL, updated_at REAL NOT NULL, pending TEXT, "
+            "PRIMARY KEY (company, platform));"
+            "CREATE TABLE IF NOT EXISTS trend_buckets ("
+            "company TEXT NOT NULL, granularity TEXT NOT NULL, platform TEXT NOT NULL, "
+            "period TEXT NOT NULL, review_count INTEGER NOT NULL, rating_sum REAL NOT NULL, "
+            "rating_count INTEGER NOT NULL, sentiments TEXT NOT NULL, topics TEXT NOT NULL, "
+            "PRIMARY KEY (company, granularity, platform, period));"
+        )
+        # Bases créées avant l'ajout des points de reprise
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(watermarks)")}
+        if 'pending' not in columns:
+            self._db.execute("ALTER TABLE watermarks ADD COLUMN pending TEXT")
+        self._db.commit()
+        # Bases créées avant l'ajout des séries temporelles : calcul initial
+        if not has_trends:
+            self._rebuild_trends()
+    
+    ## Insère ou met à jour des avis
+    def upsert_reviews(self, company: str, reviews: List[Dict[str, Any]]) -> int:
+        """
+        Insère ou met à jour des avis dans une seule transaction.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            reviews (List[Dict[str, Any]]): Avis à enregistrer (clé: 'id')
+            
+        Returns:
+            int: Nombre d'avis écrits
+        """
+        now = time.time()
+        rows = []
+        written = []
+        for review in reviews:
+            review = dict(review)
+            written.append(review)
+            rows.append((
+                company, str(review['id']), review.get('platform'), review.get('date'),
+                review.get('rating'), review.get('sentiment'), review.get('score'),
+                json.dumps(review['topics'], ensure_ascii=False) if 'topics' in review else None,
+                json.dumps(review, ensure_ascii=False), now
+            ))
+        
+        with self._lock, self._db:
+            previous = self._stored_reviews(company, [row[1] for row in rows])
+            self._db.executemany(
+                "INSERT INTO reviews (company, id, platform, date, rating, sentiment, score, "
+                "topics, data, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (company, id) DO UPDATE SET platform = excluded.platform, "
+                "date = excluded.date, rating = excluded.rating, sentiment = excluded.sentiment, "
+                "score = excluded.score, topics = excluded.topics, data = excluded.data, "
+                "updated_at = excluded.updated_at",
+                rows
+            )
+            self._apply_trend_deltas(company, self._trend_deltas(previous, written))
+        return len(rows)
+    
+    ## Lit la version enregistrée d'avis sur le point d'être remplacés
+    def _stored_reviews(self, company: str, review_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Lit la version enregistrée d'avis (à appeler sous le verrou).
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            review_ids (List[str]): Identifiants des avis
+            
+        Returns:
+            List[Dict[str, Any]]: Avis déjà enregistrés parmi ceux demandés
+        """
+        stored = []
+        for start in range(0, len(review_ids), 500):
+            chunk = review_ids[start:start + 500]
+            stored.extend(json.loads(data) for data, in self._db.execute(
+                f"SELECT data FROM reviews WHERE company = ? AND id IN ({', '.join('?' * len(chunk))})",
+                [company, *chunk]
+            ))
+        return stored
+    
+    ## Calcule la variation des compartiments due au remplacement d'avis
+    @staticmethod
+    def _trend_deltas(removed: List[Dict[str, Any]], added: List[Dict[str, Any]]) -> Dict[tuple, Dict[str, Any]]:
+        """
+        Calcule la variation des compartiments des séries temporelles quand
+        des avis sont remplacés (removed) par leur nouvelle version (added).
+        
+        Args:
+            removed (List[Dict[str, Any]]): Anciennes versions des avis
+            added (List[Dict[str, Any]]): Nouvelles versions des avis
+            
+        Returns:
+            Dict[tuple, Dict[str, Any]]: Variation par (granularité, plateforme, période)
+        """
+        deltas: Dict[tuple, Dict[str, Any]] = {}
+        for reviews, sign in ((removed, -1), (added, 1)):
+            for review in reviews:
+                day = TrendAggregator._review_date(review)
+                if day is None:
+                    continue
+                platforms = {'', review.get('platform') or ''}
+                for granularity in TrendAggregator.GRANULARITIES:
+                    period = TrendAggregator._bucket_start(granularity, day).isoformat()
+                    for platform in platforms:
+                        delta = deltas.get((granularity, platform, period))
+                        if delta is None:
+                            delta = deltas[(granularity, platform, period)] = {
+                                'review_count': 0, 'rating_sum': 0.0, 'rating_count': 0,
+                                'sentiments': Counter(), 'topics': Counter()
+                            }
+                        delta['review_count'] += sign
+                        if review.get('rating') is not None:
+                            delta['rating_sum'] += sign * review['rating']
+                            delta['rating_count'] += sign
+                        if review.get('sentiment') is not None:
+                            delta['sentiments'][review['sentiment']] += sign
+                        for topic in review.get('topics') or []:
+                            delta['topics'][topic] += sign
+        return deltas
+    
+    ## Applique des variations aux compartiments enregistrés
+    def _apply_trend_deltas(self, company: str, deltas: Dict[tuple, Dict[str, Any]]) -> None:
+        """
+        Applique des variations aux compartiments enregistrés (à appeler sous
+        le verrou, dans la transaction d'écriture des avis). Les compteurs
+        tombés à zéro sont supprimés, ainsi que les compartiments vides.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            deltas (Dict[tuple, Dict[str, Any]]): Variations (voir _trend_deltas)
+        """
+        for (granularity, platform, period), delta in deltas.items():
+            row = self._db.execute(
+                "SELECT review_count, rating_sum, rating_count, sentiments, topics FROM trend_buckets "
+                "WHERE company = ? AND granularity = ? AND platform = ? AND period = ?",
+                (company, granularity, platform, period)
+            ).fetchone()
+            review_count, rating_sum, rating_count, sentiments, topics = row or (0, 0.0, 0, '{}', '{}')
+            review_count += delta['review_count']
+            if review_count <= 0:
+                self._db.execute(
+                    "DELETE FROM trend_buckets WHERE company = ? AND granularity = ? "
+                    "AND platform = ? AND period = ?", (company, granularity, platform, period)
+                )
+                continue
+            sentiments = Counter(json.loads(sentiments))
+            sentiments.update(delta['sentiments'])
+            topics = Counter(json.loads(topics))
+            topics.update(delta['topics'])
+            self._db.execute(
+                "INSERT OR REPLACE INTO trend_buckets (company, granularity, platform, period, "
+                "review_count, rating_sum, rating_count, sentiments, topics) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (company, granularity, platform, period, review_count,
+                 rating_sum + delta['rating_sum'], rating_count + delta['rating_count'],
+                 json.dumps({key: count for key, count in sentiments.items() if count > 0}, ensure_ascii=False),
+                 json.dumps({key: count for key, count in topics.items() if count > 0}, ensure_ascii=False))
+            )
+    
+    ## Calcule les compartiments de tous les avis déjà enregistrés
+    def _rebuild_trends(self) -> None:
+        """
+        Recalcule les compartiments des séries temporelles à partir de tous
+        les avis enregistrés, par blocs (base créée avant leur ajout).
+        """
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM trend_buckets")
+            last_rowid = 0
+            while True:
+                rows = self._db.execute(
+                    "SELECT rowid, company, data FROM reviews WHERE rowid > ? ORDER BY rowid LIMIT 1000",
+                    (last_rowid,)
+                ).fetchall()
+                if not rows:
+                    return
+                by_company: Dict[str, List[Dict[str, Any]]] = {}
+                for _, company, data in rows:
+                    by_company.setdefault(company, []).append(json.loads(data))
+                for company, reviews in by_company.items():
+                    self._apply_trend_deltas(company, self._trend_deltas([], reviews))
+                last_rowid = rows[-1][0]
+    
+    ## Recherche des avis filtrés
+    def query_reviews(self, company: str, platform: Optional[str] = None,
+                      date_from: Optional[str] = None, date_to: Optional[str] = None,
+                      sentiment: Optional[str] = None, min_rating: Optional[float] = None,
+                      max_rating: Optional[float] = None, topic: Optional[str] = None,
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Recherche des avis filtrés, du plus récent au plus ancien.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            platform (Optional[str]): Plateforme exacte
+            date_from (Optional[str]): Date minimale incluse (YYYY-MM-DD)
+            date_to (Optional[str]): Date maximale incluse (YYYY-MM-DD)
+            sentiment (Optional[str]): Sentiment exact
+            min_rating (Optional[float]): Note minimale incluse
+            max_rating (Optional[float]): Note maximale incluse
+            topic (Optional[str]): Sujet que l'avis doit mentionner
+            limit (Optional[int]): Nombre maximum d'avis
+            
+        Returns:
+            List[Dict[str, Any]]: Avis correspondants
+        """
+        clauses, params = self._filter_clauses(company, platform, date_from, date_to,
+                                               sentiment, min_rating, max_rating, topic)
+        
+        sql = f"SELECT data FROM reviews WHERE {' AND '.join(clauses)} ORDER BY date DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    ## Parcourt des avis filtrés sans les charger tous en mémoire
+    def iter_query_reviews(self, company: str, platform: Optional[str] = None,
+                           date_from: Optional[str] = None, date_to: Optional[str] = None,
+                           sentiment: Optional[str] = None, min_rating: Optional[float] = None,
+                           max_rating: Optional[float] = None, topic: Optional[str] = None,
+                           after: Optional[tuple] = None,
+                           chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Parcourt des avis filtrés, du plus récent au plus ancien, par blocs.
+        
+        Chaque bloc est lu par une requête indépendante reprenant après la
+        dernière clé (date, id) lue : le verrou n'est pas conservé entre deux
+        blocs et la mémoire utilisée ne dépend que de chunk_size. La même
+        clé sert de curseur de pagination (paramètre after).
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            platform, date_from, date_to, sentiment, min_rating, max_rating, topic:
+                Filtres (voir query_reviews)
+            after (Optional[tuple]): Clé (date, id) du dernier avis déjà lu
+            chunk_size (int): Nombre d'avis lus par requête
+            
+        Yields:
+            Dict[str, Any]: Avis correspondant
+        """
+        clauses, params = self._filter_clauses(company, platform, date_from, date_to,
+                                               sentiment, min_rating, max_rating, topic)
+        where = ' AND '.join(clauses)
+        last_key = after
+        while True:
+            sql, args = f"SELECT date, id, data FROM reviews WHERE {where}", list(params)
+            if last_key is not None:
+                # Les dates NULL sont classées en dernier dans l'ordre décroissant
+                if last_key[0] is None:
+                    sql += " AND date IS NULL AND id < ?"
+                    args.append(last_key[1])
+                else:
+                    sql += " AND (date IS NULL OR date < ? OR (date = ? AND id < ?))"
+                    args.extend([last_key[0], last_key[0], last_key[1]])
+            sql += " ORDER BY date DESC, id DESC LIMIT ?"
+            args.append(chunk_size)
+            
+            with self._lock:
+                rows = self._db.execute(sql, args).fetchall()
+            for _, _, data in rows:
+                yield json.loads(data)
+            if len(rows) < chunk_size:
+                return
+            last_key = rows[-1][:2]
+    
+    ## Construit les clauses SQL des filtres de recherche
+    @staticmethod
+    def _filter_clauses(company: str, platform: Optional[str], date_from: Optional[str],
+                        date_to: Optional[str], sentiment: Optional[str],
+                        min_rating: Optional[float], max_rating: Optional[float],
+                        topic: Optional[str] = None) -> tuple:
+        """
+        Construit les clauses SQL des filtres de recherche.
+        
+        Returns:
+            tuple: (liste des clauses, liste des paramètres)
+        """
+        clauses = ["company = ?"]
+        params: List[Any] = [company]
+        for clause, value in (("platform = ?", platform), ("date >= ?", date_from),
+                              ("date <= ?", date_to), ("sentiment = ?", sentiment),
+                              ("rating >= ?", min_rating), ("rating <= ?", max_rating)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        if topic is not None:
+            clauses.append("EXISTS (SELECT 1 FROM json_each(reviews.topics) WHERE value = ?)")
+            params.append(topic)
+        return clauses, params
+    
+    ## Itère sur tous les avis d'une entreprise
+    def iter_reviews(self, company: str) -> Iterator[Dict[str, Any]]:
+        """
+        Itère sur tous les avis d'une entreprise, dans l'ordre d'insertion.
+        
+        Les avis sont lus par blocs pour ne pas charger toute la table.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            
+        Yields:
+            Dict[str, Any]: Avis enregistré
+        """
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT rowid, data FROM reviews WHERE company = ? AND rowid > ? "
+                    "ORDER BY rowid LIMIT 1000", (company, last_rowid)
+                ).fetchall()
+            if not rows:
+                return
+            for rowid, data in rows:
+                yield json.loads(data)
+            last_rowid = rows[-1][0]
+    
+    ## Lit les identifiants des avis d'une entreprise
+    def get_review_ids(self, company: str) -> set:
+        """
+        Lit les identifiants des avis d'une entreprise (sans décoder les avis).
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            
+        Returns:
+            set: Identifiants des avis enregistrés
+        """
+        with self._lock:
+            rows = self._db.execute("SELECT id FROM reviews WHERE company = ?", (company,)).fetchall()
+        return {review_id for review_id, in rows}
+    
+    ## Compte les avis d'une entreprise
+    def count_reviews(self, company: str) -> int:
+        """
+        Compte les avis d'une entreprise.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            
+        Returns:
+            int: Nombre d'avis enregistrés
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM reviews WHERE company = ?", (company,)
+            ).fetchone()[0]
+    
+    ## Enregistre la configuration d'une entreprise
+    def save_company(self, company_id: str, config: Dict[str, Any]) -> None:
+        """
+        Enregistre la configuration d'une entreprise.
+        
+        Args:
+            company_id (str): Identifiant de l'entreprise
+            config (Dict[str, Any]): Configuration (nom, localisation...)
+        """
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO companies (company, config, updated_at) VALUES (?, ?, ?)",
+                (company_id, json.dumps(config, ensure_ascii=False), time.time())
+            )
+    
+    ## Lit la configuration d'une entreprise
+    def get_company(self, company_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Lit la configuration d'une entreprise.
+        
+        Args:
+            company_id (str): Identifiant de l'entreprise
+            
+        Returns:
+            Optional[Dict[str, Any]]: Configuration, ou None si inconnue
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT config FROM companies WHERE company = ?", (company_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    ## Lit les marqueurs de collecte d'une entreprise
+    def get_watermarks(self, company: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Lit les marqueurs de collecte par plateforme.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: {plateforme: {'date': ..., 'id': ...}},
+                avec 'resume' et 'head' si une collecte est inachevée
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT platform, date, review_id, pending FROM watermarks WHERE company = ?", (company,)
+            ).fetchall()
+        return {
+            platform: {'date': review_date, 'id': review_id, **(json.loads(pending) if pending else {})}
+            for platform, review_date, review_id, pending in rows
+        }
+    
+    ## Enregistre le marqueur de collecte d'une plateforme
+    def save_watermark(self, company: str, platform: str, review_date: str, review_id: str,
+                       pending: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Enregistre le marqueur de collecte d'une plateforme.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            platform (str): Clé de la plateforme
+            review_date (str): Date de l'avis le plus récent collecté sans
+                lacune (YYYY-MM-DD)
+            review_id (str): Identifiant de cet avis
+            pending (Optional[Dict[str, Any]]): Point de reprise ('resume'
+                et 'head'), None si la collecte est complète
+        """
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO watermarks (company, platform, date, review_id, updated_at, pending) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (company, platform, review_date, review_id, time.time(),
+                 json.dumps(pending) if pending else None)
+            )
+    
+    ## Calcule les compteurs des KPIs d'une entreprise dans le backend
+    def aggregate_kpis(self, company: str) -> Dict[str, Any]:
+        """
+        Calcule les compteurs des KPIs d'une entreprise par des agrégats SQL.
+        
+        Les sujets sont triés comme dans KPIAggregator (compteur décroissant,
+        puis nom) pour un résultat identique d'un backend à l'autre.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            
+        Returns:
+            Dict[str, Any]: Compteurs au format de KPIAggregator.load
+        """
+        with self._lock:
+            total, rating_sum, rating_count = self._db.execute(
+                "SELECT COUNT(*), TOTAL(rating), COUNT(rating) FROM reviews WHERE company = ?", (company,)
+            ).fetchone()
+            platforms = self._db.execute(
+                "SELECT platform, COUNT(*) FROM reviews WHERE company = ? GROUP BY platform",
+                (company,)
+            ).fetchall()
+            sentiments = self._db.execute(
+                "SELECT sentiment, COUNT(*) FROM reviews WHERE company = ? "
+                "AND sentiment IS NOT NULL GROUP BY sentiment", (company,)
+            ).fetchall()
+            topics = self._db.execute(
+                "SELECT topic.value, COUNT(*) AS n FROM reviews, json_each(reviews.topics) AS topic "
+                "WHERE reviews.company = ? AND reviews.topics IS NOT NULL "
+                "GROUP BY topic.value ORDER BY n DESC, topic.value",
+                (company,)
+            ).fetchall()
+        
+        return {
+            'review_count': total,
+            'rating_sum': rating_sum,
+            'rating_count': rating_count,
+            'platform_counts': Counter(dict(platforms)),
+            'sentiment_counts': Counter(dict(sentiments)),
+            'topic_counts': Counter(dict(topics))
+        }
+    
+    ## Lit la période couverte par les séries temporelles d'une entreprise
+    def trend_bounds(self, company: str) -> tuple:
+        """
+        Lit la période couverte par les séries temporelles d'une entreprise,
+        dans les compartiments journaliers (clé primaire, sans lire les avis).
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            
+        Returns:
+            tuple: (date du plus ancien avis, date du plus récent), (None, None) sans avis daté
+        """
+        with self._lock:
+            first, last = self._db.execute(
+                "SELECT MIN(period), MAX(period) FROM trend_buckets "
+                "WHERE company = ? AND granularity = 'day' AND platform = ''", (company,)
+            ).fetchone()
+        if first is None:
+            return None, None
+        return date.fromisoformat(first), date.fromisoformat(last)
+    
+    ## Lit les compartiments d'une série temporelle
+    def trend_buckets(self, company: str, granularity: str, date_from: date, date_to: date,
+                      platform: Optional[str] = None) -> Dict[date, Dict[str, Any]]:
+        """
+        Lit les compartiments non vides d'une série temporelle.
+        
+        Args:
+            company (str): Identifiant de l'entreprise
+            granularity (str): 'day', 'week' ou 'month'
+            date_from (date): Début de la première période
+            date_to (date): Date de fin incluse
+            platform (Optional[str]): Plateforme (défaut: toutes)
+            
+        Returns:
+            Dict[date, Dict[str, Any]]: Compartiment par début de période
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT period, review_count, rating_sum, rating_count, sentiments, topics "
+                "FROM trend_buckets WHERE company = ? AND granularity = ? AND platform = ? "
+                "AND period BETWEEN ? AND ?",
+                (company, granularity, platform or '', date_from.isoformat(), date_to.isoformat())
+            ).fetchall()
+        return {
+            date.fromisoformat(period): {
+                'review_count': review_count,
+                'rating_sum': rating_sum,
+                'rating_count': rating_count,
+                'sentiments': Counter(json.loads(sentiments)),
+                'topics': Counter(json.loads(topics))
+            }
+            for period, review_count, rating_sum, rating_count, sentiments, topics in rows
+        }
+
+# Backend partagé, créé à la première utilisation
+_review_storage: Optional[ReviewStorageBackend] = None
+_review_storage_lock = threading.Lock()
+
+## Retourne le backend de stockage partagé (None si désactivé)
+def get_review_storage() -> Optional[ReviewStorageBackend]:
+    """
+    Retourne le backend de stockage partagé.
+    
+    Returns:
+        Optional[ReviewStorageBackend]: Backend SQLite, ou None si
+            REVIEW_DB_PATH est vide (stockage en mémoire seulement)
+    """
+    global _review_storage
+    with _review_storage_lock:
+        if _review_storage is None and REVIEW_DB_PATH:
+            _review_storage = SQLiteReviewStorage(REVIEW_DB_PATH)
+        return _review_storage
+
+# Valeur par défaut du paramètre storage : backend partagé (None désactive
+# le stockage durable)
+_SHARED_STORAGE = object()
+
+## Classe principale pour l'orchestration de la collecte et l'analyse des avis
+## Coordonne toutes les opérations de collecte, analyse et génération de rapports
+class ReviewScraper:
+    """
+    Orchestrateur principal pour la collecte et l'analyse des avis.
+    
+    Cette classe coordonne:
+    - La collecte des avis depuis différentes plateformes
+    - L'analyse de sentiment avec OpenAI
+    - L'extraction des sujets
+    - Le calcul des KPIs
+    
+    Attributes:
+        business_name (str): Nom de l'entreprise
+        company_id (str): Identifiant de l'entreprise
+        language (str): Langue des avis à collecter
+        location (str): Localisation utilisée pour la recherche Google
+        app_name (str): Nom de l'application sur l'App Store
+        domain (str): Domaine de l'entreprise sur Trustpilot
+        countries (List[str]): Storefronts App Store interrogés
+        google_api (GoogleReviewsAPI): Client API Google
+        appstore_api (AppStoreAPI): Client API App Store
+        trustpilot_api (TrustpilotAPI): Client API Trustpilot
+        sentiment_cache (SentimentCache): Cache des analyses LLM
+        rate_limiter (LLMRateLimiter): Limiteur de débit des appels LLM
+        local_scorer (LocalSentimentScorer): Moteur de sentiment local
+        topic_extractor (LocalTopicExtractor): Moteur de sujets local
+        storage (Optional[ReviewStorageBackend]): Stockage durable des avis
+        reviews (ReviewStore): Avis collectés, stockés en colonnes (avec un
+            stockage durable, chargés seulement par load_reviews)
+        review_ids (set): Index des identifiants déjà collectés (déduplication)
+        watermarks (Dict[str, Dict[str, Any]]): Marqueur de collecte par
+            plateforme ({'date': ..., 'id': ...}, plus 'resume' et 'head' si
+            une collecte est inachevée)
+        kpis (KPIAggregator): KPIs maintenus au fil de l'eau
+        trends (TrendAggregator): Séries temporelles maintenues au fil de l'eau
+        last_analysis_stats (Dict[str, int]): Bilan de la dernière analyse
+    """
+    
+    # Plateformes supportées, dans l'ordre de collecte
+    PLATFORMS = ('google', 'appstore', 'trustpilot')
+
+## Initialise le scraper avec les paramètres de base et les clients API
+    def __init__(self, business_name: str, language: str = 'fr',
+                 sentiment_cache: Optional[SentimentCache] = None,
+                 rate_limiter: Optional[LLMRateLimiter] = None,
+                 storage: Optional[ReviewStorageBackend] = _SHARED_STORAGE,
+                 company_id: Optional[str] = None,
+                 location: str = 'France',
+                 app_name: Optional[str] = None,
+                 domain: Optional[str] = None,
+                 countries: Optional[List[str]] = None):
+        """
+        Initialise le scraper avec les paramètres de base.
+        
+        Seuls les marqueurs de collecte sont lus dans le stockage durable :
+        les avis enregistrés ne sont chargés en mémoire qu'à la première
+        opération qui en a besoin (voir load_reviews).
+        
+        Args:
+            business_name (str): Nom de l'entreprise
+            language (str): Langue des avis (défaut: 'fr')
+            sentiment_cache (Optional[SentimentCache]): Cache des analyses
+                (défaut: cache partagé)
+            rate_limiter (Optional[LLMRateLimiter]): Limiteur de débit LLM
+                (défaut: limiteur partagé)
+            storage (Optional[ReviewStorageBackend]): Stockage durable
+                (défaut: backend partagé défini par REVIEW_DB_PATH; None:
+                avis en mémoire seulement)
+            company_id (Optional[str]): Identifiant de l'entreprise dans le
+                stockage (défaut: nom de l'entreprise)
+            location (str): Localisation pour la recherche Google (défaut: 'France')
+            app_name (Optional[str]): Nom de l'application sur l'App Store
+                (défaut: nom de l'entreprise)
+            domain (Optional[str]): Domaine sur Trustpilot
+                (défaut: nom de l'entreprise suivi de '.com')
+            countries (Optional[List[str]]): Storefronts App Store interrogés
+                (défaut: APPSTORE_COUNTRIES)
+        """
+        self.business_name = business_name
+        self.company_id = company_id or business_name
+        self.language = language
+        self.location = location
+        self.app_name = app_name or business_name
+        self.domain = domain or f"{business_name}.com"
+        self.countries = list(countries or APPSTORE_COUNTRIES)
+        self.google_api = GoogleReviewsAPI()
+        self.appstore_api = AppStoreAPI()
+        self.trustpilot_api = TrustpilotAPI()
+        self.sentiment_cache = sentiment_cache or get_sentiment_cache()
+        self.rate_limiter = rate_limiter or get_llm_rate_limiter()
+        self.local_scorer = LocalSentimentScorer()
+        self.topic_extractor = LocalTopicExtractor()
+        self.storage = get_review_storage() if storage is _SHARED_STORAGE else storage
+        self.reviews = ReviewStore()
+        self.review_ids = set()
+        # Clés (date, id, position) des avis en mémoire, triées (voir page_reviews)
+        self._sorted_keys: List[tuple] = []
+        self._sorted_keys_lock = threading.Lock()
+        self.watermarks: Dict[str, Dict[str, str]] = {}
+        self.kpis = KPIAggregator()
+        self.trends = TrendAggregator()
+        self.last_analysis_stats = {'analyzed': 0, 'reused': 0, 'escalated_to_llm': 0, 'failed': 0}
+        # Sans stockage durable, la mémoire contient déjà tous les avis
+        self._loaded = self._ids_loaded = self._kpis_seeded = self.storage is None
+        
+        if self.storage is not None:
+            self.watermarks = self.storage.get_watermarks(self.company_id)
+
+## Charge en mémoire les avis enregistrés dans le stockage durable
+    def load_reviews(self) -> None:
+        """
+        Charge en mémoire les avis enregistrés dans le stockage durable.
+        
+        Le chargement n'a lieu qu'une fois, à la première opération qui
+        parcourt les avis en mémoire (analyse, sujets, séries temporelles);
+        les avis ajoutés ensuite y sont conservés au fil de l'eau. Les
+        recherches et rapports sont lus directement dans le stockage, les
+        KPIs dans l'agrégateur (voir _seed_kpis).
+        """
+        if self._loaded:
+            return
+        for review in self.storage.iter_reviews(self.company_id):
+            self.reviews.append(review)
+            self.review_ids.add(str(review['id']))
+            if not self._kpis_seeded:
+                self.kpis.add_review(review)
+            self.trends.add_review(review)
+        self._loaded = self._ids_loaded = self._kpis_seeded = True
+    
+## Initialise les KPIs depuis le stockage durable
+    def _seed_kpis(self) -> None:
+        """
+        Initialise l'agrégateur de KPIs depuis le stockage durable, une seule
+        fois et sans charger les avis (ReviewStorageBackend.aggregate_kpis).
+        
+        Tant qu'il n'est pas initialisé, les avis ajoutés ne sont comptés
+        que dans le stockage; ensuite l'agrégateur est tenu à jour par
+        add_reviews et les analyses.
+        """
+        if not self._kpis_seeded:
+            self.kpis.load(self.storage.aggregate_kpis(self.company_id))
+            self._kpis_seeded = True
+    
+## Retourne l'index des identifiants connus (déduplication)
+    def _known_review_ids(self) -> set:
+        """
+        Retourne l'index des identifiants connus, lu dans le stockage durable
+        à la première utilisation sans charger les avis eux-mêmes.
+        
+        Returns:
+            set: Identifiants des avis déjà collectés
+        """
+        if not self._ids_loaded:
+            self.review_ids.update(self.storage.get_review_ids(self.company_id))
+            self._ids_loaded = True
+        return self.review_ids
+    
+## Compte les avis de l'entreprise
+    def review_count(self) -> int:
+        """
+        Compte les avis de l'entreprise, dans le stockage durable s'il est
+        configuré (sans charger les avis en mémoire).
+        
+        Returns:
+            int: Nombre d'avis
+        """
+        if self.storage is not None:
+            return self.storage.count_reviews(self.company_id)
+        return len(self.reviews)
+
+## Collecte les avis depuis toutes les plateformes configurées
+    @traced('collection')
+    def collect_reviews(self, max_results: int = 100,
+                        platforms: Optional[List[str]] = None,
+                        concurrent: bool = True,
+                        max_workers: int = COLLECTION_MAX_WORKERS,
+                        timeouts: Optional[Dict[str, float]] = None,
+                        progress: Optional[Callable[..., None]] = None,
+                        cancelled: Optional[threading.Event] = None,
+                        full_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Collecte les avis depuis toutes les plateformes configurées.
+        
+        La collecte est différentielle : pour chaque plateforme, seuls les
+        avis postérieurs au marqueur (avis le plus récent collecté sans
+        lacune) sont demandés et la pagination s'arrête dès qu'elle l'atteint.
+        Une collecte limitée par max_results avant d'atteindre le marqueur
+        laisse un point de reprise (voir _advance_watermark). full_refresh
+        ignore les marqueurs.
+        
+        En mode concurrent, la chaîne "résolution de l'ID puis récupération
+        des avis" de chaque plateforme s'exécute dans son propre thread. Une
+        plateforme qui dépasse son délai est ignorée : les avis des autres
+        plateformes sont conservés (résultat partiel).
+        
+        Une annulation (cancelled) est prise en compte entre deux plateformes :
+        les avis déjà ajoutés sont conservés.
+        
+        Args:
+            max_results (int): Nombre maximum d'avis par plateforme
+            platforms (Optional[List[str]]): Plateformes à interroger
+                (None: google, appstore, trustpilot; liste vide: aucune)
+            concurrent (bool): Exécute les plateformes en parallèle
+            max_workers (int): Nombre maximum de threads simultanés
+            timeouts (Optional[Dict[str, float]]): Délai maximum en secondes
+                par plateforme, mesuré depuis le début de la collecte
+            progress (Optional[Callable[..., None]]): Appelé avec total= (nombre
+                de plateformes) puis done=1, fetched=<avis> par plateforme traitée
+            cancelled (Optional[threading.Event]): Signal d'annulation
+            full_refresh (bool): Recollecte sans tenir compte des marqueurs
+            
+        Returns:
+            Dict[str, Any]: Nombre d'avis nouveaux par plateforme, liste des
+                plateformes en dépassement de délai et nombre de doublons ignorés
+        """
+        platforms = list(self.PLATFORMS) if platforms is None else platforms
+        timeouts = {**PLATFORM_TIMEOUTS, **(timeouts or {})}
+        counts = {platform: 0 for platform in platforms}
+        timed_out = []
+        duplicates = 0
+        watermarks = {} if full_refresh else dict(self.watermarks)
+        progress = progress or (lambda **counters: None)
+        progress(total=len(platforms))
+        # L'index de déduplication est lu avant de lancer les threads
+        self._known_review_ids()
+        
+        if not concurrent:
+            for platform in platforms:
+                if cancelled is not None and cancelled.is_set():
+                    break
+                reviews = self._collect_platform(platform, max_results, watermarks.get(platform))
+                counts[platform] = self.add_reviews(reviews)
+                REVIEWS_COLLECTED.inc(counts[platform], company=self.company_id, platform=platform)
+                self._advance_watermark(platform, reviews, max_results, watermarks.get(platform))
+                duplicates += len(reviews) - counts[platform]
+                progress(done=1, fetched=len(reviews))
+            return {'reviews_per_platform': counts, 'timed_out': timed_out, 'duplicates': duplicates}
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(platforms))))
+        futures = {}
+        try:
+            start = time.monotonic()
+            futures = {
+                platform: executor.submit(with_current_trace(self._collect_platform), platform, max_results,
+                                          watermarks.get(platform))
+                for platform in platforms
+            }
+            
+            # Les résultats sont ajoutés dans l'ordre des plateformes pour
+            # conserver un ordre stable des avis
+            for platform, future in futures.items():
+                if cancelled is not None and cancelled.is_set():
+                    break
+                remaining = start + timeouts.get(platform, 30) - time.monotonic()
+                try:
+                    reviews = future.result(timeout=max(0.0, remaining))
+                except FutureTimeoutError:
+                    future.cancel()
+                    timed_out.append(platform)
+                    print(f"Délai dépassé pour la plateforme {platform}")
+                    progress(done=1)
+                    continue
+                except Exception as e:
+                    print(f"Erreur lors de la collecte sur {platform}: {e}")
+                    progress(done=1)
+                    continue
+                counts[platform] = self.add_reviews(reviews)
+                REVIEWS_COLLECTED.inc(counts[platform], company=self.company_id, platform=platform)
+                duplicates += len(reviews) - counts[platform]
+                self._advance_watermark(platform, reviews, max_results, watermarks.get(platform))
+                progress(done=1, fetched=len(reviews))
+        finally:
+            # Ne bloque pas sur une plateforme lente : son thread se termine
+            # en arrière-plan et son résultat est ignoré. Les plateformes pas
+            # encore démarrées sont annulées (cancel_futures n'existe qu'à
+            # partir de Python 3.9)
+            for future in futures.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+        
+        return {'reviews_per_platform': counts, 'timed_out': timed_out, 'duplicates': duplicates}
+
+## Ajoute des avis collectés et met à jour les KPIs
+    def add_reviews(self, reviews: List[Dict[str, Any]]) -> int:
+        """
+        Ajoute des avis collectés et met à jour les KPIs et séries temporelles.
+        
+        Les avis dont l'identifiant est déjà connu (collecte précédente ou
+        doublon dans le lot) sont ignorés : le test dans l'index review_ids
+        se fait en temps constant. Tant que les avis stockés ne sont pas
+        chargés en mémoire, les nouveaux avis sont seulement enregistrés (et
+        comptés dans les KPIs si l'agrégateur est déjà initialisé).
+        
+        Args:
+            reviews (List[Dict[str, Any]]): Avis formatés
+            
+        Returns:
+            int: Nombre d'avis nouveaux effectivement ajoutés
+        """
+        known = self._known_review_ids()
+        added = []
+        for review in reviews:
+            review_id = str(review['id'])
+            if review_id in known:
+                continue
+            known.add(review_id)
+            if self._loaded:
+                # Un avis n'est visible par page_reviews qu'une fois écrit en entier
+                with self._sorted_keys_lock:
+                    self.reviews.append(review)
+                self.trends.add_review(review)
+            if self._kpis_seeded:
+                self.kpis.add_review(review)
+            added.append(review)
+        self._persist(added)
+        return len(added)
+    
+## Enregistre des avis dans le stockage durable
+    @traced('storage.write')
+    def _persist(self, reviews: List[Dict[str, Any]]) -> None:
+        """
+        Enregistre des avis dans le stockage durable, s'il est configuré.
+        
+        Un échec d'écriture est signalé sans interrompre la collecte ou l'analyse.
+        
+        Args:
+            reviews (List[Dict[str, Any]]): Avis à enregistrer
+        """
+        if self.storage is None or not reviews:
+            return
+        try:
+            self.storage.upsert_reviews(self.company_id, reviews)
+        except sqlite3.Error as e:
+            print(f"Erreur lors de l'enregistrement des avis: {e}")
+    
+## Recherche des avis filtrés
+    @traced('storage.query')
+    def query_reviews(self, **filters) -> List[Dict[str, Any]]:
+        """
+        Recherche des avis filtrés, du plus récent au plus ancien.
+        
+        Les filtres sont exécutés par le stockage durable lorsqu'il est
+        configuré, sinon par un parcours des avis en mémoire.
+        
+        Args:
+            **filters: platform, date_from, date_to, sentiment, min_rating,
+                max_rating, topic, limit (voir ReviewStorageBackend.query_reviews)
+            
+        Returns:
+            List[Dict[str, Any]]: Avis correspondants
+        """
+        if self.storage is not None:
+            return self.storage.query_reviews(self.company_id, **filters)
+        
+        limit = filters.pop('limit', None)
+        matches = list(filter(self._review_filter(filters), self.reviews))
+        matches.sort(key=self.review_key, reverse=True)
+        return [review.to_dict() for review in (matches[:limit] if limit is not None else matches)]
+    
+## Construit le prédicat des filtres de recherche en mémoire
+    @staticmethod
+    def _review_filter(filters: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+        """
+        Construit le prédicat des filtres de recherche en mémoire.
+        
+        Args:
+            filters (Dict[str, Any]): Filtres de query_reviews (sans limit)
+            
+        Returns:
+            Callable[[Dict[str, Any]], bool]: Vrai pour un avis retenu
+        """
+        checks = {
+            'platform': lambda review, value: review.get('platform') == value,
+            # Comme en SQL, un avis sans date ou sans note échoue aux bornes
+            'date_from': lambda review, value: bool(review.get('date')) and review['date'] >= value,
+            'date_to': lambda review, value: bool(review.get('date')) and review['date'] <= value,
+            'sentiment': lambda review, value: review.get('sentiment') == value,
+            'min_rating': lambda review, value: review.get('rating') is not None and review['rating'] >= value,
+            'max_rating': lambda review, value: review.get('rating') is not None and review['rating'] <= value,
+            'topic': lambda review, value: value in (review.get('topics') or [])
+        }
+        active = [(checks[name], value) for name, value in filters.items() if value is not None]
+        return lambda review: all(check(review, value) for check, value in active)
+    
+## Lit une page d'avis filtrés à partir d'un curseur
+    @traced('storage.query')
+    def page_reviews(self, limit: int, after: Optional[tuple] = None,
+                     **filters) -> tuple:
+        """
+        Lit une page d'avis filtrés, du plus récent au plus ancien.
+        
+        La pagination se fait par clé (date, id) et non par décalage : le
+        coût d'une page ne dépend pas de sa position et les avis ajoutés
+        entre deux pages ne provoquent ni doublon ni saut. Sans stockage
+        durable, les avis en mémoire sont parcourus à partir du curseur dans
+        un index trié des clés, complété au fil des ajouts.
+        
+        Args:
+            limit (int): Nombre maximum d'avis de la page
+            after (Optional[tuple]): Clé (date, id) du dernier avis de la page
+                précédente (None pour la première page)
+            **filters: platform, date_from, date_to, sentiment, min_rating,
+                max_rating, topic (voir query_reviews)
+            
+        Returns:
+            tuple: (avis de la page, clé de l'avis suivant ou None si c'est la
+                dernière page)
+        """
+        if self.storage is not None:
+            rows = list(islice(
+                self.storage.iter_query_reviews(self.company_id, after=after,
+                                                chunk_size=limit + 1, **filters),
+                limit + 1
+            ))
+        else:
+            matches = self._review_filter(filters)
+            rows = []
+            with self._sorted_keys_lock:
+                keys = self._sync_sorted_keys()
+                end = len(keys) if after is None else bisect.bisect_left(keys, (after[0] or '', str(after[1])))
+                for position in range(end - 1, -1, -1):
+                    review = self.reviews[keys[position][2]]
+                    if matches(review):
+                        rows.append(review.to_dict())
+                        if len(rows) > limit:
+                            break
+        
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, (rows[-1].get('date'), str(rows[-1]['id']))
+    
+## Complète l'index trié des avis en mémoire
+    def _sync_sorted_keys(self) -> List[tuple]:
+        """
+        Complète l'index trié des avis en mémoire avec les avis ajoutés
+        depuis le dernier appel (la date et l'identifiant d'un avis ne
+        changent pas après son ajout). Doit être appelé sous
+        _sorted_keys_lock : le nombre de clés indexées sert de position de
+        reprise et ne doit pas être lu par deux appels concurrents.
+        
+        Returns:
+            List[tuple]: Clés (date, id, position) par ordre croissant
+        """
+        keys = self._sorted_keys
+        for position in range(len(keys), len(self.reviews)):
+            bisect.insort(keys, (*self.review_key(self.reviews[position]), position))
+        return keys
+    
+## Clé de tri des avis (date puis identifiant)
+    @staticmethod
+    def review_key(review: Dict[str, Any]) -> tuple:
+        """
+        Clé de tri des avis : date puis identifiant.
+        
+        Args:
+            review (Dict[str, Any]): Avis
+            
+        Returns:
+            tuple: (date ou '', identifiant sous forme de chaîne)
+        """
+        return (review.get('date') or '', str(review.get('id', '')))
+    
+## Parcourt les avis un par un, pour les réponses en flux
+    def stream_reviews(self, **filters) -> Iterator[Dict[str, Any]]:
+        """
+        Parcourt les avis un par un, sans en construire la liste complète.
+        
+        Sans filtre, les avis sont parcourus dans leur ordre de collecte :
+        lus par blocs depuis le stockage durable s'il est configuré, sinon
+        copiés au fil de l'eau depuis la mémoire (ceux ajoutés pendant le
+        parcours sont ignorés). Avec des filtres, les avis sont lus par blocs
+        depuis le stockage durable s'il est configuré.
+        
+        Args:
+            **filters: platform, date_from, date_to, sentiment, min_rating,
+                max_rating, topic (voir query_reviews)
+            
+        Yields:
+            Dict[str, Any]: Avis sérialisable en JSON
+        """
+        if self.storage is not None:
+            if filters:
+                yield from self.storage.iter_query_reviews(self.company_id, **filters)
+            else:
+                yield from self.storage.iter_reviews(self.company_id)
+        elif not filters:
+            for review in self.reviews:
+                yield review.to_dict()
+        else:
+            yield from self.query_reviews(**filters)
+
+## Exécute la chaîne résolution puis récupération pour une plateforme
+    def _collect_platform(self, platform: str, max_results: int,
+                          watermark: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """
+        Résout l'identifiant de l'entreprise puis récupère ses avis sur une plateforme.
+        
+        Args:
+            platform (str): Clé de la plateforme (google, appstore, trustpilot)
+            max_results (int): Nombre maximum d'avis à récupérer
+            watermark (Optional[Dict[str, Any]]): Marqueur de collecte; seuls
+                les avis du même jour ou plus récents sont demandés. Avec un point
+                de reprise, les avis Trustpilot déjà collectés sont sautés sans
+                compter dans max_results, ce qui prolonge la collecte sous la reprise.
+            
+        Returns:
+            List[Dict[str, Any]]: Avis formatés, liste vide si l'entreprise est introuvable
+        """
+        # Les avis du jour du marqueur sont redemandés (la date n'a pas
+        # d'heure) et écartés ensuite par l'index de déduplication
+        since = watermark['date'] if watermark else None
+        platform_id = self.resolve_platform_id(platform)
+        if not platform_id:
+            return []
+        
+        if platform == 'google':
+            return self.google_api.get_reviews(platform_id, max_results, since=since)
+        if platform == 'appstore':
+            return self.appstore_api.get_reviews(platform_id, max_results,
+                                                 countries=self.countries, since=since)
+        return self.trustpilot_api.get_reviews(platform_id, max_results, since=since,
+                                               until_id=watermark['id'] if watermark else None,
+                                               skip_ids=self._known_review_ids() if watermark and 'resume' in watermark else None)
+    
+## Résout l'identifiant de l'entreprise sur une plateforme
+    def resolve_platform_id(self, platform: str) -> Optional[str]:
+        """
+        Résout l'identifiant de l'entreprise sur une plateforme (via le cache des résolutions).
+        
+        Args:
+            platform (str): Clé de la plateforme (google, appstore, trustpilot)
+            
+        Returns:
+            Optional[str]: Identifiant, ou None si l'entreprise est introuvable
+        """
+        if platform == 'google':
+            return self.google_api.get_place_id(self.business_name, self.location)
+        if platform == 'appstore':
+            return self.appstore_api.get_app_id(self.app_name)
+        if platform == 'trustpilot':
+            return self.trustpilot_api.get_business_unit(self.domain)
+        raise ValueError(f"Plateforme inconnue: {platform}")
+    
+## Préchauffe le cache des résolutions pour toutes les plateformes
+    def warm_resolutions(self, platforms: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+        """
+        Résout en parallèle les identifiants de l'entreprise sur chaque plateforme.
+        
+        Les résultats restent dans le cache des résolutions : les collectes
+        suivantes n'ont plus d'aller-retour de recherche à faire.
+        
+        Args:
+            platforms (Optional[List[str]]): Plateformes (None: toutes; liste vide: aucune)
+            
+        Returns:
+            Dict[str, Optional[str]]: Identifiant résolu par plateforme
+        """
+        platforms = list(self.PLATFORMS) if platforms is None else platforms
+        if not platforms:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(platforms)) as executor:
+            return dict(zip(platforms, executor.map(with_current_trace(self.resolve_platform_id), platforms)))
+    
+## Avance le marqueur de collecte d'une plateforme
+    def _advance_watermark(self, platform: str, reviews: List[Dict[str, Any]], max_results: int,
+                           previous: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Met à jour le marqueur de collecte d'une plateforme après une collecte.
+        
+        Les plateformes renvoient les avis du plus récent au plus ancien. Le
+        marqueur n'avance jusqu'à l'avis le plus récent que si la collecte a
+        rejoint l'ancien marqueur (moins de max_results avis reçus, ou ancien
+        marqueur atteint) : sinon les avis situés entre l'ancien marqueur et le
+        plus ancien avis reçu n'ont pas été collectés. Le marqueur est alors
+        conservé, accompagné d'un point de reprise ('resume' : plus ancien
+        avis reçu) et de l'avis le plus récent collecté ('head'), vers lequel
+        le marqueur avancera quand la lacune sera comblée.
+        
+        Args:
+            platform (str): Clé de la plateforme
+            reviews (List[Dict[str, Any]]): Avis reçus lors de la collecte
+            max_results (int): Limite de la collecte
+            previous (Optional[Dict[str, Any]]): Marqueur utilisé pour la
+                collecte (None : première collecte ou full_refresh)
+        """
+        dated = [review for review in reviews if review.get('date')]
+        current = self.watermarks.get(platform)
+        if not dated:
+            return
+        # À date égale, le premier avis reçu est le plus récent, le dernier le plus ancien
+        newest_date = max(review['date'] for review in dated)
+        newest = next(review for review in dated if review['date'] == newest_date)
+        oldest_date = min(review['date'] for review in dated)
+        oldest = [review for review in dated if review['date'] == oldest_date][-1]
+        
+        head = {'date': newest_date, 'id': str(newest['id'])}
+        if current and 'head' in current and current['head']['date'] > head['date']:
+            head = current['head']
+        reached = (previous is None or len(reviews) < max_results
+                   or any(str(review['id']) == previous['id'] for review in reviews))
+        
+        if reached:
+            if current and current['date'] > head['date']:
+                return
+            watermark = dict(head)
+        else:
+            watermark = {'date': previous['date'], 'id': previous['id'],
+                         'resume': {'date': oldest_date, 'id': str(oldest['id'])}, 'head': head}
+        if watermark == current:
+            return
+        
+        self.watermarks[platform] = watermark
+        if self.storage is not None:
+            pending = {key: watermark[key] for key in ('resume', 'head') if key in watermark}
+            try:
+                self.storage.save_watermark(self.company_id, platform, watermark['date'], watermark['id'],
+                                            pending or None)
+            except sqlite3.Error as e:
+                print(f"Erreur lors de l'enregistrement du marqueur de collecte: {e}")
+    
+## Envoie une requête ChatCompletion limitée en débit et rejouée si nécessaire
+    def _chat_completion(self, messages: List[Dict[str, str]], **kwargs) -> Any:
+        """
+        Envoie une requête ChatCompletion limitée en débit et rejouée si nécessaire.
+        
+        Chaque appel prélève ses jetons dans le limiteur partagé. Les erreurs
+        de quota et les indisponibilités transitoires sont rejouées avec un
+        backoff exponentiel avec gigue. Chaque tentative alimente les
+        métriques LLM (durée, résultat, tokens imputés à l'entreprise).
+        
+        Args:
+            messages (List[Dict[str, str]]): Messages de la conversation
+            **kwargs: Paramètres supplémentaires de ChatCompletion
+            
+        Returns:
+            Any: Réponse brute d'OpenAI
+            
+        Raises:
+            openai.error.OpenAIError: Erreur non transitoire ou tentatives épuisées
+        """
+        estimated = sum(estimate_tokens(message['content']) for message in messages)
+        estimated += kwargs.get('max_tokens', LLM_DEFAULT_COMPLETION_TOKENS)
+        
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            self.rate_limiter.acquire(estimated)
+            started = time.perf_counter()
+            try:
+                response = openai.ChatCompletion.create(model=OPENAI_MODEL, messages=messages, **kwargs)
+            except openai.error.OpenAIError as e:
+                record_llm_call(time.perf_counter() - started, type(e).__name__)
+                if not isinstance(e, LLM_RETRYABLE_ERRORS) or attempt >= LLM_MAX_RETRIES:
+                    raise
+                retry_after = (getattr(e, 'headers', None) or {}).get('retry-after')
+                try:
+                    delay = float(retry_after)
+                except (TypeError, ValueError):
+                    delay = math.nan
+                if math.isfinite(delay):
+                    # Retry-After borné : un serveur ne peut pas bloquer le thread indéfiniment
+                    delay = min(max(delay, 0.0), LLM_MAX_BACKOFF)
+                else:
+                    delay = random.uniform(0, min(LLM_BACKOFF_FACTOR * (2 ** attempt), LLM_MAX_BACKOFF))
+                time.sleep(delay)
+                continue
+            
+            record_llm_call(time.perf_counter() - started, 'success',
+                            getattr(response, 'usage', None), self.company_id)
+            return response
+    
+## Analyse en un seul appel le sentiment et les sujets d'un texte
+    def analyze_text(self, text: str) -> Dict[str, Any]:
+        """
+        Analyse en un seul appel le sentiment et les sujets d'un texte.
+        
+        Le modèle renvoie un objet JSON unique (score, sentiment, confiance
+        et sujets), si bien que le sentiment et les sujets proviennent de la
+        même réponse. Les résultats sont mis en cache par contenu: un texte
+        déjà analysé avec le même modèle, seul ou dans un lot, n'est pas
+        renvoyé au LLM, y compris entre /api/sentiment et /api/topics.
+        
+        Args:
+            text (str): Texte à analyser
+            
+        Returns:
+            Dict[str, Any]: Sentiment, score, confiance et sujets normalisés;
+                en cas d'échec, résultat neutre marqué par 'analysis_failed'
+        """
+        cache_key = self._analysis_cache_key(text)
+        cached = self.sentiment_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = self._chat_completion([
+                {"role": "system", "content": ANALYSIS_PROMPT},
+                {"role": "user", "content": text}
+            ], temperature=0)
+            
+            result = parse_analysis(extract_json_object(response.choices[0].message.content))
+            if result is None:
+                raise ValueError("Score manquant ou invalide dans la réponse")
+            
+            self.sentiment_cache.set(cache_key, result)
+            return result
+            
+        except Exception as e:
+            print(f"Erreur lors de l'analyse du sentiment: {e}")
+            return {
+                'sentiment': 'neutral',
+                'score': 0.5,
+                'topics': [],
+                'confidence': 0.0,
+                'analysis_failed': True
+            }
+    
+## Analyse le sentiment d'un texte avec OpenAI GPT
+    def analyze_sentiment_with_openai(self, text: str) -> Dict[str, Any]:
+        """
+        Analyse le sentiment d'un texte avec OpenAI GPT.
+        
+        Args:
+            text (str): Texte à analyser
+            
+        Returns:
+            Dict[str, Any]: Résultats de l'analyse avec sentiment, score et sujets
+        """
+        return self.analyze_text(text)
+    
+## Calcule la clé de cache de l'analyse LLM d'un texte
+    @staticmethod
+    def _analysis_cache_key(text: str) -> str:
+        """
+        Calcule la clé de cache de l'analyse LLM d'un texte.
+        
+        ANALYSIS_PROMPT et BATCH_PROMPT produisent le même schéma d'analyse :
+        la clé ne dépend que du texte et du modèle, si bien qu'un texte
+        analysé dans un lot est servi par le cache à l'analyse unitaire et
+        inversement.
+        
+        Args:
+            text (str): Texte analysé
+            
+        Returns:
+            str: Clé du cache des analyses
+        """
+        return SentimentCache.make_key(text, OPENAI_MODEL, ANALYSIS_PROMPT)
+        
+## Analyse le sentiment de plusieurs textes en requêtes groupées
+    def analyze_sentiment_batch(self, texts: List[str],
+                                token_budget: int = BATCH_TOKEN_BUDGET,
+                                max_batch_size: int = BATCH_MAX_SIZE,
+                                max_workers: int = LLM_MAX_IN_FLIGHT) -> List[Dict[str, Any]]:
+        """
+        Analyse le sentiment de plusieurs textes en requêtes groupées.
+        
+        Les textes absents du cache sont regroupés en lots dont la taille
+        s'adapte au budget de tokens, chaque lot étant envoyé en une seule
+        requête avec une réponse JSON structurée. Les lots sont traités en
+        parallèle (max_workers requêtes en vol au plus). Si un lot échoue ou
+        si sa réponse est invalide, les avis concernés sont analysés un par un.
+        
+        Args:
+            texts (List[str]): Textes à analyser
+            token_budget (int): Budget de tokens estimé par requête
+            max_batch_size (int): Nombre maximum d'avis par requête
+            max_workers (int): Nombre maximum de requêtes simultanées
+            
+        Returns:
+            List[Dict[str, Any]]: Résultats d'analyse, dans l'ordre des textes
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        pending = []
+        for index, text in enumerate(texts):
+            cached = self.sentiment_cache.get(self._analysis_cache_key(text))
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append(index)
+        
+        batches = self._build_batches([(index, texts[index]) for index in pending],
+                                      token_budget, max_batch_size)
+        if batches:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as executor:
+                for analyses in executor.map(with_current_trace(self._analyze_batch_with_fallback), batches):
+                    for index, analysis in analyses:
+                        results[index] = analysis
+        
+        return results
+    
+## Analyse un lot et se replie sur l'analyse unitaire en cas d'échec
+    def _analyze_batch_with_fallback(self, batch: List[tuple]) -> List[tuple]:
+        """
+        Analyse un lot et se replie sur l'analyse unitaire en cas d'échec.
+        
+        Args:
+            batch (List[tuple]): Couples (index, texte)
+            
+        Returns:
+            List[tuple]: Couples (index, analyse) pour chaque avis du lot
+        """
+        try:
+            analyses = self._analyze_batch(batch)
+        except Exception as e:
+            print(f"Erreur lors de l'analyse groupée, repli avis par avis: {e}")
+            analyses = {}
+        
+        results = []
+        for index, text in batch:
+            analysis = analyses.get(index)
+            if analysis is None:
+                analysis = self.analyze_sentiment_with_openai(text)
+            else:
+                self.sentiment_cache.set(self._analysis_cache_key(text), analysis)
+            results.append((index, analysis))
+        return results
+    
+## Découpe les textes en lots respectant le budget de tokens
+    @staticmethod
+    def _build_batches(items: List[tuple], token_budget: int,
+                       max_batch_size: int) -> List[List[tuple]]:
+        """
+        Découpe les textes en lots respectant le budget de tokens.
+        
+        Le coût d'un avis est estimé à partir de la longueur de son texte,
+        plus une réserve pour sa part de la réponse JSON. Un avis dépassant
+        à lui seul le budget forme son propre lot.
+        
+        Args:
+            items (List[tuple]): Couples (index, texte)
+            token_budget (int): Budget de tokens estimé par requête
+            max_batch_size (int): Nombre maximum d'avis par lot
+            
+        Returns:
+            List[List[tuple]]: Lots de couples (index, texte)
+        """
+        batches = []
+        current = []
+        used = estimate_tokens(BATCH_PROMPT)
+        for index, text in items:
+            cost = estimate_tokens(text) + BATCH_OUTPUT_TOKENS_PER_REVIEW
+            if current and (used + cost > token_budget or len(current) >= max_batch_size):
+                batches.append(current)
+                current = []
+                used = estimate_tokens(BATCH_PROMPT)
+            current.append((index, text))
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+    
+## Envoie un lot d'avis au LLM et valide la réponse JSON
+    def _analyze_batch(self, batch: List[tuple]) -> Dict[int, Dict[str, Any]]:
+        """
+        Envoie un lot d'avis au LLM et valide la réponse JSON.
+        
+        Args:
+            batch (List[tuple]): Couples (index, texte)
+            
+        Returns:
+            Dict[int, Dict[str, Any]]: Analyses valides indexées par position;
+                les avis absents ou invalides sont omis
+            
+        Raises:
+            ValueError: Réponse qui n'est pas un objet JSON exploitable
+        """
+        payload = [{'id': str(index), 'text': text} for index, text in batch]
+        response = self._chat_completion(
+            [
+                {"role": "system", "content": BATCH_PROMPT},
+                {"role": "user", "content": json.dumps(payload, ensure_ascii=False)}
+            ],
+            temperature=0,
+            max_tokens=BATCH_OUTPUT_TOKENS_PER_REVIEW * len(batch) + 50
+        )
+        
+        items = extract_json_object(response.choices[0].message.content).get('results')
+        if not isinstance(items, list):
+            raise ValueError("Champ 'results' manquant dans la réponse")
+        
+        expected = {str(index): index for index, _ in batch}
+        analyses = {}
+        for item in items:
+            if not isinstance(item, dict) or str(item.get('id')) not in expected:
+                continue
+            analysis = parse_analysis(item)
+            if analysis is not None:
+                analyses[expected[str(item['id'])]] = analysis
+        return analyses
+        
+    ## Analyse tous les avis collectés 
+    @traced('analysis')
+    def analyze_reviews(self, batch: bool = False,
+                        max_workers: int = LLM_MAX_IN_FLIGHT,
+                        local_first: bool = False,
+                        confidence_threshold: float = LOCAL_CONFIDENCE_THRESHOLD,
+                        force: bool = False,
+                        keep_local: Optional[bool] = None,
+                        progress: Optional[Callable[..., None]] = None,
+                        cancelled: Optional[threading.Event] = None) -> List[Dict[str, Any]]:
+        """
+        Analyse les avis collectés qui ne l'ont pas encore été.
+        
+        Chaque avis analysé enregistre la version du moteur qui l'a produit
+        ('analysis_version': modèle et empreinte du prompt, ou moteur local).
+        Les avis dont la version est à jour sont réutilisés tels quels; seuls
+        les avis nouveaux, en échec ou analysés par une version périmée sont
+        traités. Le bilan est disponible dans last_analysis_stats.
+        
+        Les appels LLM sont répartis sur un pool de threads borné et passent
+        par le limiteur de débit partagé; les résultats sont réécrits dans
+        les avis dans leur ordre d'origine.
+        
+        En mode local_first, les avis sont d'abord notés par le moteur local
+        (lexique et note en étoiles); seuls ceux dont la confiance est
+        inférieure à confidence_threshold sont envoyés au LLM. Les sujets des
+        avis conservés localement sont extraits par le moteur TF-IDF local.
+        
+        Les analyses du LLM sont toujours à jour. Celles du moteur local ne le
+        sont que si keep_local est vrai (par défaut : en mode local_first);
+        sinon les avis notés localement sont réanalysés par le LLM.
+        
+        Les avis envoyés au LLM sont traités par tranches de ANALYSIS_CHUNK_SIZE :
+        la progression est signalée et l'annulation vérifiée entre deux
+        tranches. Les analyses déjà obtenues sont conservées; les avis restants
+        seront traités par la prochaine analyse incrémentale.
+        
+        Args:
+            batch (bool): Regroupe plusieurs avis par requête LLM
+                (voir analyze_sentiment_batch)
+            max_workers (int): Nombre maximum de requêtes LLM simultanées
+            local_first (bool): Active le premier niveau local
+            confidence_threshold (float): Confiance minimale pour conserver
+                le résultat local
+            force (bool): Réanalyse tous les avis, même à jour
+            keep_local (Optional[bool]): Considère les analyses locales comme
+                à jour (None: valeur de local_first)
+            progress (Optional[Callable[..., None]]): Appelé avec total= (avis à
+                analyser) puis done=<n>, analyzed=<n> au fil de l'analyse
+            cancelled (Optional[threading.Event]): Signal d'annulation
+        
+        Returns:
+            List[Dict[str, Any]]: Liste des avis avec leur analyse
+        """
+        progress = progress or (lambda **counters: None)
+        fresh_versions = {
+            analysis_version(OPENAI_MODEL, ANALYSIS_PROMPT),
+            analysis_version(OPENAI_MODEL, BATCH_PROMPT)
+        }
+        if keep_local is None:
+            keep_local = local_first
+        if keep_local:
+            fresh_versions.add(analysis_version(LocalSentimentScorer.MODEL_NAME))
+        
+        self.load_reviews()
+        pending = [
+            review for review in self.reviews
+            if force or review.get('analysis_version') not in fresh_versions
+        ]
+        texts = [review['text'] for review in pending]
+        analyses: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        escalated = list(range(len(texts)))
+        progress(total=len(pending))
+        
+        if local_first:
+            local_analyses = self.local_scorer.score_batch(
+                texts, [review.get('rating') for review in pending]
+            )
+            escalated = []
+            local_version = analysis_version(LocalSentimentScorer.MODEL_NAME)
+            for index, analysis in enumerate(local_analyses):
+                if analysis['confidence'] >= confidence_threshold:
+                    analysis['analysis_source'] = 'local'
+                    analysis['analysis_version'] = local_version
+                    analyses[index] = analysis
+                else:
+                    escalated.append(index)
+            
+            # Sujets des avis notés localement, pondérés sur tout le corpus
+            local_indexes = [index for index, analysis in enumerate(analyses) if analysis is not None]
+            if local_indexes:
+                topic_lists = self.topic_extractor.extract_batch(
+                    [texts[index] for index in local_indexes],
+                    corpus=[review.get('text', '') for review in self.reviews]
+                )
+                for index, topics in zip(local_indexes, topic_lists):
+                    analyses[index]['topics'] = topics
+            local_count = len(pending) - len(escalated)
+            progress(done=local_count, analyzed=local_count)
+        
+        llm_version = analysis_version(OPENAI_MODEL, BATCH_PROMPT if batch else ANALYSIS_PROMPT)
+        llm_texts = [texts[index] for index in escalated]
+        chunk_size = max(ANALYSIS_CHUNK_SIZE, BATCH_MAX_SIZE * max_workers if batch else max_workers)
+        llm_analyses = []
+        for start in range(0, len(llm_texts), chunk_size):
+            if cancelled is not None and cancelled.is_set():
+                break
+            chunk = self._analyze_with_llm(llm_texts[start:start + chunk_size], batch, max_workers)
+            llm_analyses.extend(chunk)
+            progress(done=len(chunk), analyzed=len(chunk))
+        failed = 0
+        for index, analysis in zip(escalated, llm_analyses):
+            analysis['analysis_source'] = 'llm'
+            if analysis.pop('analysis_failed', False):
+                # Un échec n'est pas mémorisé comme analyse à jour
+                analysis['analysis_version'] = None
+                failed += 1
+            else:
+                analysis['analysis_version'] = llm_version
+            analyses[index] = analysis
+        
+        # Sur annulation, les avis non traités restent en attente
+        analyzed = [(review, sentiment_analysis)
+                    for review, sentiment_analysis in zip(pending, analyses)
+                    if sentiment_analysis is not None]
+        for review, sentiment_analysis in analyzed:
+            self.trends.count_analysis(review, -1)
+            self.kpis.update_analysis(review, sentiment_analysis)
+            self.trends.count_analysis(review, 1)
+        self._persist([review for review, _ in analyzed])
+        
+        sources = Counter(sentiment_analysis['analysis_source'] for _, sentiment_analysis in analyzed
+                          if sentiment_analysis.get('analysis_version') is not None)
+        for source, count in sources.items():
+            REVIEWS_ANALYZED.inc(count, company=self.company_id, source=source)
+        if failed:
+            REVIEWS_ANALYSIS_FAILURES.inc(failed, company=self.company_id)
+        
+        self.last_analysis_stats = {
+            'analyzed': len(analyzed),
+            'reused': len(self.reviews) - len(pending),
+            'escalated_to_llm': len(escalated),
+            'failed': failed,
+            'skipped': len(pending) - len(analyzed)
+        }
+        return self.reviews
+    
+    ## Analyse une liste de textes avec le LLM
+    @traced('analysis.llm')
+    def _analyze_with_llm(self, texts: List[str], batch: bool, max_workers: int) -> List[Dict[str, Any]]:
         """
-        Recherche l'ID d'une application sur l'App Store.
+        Analyse une liste de textes avec le LLM.
         
         Args:
-            app_name (str): Nom de l'application
+            texts (List[str]): Textes à analyser
+            batch (bool): Regroupe plusieurs textes par requête
+            max_workers (int): Nombre maximum de requêtes simultanées
             
         Returns:
-            Optional[str]: ID de l'application ou None si non trouvée
+            List[Dict[str, Any]]: Analyses dans l'ordre des textes
         """
-        endpoint = f"{self.base_url}/search"
-        params = {
-            'term': app_name,
-            'entity': 'software',
-            'country': 'fr'
-        }
+        if not texts:
+            return []
+        if batch:
+            return self.analyze_sentiment_batch(texts, max_workers=max_workers)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            return list(executor.map(with_current_trace(self.analyze_text), texts))
+    
+    ## Calcule les KPIs à partir des avis analysés
+    @traced('kpi')
+    def calculate_kpis(self) -> Dict[str, Any]:
+        """
+        Calcule les KPIs à partir des avis analysés.
         
-        try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
+        Les KPIs sont lus depuis l'agrégateur incrémental, en temps constant.
+        Avec un stockage durable, il est initialisé à la première lecture par
+        les agrégats du backend, sans charger les avis. Si la liste des avis
+        en mémoire a été modifiée sans passer par add_reviews, l'agrégateur
+        est d'abord reconstruit.
+        
+        Returns:
+            Dict[str, Any]: KPIs calculés (moyennes, distributions)
+        """
+        self._seed_kpis()
+        if self._loaded and self.kpis.review_count != len(self.reviews):
+            self.kpis.rebuild(self.reviews)
+            self.trends.rebuild(self.reviews)
+        return self.kpis.snapshot()
+    
+## Retourne une série temporelle des avis
+    def trend_series(self, granularity: str = 'day', date_from: Optional[date] = None,
+                     date_to: Optional[date] = None, platform: Optional[str] = None,
+                     max_buckets: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Retourne une série temporelle, compartiments vides compris.
+        
+        Avec un stockage durable, les compartiments sont lus dans le backend,
+        qui les tient à jour à chaque écriture : aucun avis n'est chargé et
+        le coût ne dépend que du nombre de périodes. Sinon, ils sont lus dans
+        le TrendAggregator en mémoire.
+        
+        Args:
+            granularity (str): 'day', 'week' ou 'month'
+            date_from (Optional[date]): Début de la période (défaut: plus ancien avis)
+            date_to (Optional[date]): Fin de la période (défaut: plus récent avis)
+            platform (Optional[str]): Plateforme (défaut: toutes)
+            max_buckets (Optional[int]): Nombre maximum de compartiments
             
-            if data['resultCount'] > 0:
-                return str(data['results'][0]['trackId'])
-            return None
+        Returns:
+            List[Dict[str, Any]]: Un élément par période (voir TrendAggregator.series)
             
-        except requests.exceptions.RequestException as e:
-            print(f"Erreur lors de la recherche de l'application: {e}")
-            return None
-
-  ## Récupère et formate les avis d'une application
-    def get_reviews(self, app_id: str, max_results: int = 100) -> List[Dict[str, Any]]:
+        Raises:
+            ValueError: Granularité inconnue ou période trop longue
         """
-        Récupère les avis pour une application donnée.
+        if self.storage is None:
+            return self.trends.series(granularity, date_from, date_to, platform=platform,
+                                      max_buckets=max_buckets)
+        
+        if granularity not in TrendAggregator.GRANULARITIES:
+            raise ValueError(f"Granularité inconnue: {granularity}")
+        if date_from is None or date_to is None:
+            first, last = self.storage.trend_bounds(self.company_id)
+            date_from, date_to = date_from or first, date_to or last
+        periods = TrendAggregator.periods(granularity, date_from, date_to, max_buckets)
+        if not periods:
+            return []
+        buckets = self.storage.trend_buckets(self.company_id, granularity, periods[0], date_to, platform)
+        return [TrendAggregator.summarize_bucket(period, buckets.get(period)) for period in periods]
+    
+## Extrait les principaux sujets d'un texte avec OpenAI
+    def extract_topics(self, text: str, engine: Optional[str] = None) -> List[str]:
+        """
+        Extrait les principaux sujets d'un texte avec OpenAI ou le moteur local.
+        
+        Avec le LLM, l'appel (et le cache) de analyze_text est partagé:
+        demander le sentiment puis les sujets d'un même texte ne coûte qu'un
+        aller-retour LLM.
         
         Args:
-            app_id (str): ID de l'application
-            max_results (int): Nombre maximum d'avis à récupérer
+            text (str): Texte à analyser
+            engine (Optional[str]): 'llm' ou 'local' (défaut: TOPIC_ENGINE)
             
         Returns:
-            List[Dict[str, Any]]: Liste des avis formatés
+            List[str]: Liste des sujets identifiés
+        """
+        if (engine or TOPIC_ENGINE) == 'local':
+            return self.topic_extractor.extract_batch([text])[0]
+        return self.analyze_text(text)['topics']
+    
+## Extrait localement les sujets de tous les avis en une passe
+    @traced('topics')
+    def extract_review_topics(self, overwrite: bool = False,
+                              progress: Optional[Callable[..., None]] = None,
+                              cancelled: Optional[threading.Event] = None) -> Dict[str, int]:
         """
-        endpoint = f"{self.base_url}/rss/customerreviews/id={app_id}/sortBy=mostRecent/json"
+        Extrait localement les sujets de tous les avis de l'entreprise en une passe.
         
-        try:
-            response = requests.get(endpoint)
-            response.raise_for_status()
-            data = response.json()
-            
-            reviews = data.get('feed', {}).get('entry', [])
-            if not isinstance(reviews, list):
-                reviews = [reviews]
-            
-            return [{
-                'id': f"appstore_{i}",
-                'platform': 'Apple App Store',
-                'author': review['author']['name']['label'],
-                'rating': int(review['im:rating']['label']),
-                'text': review['content']['label'],
-                'date': review['updated']['label'][:10],
-                'title': review['title']['label']
-            } for i, review in enumerate(reviews[:max_results])]
+        Le moteur TF-IDF est pondéré sur l'ensemble des avis; aucun appel
+        LLM n'est fait. Les KPIs et séries temporelles sont mis à jour et
+        les avis modifiés sont enregistrés.
+        
+        Args:
+            overwrite (bool): Remplace aussi les sujets existants (par
+                exemple ceux du LLM); sinon seuls les avis sans sujet sont traités
+            progress (Optional[Callable[..., None]]): Voir analyze_reviews
+            cancelled (Optional[threading.Event]): Signal d'annulation
             
-        except requests.exceptions.RequestException as e:
-            print(f"Erreur lors de la récupération des avis: {e}")
-            return []
+        Returns:
+            Dict[str, int]: Nombre d'avis traités et nombre d'avis ignorés
+        """
+        progress = progress or (lambda **counters: None)
+        self.load_reviews()
+        reviews = list(self.reviews)
+        targets = [review for review in reviews if overwrite or not review.get('topics')]
+        progress(total=len(targets))
+        if not targets or (cancelled is not None and cancelled.is_set()):
+            return {'updated': 0, 'skipped': len(reviews)}
+        
+        topic_lists = self.topic_extractor.extract_batch(
+            [review.get('text', '') for review in targets],
+            corpus=[review.get('text', '') for review in reviews]
+        )
+        for review, topics in zip(targets, topic_lists):
+            self.trends.count_analysis(review, -1)
+            self.kpis.update_analysis(review, {'topics': topics})
+            self.trends.count_analysis(review, 1)
+        self._persist(targets)
+        progress(done=len(targets), analyzed=len(targets))
+        return {'updated': len(targets), 'skipped': len(reviews) - len(targets)}
 
-## Classe pour la gestion des avis Trustpilot
-## Gère l'interaction avec l'API Trustpilot et le formatage des données
-class TrustpilotAPI:
+## Registre multi-entreprises des scrapers
+## Remplace l'instance globale unique par une instance par entreprise
+class ScraperRegistry:
     """
-    Client pour l'API Trustpilot.
+    Registre des instances ReviewScraper, une par entreprise.
     
-    Gère l'interaction avec l'API Trustpilot pour:
-    - Identifier les entreprises
-    - Collecter leurs avis
-    - Formater les données pour l'analyse
+    Chaque entreprise dispose de son propre verrou, ce qui permet de traiter
+    plusieurs entreprises en parallèle tout en sérialisant les opérations
+    sur une même entreprise. Un verrou n'existe que tant qu'un thread le
+    détient ou l'attend : il est ensuite retiré du registre, et une
+    entreprise dont le verrou existe n'est jamais évincée. Les opérations
+    qui modifient une entreprise passent par acquire, qui lit l'instance
+    sous le verrou. Les entreprises inactives sont évincées selon
+    une politique LRU lorsque le nombre d'instances ou la mémoire occupée
+    par leurs avis dépasse le budget; elles sont recréées à la demande à
+    partir de leur configuration et du stockage durable.
     
     Attributes:
-        base_url (str): URL de base de l'API
-        business_units_url (str): URL pour les endpoints business
-        reviews_url (str): URL pour les endpoints des avis
+        max_tenants (int): Nombre maximum d'instances en mémoire
+        memory_budget (int): Mémoire maximale occupée par les avis (octets)
+        storage (Optional[ReviewStorageBackend]): Stockage durable partagé
     """
-   ## Initialise le client API Trustpilot avec les URLs de base  
-    def __init__(self):
-        """Initialise le client API Trustpilot."""
-        self.base_url = "https://api.trustpilot.com/v1"
-        self.business_units_url = f"{self.base_url}/business-units"
-        self.reviews_url = f"{self.base_url}/reviews"
-
-    ## Recherche l'ID d'une entreprise sur Trustpilot
-    def get_business_unit(self, domain: str) -> Optional[str]:
+    
+    ## Initialise un registre vide
+    def __init__(self, max_tenants: int = REGISTRY_MAX_TENANTS,
+                 memory_budget: int = REGISTRY_MEMORY_BUDGET,
+                 storage: Optional[ReviewStorageBackend] = None):
         """
-        Recherche l'ID d'une entreprise sur Trustpilot.
+        Initialise un registre vide.
         
         Args:
-            domain (str): Nom de domaine de l'entreprise
+            max_tenants (int): Nombre maximum d'instances en mémoire
+            memory_budget (int): Mémoire maximale occupée par les avis (octets)
+            storage (Optional[ReviewStorageBackend]): Stockage durable
+                (défaut: backend partagé)
+        """
+        self.max_tenants = max_tenants
+        self.memory_budget = memory_budget
+        self._storage = storage
+        self._scrapers = OrderedDict()
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        # Verrou de chaque entreprise en cours d'utilisation et nombre de
+        # threads qui le détiennent ou l'attendent
+        self._locks: Dict[str, list] = {}
+        self._lock = threading.Lock()
+    
+    ## Retourne le stockage durable utilisé par le registre
+    @property
+    def storage(self) -> Optional[ReviewStorageBackend]:
+        """Stockage durable (backend partagé par défaut, résolu à la première utilisation)."""
+        return self._storage or get_review_storage()
+    
+    ## Calcule l'identifiant d'une entreprise à partir de son nom
+    @staticmethod
+    def make_company_id(name: str) -> str:
+        """
+        Calcule l'identifiant d'une entreprise à partir de son nom.
+        
+        Args:
+            name (str): Nom de l'entreprise
             
         Returns:
-            Optional[str]: ID de l'entreprise ou None si non trouvée
+            str: Identifiant en minuscules, sans accents ni espaces
         """
-        endpoint = f"{self.business_units_url}/find"
-        params = {'domain': domain}
+        ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+        return re.sub(r'[^a-z0-9]+', '-', ascii_name.lower()).strip('-') or 'company'
+    
+    ## Enregistre (ou remplace) une entreprise
+    def register(self, company_id: str, config: Dict[str, Any]) -> ReviewScraper:
+        """
+        Enregistre (ou remplace) une entreprise.
         
-        try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data['id']
+        Args:
+            company_id (str): Identifiant de l'entreprise
+            config (Dict[str, Any]): Configuration (name, location, app_name, domain...)
             
-        except requests.exceptions.RequestException as e:
-            print(f"Erreur lors de la recherche de l'entreprise: {e}")
-            return None
-        
-    ## Récupère et formate les avis d'une entreprise
-    def get_reviews(self, business_unit_id: str = None, max_results: int = 100) -> List[Dict[str, Any]]:
+        Returns:
+            ReviewScraper: Instance de l'entreprise
         """
-        Récupère les avis pour une entreprise donnée.
+        with self.locked(company_id):
+            scraper = self._create(company_id, config)
+            with self._lock:
+                self._configs[company_id] = dict(config)
+                self._scrapers[company_id] = scraper
+                self._scrapers.move_to_end(company_id)
+            if self.storage is not None:
+                self.storage.save_company(company_id, config)
+        self._evict()
+        return scraper
+    
+    ## Retourne l'instance d'une entreprise, recréée si nécessaire
+    def get(self, company_id: str) -> Optional[ReviewScraper]:
+        """
+        Retourne l'instance d'une entreprise, recréée si nécessaire.
         
         Args:
-            business_unit_id (str): ID de l'entreprise
-            max_results (int): Nombre maximum d'avis à récupérer
+            company_id (str): Identifiant de l'entreprise
             
         Returns:
-            List[Dict[str, Any]]: Liste des avis formatés
+            Optional[ReviewScraper]: Instance, ou None si l'entreprise est inconnue
         """
-        if not business_unit_id:
-            return []
+        with self._lock:
+            scraper = self._scrapers.get(company_id)
+            if scraper is not None:
+                self._scrapers.move_to_end(company_id)
+                return scraper
+            config = self._configs.get(company_id)
         
-        endpoint = f"{self.reviews_url}/business-unit/{business_unit_id}"
-        params = {
-            'language': 'fr',
-            'page': 1,
-            'perPage': max_results
-        }
+        if config is None and self.storage is not None:
+            config = self.storage.get_company(company_id)
+        if config is None:
+            return None
+        
+        with self.locked(company_id):
+            with self._lock:
+                scraper = self._scrapers.get(company_id)
+            if scraper is None:
+                scraper = self._create(company_id, config)
+                with self._lock:
+                    self._configs[company_id] = dict(config)
+                    self._scrapers[company_id] = scraper
+        self._evict()
+        return scraper
+    
+    ## Prend le verrou d'une entreprise
+    @contextmanager
+    def locked(self, company_id: str) -> Iterator[None]:
+        """
+        Prend le verrou réentrant d'une entreprise pour la durée du bloc.
+        
+        Le verrou est créé à la première demande et retiré du registre
+        lorsque plus aucun thread ne le détient ni ne l'attend.
         
+        Args:
+            company_id (str): Identifiant de l'entreprise
+        """
+        with self._lock:
+            entry = self._locks.get(company_id)
+            if entry is None:
+                entry = self._locks[company_id] = [threading.RLock(), 0]
+            entry[1] += 1
         try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[company_id]
+    
+    ## Prend le verrou d'une entreprise et retourne son instance
+    @contextmanager
+    def acquire(self, company_id: str) -> Iterator[Optional[ReviewScraper]]:
+        """
+        Prend le verrou d'une entreprise et fournit son instance, lue sous le
+        verrou : elle ne peut pas être évincée ni recréée pendant le bloc.
+        
+        Args:
+            company_id (str): Identifiant de l'entreprise
             
-            return [{
-                'id': f"trustpilot_{i}",
-                'platform': 'Trustpilot',
-                'author': review['consumer']['displayName'],
-                'rating': review['stars'],
-                'text': review['text'],
-                'date': review['createdAt'][:10],
-                'title': review.get('title', '')
-            } for i, review in enumerate(data['reviews'][:max_results])]
+        Yields:
+            Optional[ReviewScraper]: Instance, ou None si l'entreprise est inconnue
+        """
+        with self.locked(company_id):
+            yield self.get(company_id)
+        # Les évictions reportées pendant le bloc peuvent maintenant avoir lieu
+        self._evict()
+    
+    ## Liste les entreprises actuellement en mémoire
+    def loaded_companies(self) -> List[str]:
+        """
+        Liste les entreprises actuellement en mémoire, de la moins à la plus récemment utilisée.
+        
+        Returns:
+            List[str]: Identifiants des entreprises
+        """
+        with self._lock:
+            return list(self._scrapers)
+    
+    ## Crée l'instance d'une entreprise
+    def _create(self, company_id: str, config: Dict[str, Any]) -> ReviewScraper:
+        """
+        Crée l'instance d'une entreprise (ses avis stockés sont rechargés
+        à la première utilisation, voir ReviewScraper.load_reviews).
+        
+        Args:
+            company_id (str): Identifiant de l'entreprise
+            config (Dict[str, Any]): Configuration de l'entreprise
             
-        except requests.exceptions.RequestException as e:
-            print(f"Erreur lors de la récupération des avis: {e}")
-            return []
+        Returns:
+            ReviewScraper: Nouvelle instance
+        """
+        return ReviewScraper(
+            business_name=config['name'],
+            language=config.get('language', 'fr'),
+            storage=self.storage,
+            company_id=company_id,
+            location=config.get('location', 'France'),
+            app_name=config.get('app_name'),
+            domain=config.get('domain'),
+            countries=config.get('countries')
+        )
+    
+    ## Évince les entreprises inactives au-delà du budget
+    def _evict(self) -> None:
+        """
+        Évince les entreprises inactives les moins récemment utilisées au-delà du budget.
+        
+        Une entreprise en cours de traitement (verrou pris ou attendu) n'est
+        jamais évincée. Sans stockage durable, rien n'est évincé puisque les avis
+        ne pourraient pas être rechargés.
+        """
+        if self.storage is None:
+            return
+        
+        with self._lock:
+            candidates = list(self._scrapers)
+            usage = sum(scraper.reviews.memory_usage() for scraper in self._scrapers.values())
+        
+        for company_id in candidates:
+            with self._lock:
+                over_budget = len(self._scrapers) > self.max_tenants or usage > self.memory_budget
+                if not over_budget or len(self._scrapers) <= 1:
+                    return
+                if company_id in self._locks:
+                    continue
+                scraper = self._scrapers.pop(company_id, None)
+            if scraper is not None:
+                usage -= scraper.reviews.memory_usage()
 
-## Classe principale pour l'orchestration de la collecte et l'analyse des avis
-## Coordonne toutes les opérations de collecte, analyse et génération de rapports
-class ReviewScraper:
+# Registre des entreprises enregistrées (voir /api/companies)
+scraper_registry = ScraperRegistry()
+
+## Tâche de fond (collecte ou analyse) et son état d'avancement
+class Job:
     """
-    Orchestrateur principal pour la collecte et l'analyse des avis.
+    Tâche de fond exécutée par le JobManager.
     
-    Cette classe coordonne:
-    - La collecte des avis depuis différentes plateformes
-    - L'analyse de sentiment avec OpenAI
-    - L'extraction des sujets
-    - Le calcul des KPIs
+    La fonction de la tâche reçoit deux paramètres : report, à appeler pour
+    signaler la progression (total=, done= et compteurs libres comme
+    fetched= ou analyzed=), et cancelled, un threading.Event à consulter
+    régulièrement pour interrompre le travail.
     
     Attributes:
-        business_name (str): Nom de l'entreprise
-        language (str): Langue des avis à collecter
-        google_api (GoogleReviewsAPI): Client API Google
-        appstore_api (AppStoreAPI): Client API App Store
-        trustpilot_api (TrustpilotAPI): Client API Trustpilot
-        reviews (List): Liste des avis collectés
+        id (str): Identifiant de la tâche
+        kind (str): Type de tâche ('collect', 'analyze')
+        company_id (str): Entreprise concernée
+        params (Dict[str, Any]): Paramètres de la tâche
+        status (str): pending, running, succeeded, failed ou cancelled
+        total (int): Nombre d'unités de travail prévues (0 si inconnu)
+        done (int): Nombre d'unités de travail terminées
+        counters (Dict[str, int]): Compteurs de progression (fetched, analyzed...)
+        result (Optional[Dict[str, Any]]): Résultat de la tâche terminée
+        error (Optional[str]): Message d'erreur si la tâche a échoué
+        cancelled (threading.Event): Signal d'annulation
+        profile_requested (bool): Capture cProfile demandée par la requête de soumission
+        timings (Optional[Dict[str, Any]]): Durées par étape (profilage actif)
     """
-
-## Initialise le scraper avec les paramètres de base et les clients API
-    def __init__(self, business_name: str, language: str = 'fr'):
+    
+    FINISHED = ('succeeded', 'failed', 'cancelled')
+    
+    ## Initialise une tâche en attente
+    def __init__(self, kind: str, company_id: str, params: Dict[str, Any],
+                 func: Callable[..., Dict[str, Any]]):
         """
-        Initialise le scraper avec les paramètres de base.
+        Initialise une tâche en attente.
         
         Args:
-            business_name (str): Nom de l'entreprise
-            language (str): Langue des avis (défaut: 'fr')
+            kind (str): Type de tâche
+            company_id (str): Entreprise concernée
+            params (Dict[str, Any]): Paramètres de la tâche
+            func (Callable[..., Dict[str, Any]]): Travail à exécuter,
+                appelé avec report et cancelled
         """
-        self.business_name = business_name
-        self.language = language
-        self.google_api = GoogleReviewsAPI()
-        self.appstore_api = AppStoreAPI()
-        self.trustpilot_api = TrustpilotAPI()
-        self.reviews = []
-
-## Collecte les avis depuis toutes les plateformes configurées
-    def collect_reviews(self, max_results: int = 100) -> None:
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.company_id = company_id
+        self.params = params
+        self.func = func
+        self.key = (kind, company_id, json.dumps(params, sort_keys=True, default=str))
+        self.status = 'pending'
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.total = 0
+        self.done = 0
+        self.counters: Dict[str, int] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.cancelled = threading.Event()
+        self.profile_requested = False
+        self.timings: Optional[Dict[str, Any]] = None
+        self.future = None
+        self._lock = threading.Lock()
+    
+    ## Enregistre la progression de la tâche
+    def report(self, total: Optional[int] = None, done: int = 0, **counters: int) -> None:
         """
-        Collecte les avis depuis toutes les plateformes configurées.
+        Enregistre la progression de la tâche.
         
         Args:
-            max_results (int): Nombre maximum d'avis par plateforme
+            total (Optional[int]): Unités de travail supplémentaires prévues
+            done (int): Unités de travail terminées depuis le dernier appel
+            **counters: Compteurs à incrémenter (fetched, analyzed...)
         """
-        # Collecte depuis Google Reviews
-        place_id = self.google_api.get_place_id(self.business_name, "France")
-        if place_id:
-            google_reviews = self.google_api.get_reviews(place_id, max_results)
-            self.reviews.extend(google_reviews)
-        
-        # Collecte depuis App Store
-        app_id = self.appstore_api.get_app_id(self.business_name)
-        if app_id:
-            appstore_reviews = self.appstore_api.get_reviews(app_id, max_results)
-            self.reviews.extend(appstore_reviews)
+        with self._lock:
+            if total is not None:
+                self.total += total
+            self.done += done
+            for name, value in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+    
+    ## Estime le temps restant
+    def eta(self) -> Optional[float]:
+        """
+        Estime le temps restant à partir du rythme observé.
         
-        # Collecte depuis Trustpilot
-        business_unit_id = self.trustpilot_api.get_business_unit(f"{self.business_name}.com")
-        if business_unit_id:
-            trustpilot_reviews = self.trustpilot_api.get_reviews(business_unit_id, max_results)
-            self.reviews.extend(trustpilot_reviews)
+        Returns:
+            Optional[float]: Secondes restantes estimées, ou None si inconnu
+        """
+        if self.status != 'running' or not self.done or not self.total:
+            return None
+        elapsed = time.time() - self.started_at
+        return round(elapsed * max(0, self.total - self.done) / self.done, 1)
     
-## Analyse le sentiment d'un texte avec OpenAI GPT
-    def analyze_sentiment_with_openai(self, text: str) -> Dict[str, Any]:
+    ## Retourne l'état de la tâche sous forme sérialisable
+    def to_dict(self) -> Dict[str, Any]:
         """
-        Analyse le sentiment d'un texte avec OpenAI GPT.
+        Retourne l'état de la tâche sous forme sérialisable.
         
-        Args:
-            text (str): Texte à analyser
-            
         Returns:
-            Dict[str, Any]: Résultats de l'analyse avec sentiment, score et sujets
+            Dict[str, Any]: Statut, progression, ETA, résultat ou erreur et
+                durées par étape (profilage actif)
         """
-        try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "Analysez le sentiment de l'avis suivant et attribuez-lui une note entre 0 et 1, 0 étant très négatif et 1 très positif. Identifiez également les principaux sujets mentionnés."},
-                    {"role": "user", "content": text}
-                ]
-            )
-            
-            analysis = response.choices[0].message.content
-            
-            # Extraction du score et du sentiment
-            score_match = re.search(r'(\d+(\.\d+)?)', analysis)
-            score = float(score_match.group(1)) if score_match else 0.5
-            
-            sentiment = 'positive' if score >= 0.7 else 'negative' if score <= 0.3 else 'neutral'
-            
-            # Extraction des sujets
-            topics_match = re.findall(r'Topics?:?\s*([^\.]+)', analysis)
-            topics = [topic.strip() for topic in topics_match[0].split(',')] if topics_match else []
-            
-            return {
-                'sentiment': sentiment,
-                'score': score,
-                'topics': topics,
-                'confidence': 0.8
-            }
-            
-        except Exception as e:
-            print(f"Erreur lors de l'analyse du sentiment: {e}")
+        with self._lock:
             return {
-                'sentiment': 'neutral',
-                'score': 0.5,
-                'topics': [],
-                'confidence': 0.0
+                'job_id': self.id,
+                'kind': self.kind,
+                'company_id': self.company_id,
+                'params': self.params,
+                'status': self.status,
+                'created_at': datetime.fromtimestamp(self.created_at).isoformat(),
+                'started_at': datetime.fromtimestamp(self.started_at).isoformat() if self.started_at else None,
+                'finished_at': datetime.fromtimestamp(self.finished_at).isoformat() if self.finished_at else None,
+                'progress': {
+                    'total': self.total,
+                    'done': self.done,
+                    'percent': round(100.0 * self.done / self.total, 1) if self.total else None,
+                    **self.counters
+                },
+                'eta_seconds': self.eta(),
+                'result': self.result,
+                'error': self.error,
+                'timings': self.timings
             }
+
+## Exécution des tâches de fond sur un pool de threads
+class JobManager:
+    """
+    File de tâches de fond exécutées par un pool de threads.
+    
+    Une soumission identique (même type, entreprise et paramètres) à une
+    tâche encore en attente retourne cette tâche au lieu d'en créer une
+    nouvelle. Les tâches terminées sont conservées JOB_RETENTION secondes.
+    
+    Attributes:
+        max_workers (int): Nombre de tâches exécutées simultanément
+        retention (float): Durée de conservation des tâches terminées (secondes)
+    """
+    
+    ## Initialise le gestionnaire de tâches
+    def __init__(self, max_workers: int = JOB_MAX_WORKERS, retention: float = JOB_RETENTION):
+        """
+        Initialise le gestionnaire de tâches.
         
-    ## Analyse tous les avis collectés 
-    def analyze_reviews(self) -> List[Dict[str, Any]]:
+        Args:
+            max_workers (int): Nombre de tâches exécutées simultanément
+            retention (float): Durée de conservation des tâches terminées (secondes)
         """
-        Analyse tous les avis collectés.
+        self.max_workers = max_workers
+        self.retention = retention
+        self._jobs: Dict[str, Job] = {}
+        self._pending: Dict[tuple, Job] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+    
+    ## Soumet une tâche
+    def submit(self, kind: str, company_id: str, params: Dict[str, Any],
+               func: Callable[..., Dict[str, Any]]) -> Job:
+        """
+        Soumet une tâche, ou retourne la tâche identique déjà en attente.
         
+        Args:
+            kind (str): Type de tâche
+            company_id (str): Entreprise concernée
+            params (Dict[str, Any]): Paramètres de la tâche (clé de déduplication)
+            func (Callable[..., Dict[str, Any]]): Travail à exécuter,
+                appelé avec report et cancelled
+            
         Returns:
-            List[Dict[str, Any]]: Liste des avis avec leur analyse
+            Job: Tâche créée ou existante
         """
-        for review in self.reviews:
-            sentiment_analysis = self.analyze_sentiment_with_openai(review['text'])
-            review.update(sentiment_analysis)
-        return self.reviews
+        job = Job(kind, company_id, params, func)
+        job.profile_requested = _profile_requested.get()
+        with self._lock:
+            self._prune()
+            existing = self._pending.get(job.key)
+            if existing is not None:
+                return existing
+            
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='job')
+            self._jobs[job.id] = job
+            self._pending[job.key] = job
+            job.future = self._executor.submit(self._run, job)
+        return job
     
-    ## Calcule les KPIs à partir des avis analysés
-    def calculate_kpis(self) -> Dict[str, Any]:
+    ## Retourne une tâche
+    def get(self, job_id: str) -> Optional[Job]:
         """
-        Calcule les KPIs à partir des avis analysés.
+        Retourne une tâche.
         
+        Args:
+            job_id (str): Identifiant de la tâche
+            
         Returns:
-            Dict[str, Any]: KPIs calculés (moyennes, distributions)
+            Optional[Job]: Tâche, ou None si inconnue ou expirée
         """
-        if not self.reviews:
-            return {
-                'average_rating': 0,
-                'sentiment_score': 0,
-                'review_count': 0,
-                'platform_distribution': {},
-                'sentiment_distribution': {},
-                'top_topics': []
-            }
-        
-        # Calcul des KPIs
-        ratings = [review['rating'] for review in self.reviews]
-        sentiments = [review['sentiment'] for review in self.reviews if 'sentiment' in review]
-        platforms = [review['platform'] for review in self.reviews]
-        topics = [topic for review in self.reviews if 'topics' in review for topic in review['topics']]
-        
-        # Distribution des plateformes
-        platform_counts = Counter(platforms)
-        platform_distribution = {
-            platform: count / len(self.reviews) * 100 
-            for platform, count in platform_counts.items()
-        }
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    ## Liste les tâches, éventuellement d'une seule entreprise
+    def list_jobs(self, company_id: Optional[str] = None) -> List[Job]:
+        """
+        Liste les tâches, de la plus récente à la plus ancienne.
         
-        # Distribution des sentiments
-        sentiment_counts = Counter(sentiments)
-        sentiment_distribution = {
-            sentiment: count / len(sentiments) * 100 
-            for sentiment, count in sentiment_counts.items()
-        }
+        Args:
+            company_id (Optional[str]): Restreint aux tâches de cette entreprise
+            
+        Returns:
+            List[Job]: Tâches correspondantes
+        """
+        with self._lock:
+            jobs = [job for job in self._jobs.values()
+                    if company_id is None or job.company_id == company_id]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+    
+    ## Annule une tâche
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Annule une tâche.
         
-        # Top sujets
-        topic_counts = Counter(topics)
-        top_topics = topic_counts.most_common(5)
+        Une tâche en attente est retirée de la file; une tâche en cours
+        s'interrompt au prochain point de contrôle en conservant le travail
+        déjà effectué.
         
-        return {
-            'average_rating': sum(ratings) / len(ratings),
-            'sentiment_score': sentiment_distribution.get('positive', 0),
-            'review_count': len(self.reviews),
-            'platform_distribution': platform_distribution,
-            'sentiment_distribution': sentiment_distribution,
-            'top_topics': top_topics
-        }
+        Args:
+            job_id (str): Identifiant de la tâche
+            
+        Returns:
+            Optional[Job]: Tâche annulée, ou None si inconnue
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in Job.FINISHED:
+                return job
+            job.cancelled.set()
+            if job.future.cancel():
+                self._pending.pop(job.key, None)
+                job.status = 'cancelled'
+                job.finished_at = time.time()
+        return job
     
-## Extrait les principaux sujets d'un texte avec OpenAI
-    def extract_topics(self, text: str) -> List[str]:
+    ## Exécute une tâche dans un thread du pool
+    def _run(self, job: Job) -> None:
         """
-        Extrait les principaux sujets d'un texte avec OpenAI.
+        Exécute une tâche dans un thread du pool et enregistre son issue.
+        
+        Si le profilage est actif, la tâche est tracée par étape, journalisée
+        si elle est lente et capturée avec cProfile si la requête qui l'a
+        soumise l'était.
         
         Args:
-            text (str): Texte à analyser
-            
-        Returns:
-            List[str]: Liste des sujets identifiés
+            job (Job): Tâche à exécuter
         """
+        with self._lock:
+            if self._pending.get(job.key) is job:
+                del self._pending[job.key]
+            if job.cancelled.is_set():
+                job.status = 'cancelled'
+                job.finished_at = time.time()
+                return
+            job.status = 'running'
+            job.started_at = time.time()
+        
+        trace = Trace(f"tâche {job.kind} {job.id}") if request_profiler.enabled else None
+        profile = request_profiler.start_capture(wait=5.0) if trace is not None and job.profile_requested else None
+        _current_trace.set(trace)
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "Extract the main topics discussed in the following text. Return them as a comma-separated list."},
-                    {"role": "user", "content": text}
-                ]
-            )
-            
-            topics = response.choices[0].message.content.split(',')
-            return [topic.strip() for topic in topics]
-            
+            result = job.func(job.report, job.cancelled)
+            status, error = ('cancelled' if job.cancelled.is_set() else 'succeeded'), None
         except Exception as e:
-            print(f"Erreur lors de l'extraction des sujets: {e}")
-            return []
+            print(f"Erreur lors de l'exécution de la tâche {job.id} ({job.kind}): {e}")
+            result, status, error = None, 'failed', str(e)
+        finally:
+            # Le thread du pool est réutilisé par d'autres tâches
+            _current_trace.set(None)
+        
+        timings = None
+        if trace is not None:
+            timings = trace.breakdown()
+            if profile is not None:
+                timings['profile'] = request_profiler.finish_capture(profile, f"job-{job.kind}-{job.id}")
+            request_profiler.log_if_slow(trace)
+        
+        with job._lock:
+            job.timings = timings
+            job.result = result
+            job.error = error
+            job.status = status
+            job.finished_at = time.time()
+    
+    ## Supprime les tâches terminées depuis plus de retention secondes
+    def _prune(self) -> None:
+        """
+        Supprime les tâches terminées depuis plus de retention secondes.
+        """
+        limit = time.time() - self.retention
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.status in Job.FINISHED and job.finished_at < limit]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+# File des tâches de fond (voir /api/reviews/collect, /api/reviews/analyze et /api/jobs)
+job_manager = JobManager()
+
+# Analyseur utilisé par /api/sentiment et /api/topics sans entreprise précisée
+_text_analyzer: Optional[ReviewScraper] = None
+
+## Retourne le scraper servant à analyser des textes isolés
+def get_text_analyzer(company_id: Optional[str] = None) -> ReviewScraper:
+    """
+    Retourne le scraper servant à analyser des textes isolés.
+    
+    Args:
+        company_id (Optional[str]): Entreprise dont utiliser le scraper
+    
+    Returns:
+        ReviewScraper: Scraper de l'entreprise si elle est connue, sinon un
+            scraper temporaire partagé (le cache d'analyse est commun)
+    """
+    global _text_analyzer
+    if company_id:
+        scraper = scraper_registry.get(company_id)
+        if scraper is not None:
+            return scraper
+    if _text_analyzer is None:
+        _text_analyzer = ReviewScraper("temp", "fr", storage=None)
+    return _text_analyzer
+
+## Résout l'entreprise visée par une requête
+def resolve_company(data: Optional[Dict[str, Any]]) -> tuple:
+    """
+    Résout l'entreprise visée par une requête (champ ou paramètre company_id).
+    
+    Args:
+        data (Optional[Dict[str, Any]]): Corps JSON de la requête
+        
+    Returns:
+        tuple: (company_id, scraper, None) si l'entreprise est connue, sinon
+            (None, None, réponse d'erreur Flask)
+    """
+    company_id = (data or {}).get('company_id') or request.args.get('company_id')
+    if not company_id:
+        return None, None, (jsonify({
+            'error': 'Missing required field: company_id'
+        }), 400)
+    
+    scraper = scraper_registry.get(company_id)
+    if scraper is None:
+        return None, None, (jsonify({
+            'error': 'Unknown company. Please register the company first.',
+            'company_id': company_id
+        }), 404)
+    return company_id, scraper, None
+
+# Métriques lues dans les caches, le registre et la file de tâches à chaque export
+CACHE_HITS = metrics_registry.counter('cache_hits_total', "Succès des caches", ('cache',))
+CACHE_MISSES = metrics_registry.counter('cache_misses_total', "Échecs des caches", ('cache',))
+CACHE_ENTRIES = metrics_registry.gauge('cache_entries', "Entrées en mémoire des caches", ('cache',))
+LOADED_COMPANIES = metrics_registry.gauge('registry_loaded_companies', "Entreprises chargées en mémoire")
+JOBS = metrics_registry.gauge('jobs', "Tâches de fond connues par statut", ('status',))
+
+## Rafraîchit les métriques des caches, du registre et des tâches
+def collect_runtime_metrics() -> None:
+    """
+    Rafraîchit les métriques des caches, du registre et des tâches.
+    
+    Les caches non encore créés sont ignorés (l'export ne les instancie pas).
+    """
+    caches = (('sentiment', _sentiment_cache, 'memory_entries'),
+              ('resolution', _resolution_cache, 'entries'))
+    for name, cache, entries_key in caches:
+        if cache is None:
+            continue
+        stats = cache.stats()
+        CACHE_HITS.sync(stats['hits'], cache=name)
+        CACHE_MISSES.sync(stats['misses'], cache=name)
+        CACHE_ENTRIES.set(stats[entries_key], cache=name)
+    
+    LOADED_COMPANIES.set(len(scraper_registry.loaded_companies()))
+    statuses = Counter(job.status for job in job_manager.list_jobs())
+    for status in ('pending', 'running', 'succeeded', 'failed', 'cancelled'):
+        JOBS.set(statuses.get(status, 0), status=status)
+
+metrics_registry.register_collector(collect_runtime_metrics)
+
+## Marque le début d'une requête de l'API
+@app.before_request
+def start_request_metrics():
+    """Mémorise l'heure de début et incrémente les requêtes en cours de la route."""
+    g.metrics_started = time.perf_counter()
+    g.metrics_endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    API_REQUESTS_IN_FLIGHT.inc(endpoint=g.metrics_endpoint)
+
+## Enregistre la durée et le code de réponse d'une requête de l'API
+@app.after_request
+def record_request_metrics(response: Response) -> Response:
+    """
+    Enregistre la durée et le code de réponse d'une requête de l'API.
+    
+    Pour une réponse en flux, la durée s'arrête au début de l'envoi du corps.
+    """
+    if 'metrics_started' in g:
+        API_REQUEST_DURATION.observe(time.perf_counter() - g.metrics_started,
+                                     endpoint=g.metrics_endpoint, method=request.method)
+        API_REQUESTS.inc(endpoint=g.metrics_endpoint, method=request.method, status=response.status_code)
+    return response
+
+## Décrémente les requêtes en cours, y compris après une erreur
+@app.teardown_request
+def end_request_metrics(error: Optional[BaseException] = None) -> None:
+    """Décrémente les requêtes en cours de la route, y compris après une erreur."""
+    if 'metrics_endpoint' in g:
+        API_REQUESTS_IN_FLIGHT.dec(endpoint=g.pop('metrics_endpoint'))
+
+## Démarre la trace et, si demandé, la capture cProfile d'une requête
+@app.before_request
+def start_request_profiling():
+    """Démarre la trace de la requête et, si demandé, sa capture cProfile (profilage actif)."""
+    if not request_profiler.enabled:
+        return
+    trace = Trace(f"{request.method} {request.path}")
+    capture = request_profiler.claim_capture(request.headers.get(PROFILE_HEADER))
+    g.profiling_trace = trace
+    _current_trace.set(trace)
+    _profile_requested.set(capture)
+    if capture:
+        g.profiling_profile = request_profiler.start_capture()
+
+## Ajoute les durées des étapes à la réponse
+@app.after_request
+def add_server_timing(response: Response) -> Response:
+    """
+    Ajoute les durées des étapes à la réponse (en-tête Server-Timing).
+    
+    Pour une réponse en flux, seules les étapes antérieures à l'envoi du
+    corps y figurent : la trace est terminée à la fermeture de la réponse,
+    et le journal des requêtes lentes contient alors toutes les étapes.
+    """
+    trace = g.get('profiling_trace')
+    if trace is not None:
+        timings = trace.breakdown()
+        entries = [f'{name.replace(".", "-")};dur={span_timing["total_ms"]}'
+                   for name, span_timing in timings['spans'].items()]
+        entries.append(f"total;dur={timings['elapsed_ms']}")
+        response.headers['Server-Timing'] = ', '.join(entries)
+        
+        if response.is_streamed:
+            profile = g.pop('profiling_profile', None)
+            g.pop('profiling_trace')
+            response.call_on_close(lambda: finish_request_trace(trace, profile))
+    return response
+
+## Termine la trace d'une requête
+@app.teardown_request
+def end_request_profiling(error: Optional[BaseException] = None) -> None:
+    """
+    Termine la trace d'une requête, y compris après une erreur ou la fin
+    d'une réponse en flux : capture cProfile enregistrée, requête lente
+    journalisée.
+    """
+    trace = g.pop('profiling_trace', None)
+    if trace is not None:
+        finish_request_trace(trace, g.pop('profiling_profile', None))
+
+## Enregistre la capture et journalise une requête lente
+def finish_request_trace(trace: Trace, profile: Optional[cProfile.Profile]) -> None:
+    """
+    Enregistre la capture cProfile éventuelle et journalise la requête si
+    elle est lente.
+    
+    Args:
+        trace (Trace): Trace de la requête
+        profile (Optional[cProfile.Profile]): Capture en cours
+    """
+    _current_trace.set(None)
+    _profile_requested.set(False)
+    if profile is not None:
+        request_profiler.finish_capture(profile, trace.name)
+    request_profiler.log_if_slow(trace)
 
 # Routes API Flask
 
@@ -559,6 +6829,66 @@ def health_check():
         'version': '1.0.0'
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def export_metrics():
+    """
+    Expose les métriques de l'application au format texte Prometheus.
+    
+    Métriques principales (préfixe METRICS_NAMESPACE):
+        platform_request_duration_seconds, platform_errors_total: latence et
+            erreurs des requêtes vers chaque plateforme
+        llm_request_duration_seconds, llm_prompt_tokens_total,
+            llm_completion_tokens_total: latence et consommation du LLM
+        collected_total, analyzed_total: avis collectés et analysés par entreprise
+        api_requests_in_flight, api_request_duration_seconds: trafic de l'API
+        cache_hits_total, cache_misses_total, jobs: état des caches et des tâches
+    
+    Returns:
+        Response: Exposition text/plain (format 0.0.4)
+    """
+    return Response(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/profiling', methods=['GET', 'POST'])
+def configure_profiling():
+    """
+    Consulte ou modifie les réglages du profilage, sans redémarrage.
+    
+    Expected payload (POST, champs optionnels):
+    {
+        "enabled": boolean,
+        "slow_threshold": number (secondes),
+        "sample_rate": number (0 à 1),
+        "profile_next": number (prochaines requêtes capturées avec cProfile)
+    }
+    
+    La modification exige l'en-tête X-Profile portant PROFILE_TOKEN (refusée
+    si aucun jeton n'est configuré). Une requête portant cet en-tête est aussi
+    capturée avec cProfile lorsque le profilage est actif.
+    
+    Returns:
+        dict: Réglages du profilage
+    """
+    if request.method == 'GET':
+        return jsonify(request_profiler.settings())
+    
+    if not request_profiler.authorized(request.headers.get(PROFILE_HEADER)):
+        return jsonify({
+            'error': 'Profiling token required',
+            'details': f"Set PROFILE_TOKEN and send it in the {PROFILE_HEADER} header"
+        }), 403
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        allowed = ('enabled', 'slow_threshold', 'sample_rate', 'profile_next')
+        settings = request_profiler.configure(**{name: data[name] for name in allowed if name in data})
+        return jsonify(settings)
+        
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'error': 'Invalid profiling settings',
+            'details': str(e)
+        }), 400
+
 @app.route('/api/companies', methods=['POST'])
 def register_company():
     """
@@ -569,11 +6899,13 @@ def register_company():
         "name": "string",
         "location": "string",
         "app_name": "string",
-        "domain": "string"
+        "domain": "string",
+        "countries": ["fr", "be"] (optionnel, storefronts App Store, défaut: APPSTORE_COUNTRIES),
+        "company_id": "string" (optionnel, dérivé du nom par défaut)
     }
     
     Returns:
-        dict: Détails de l'entreprise enregistrée
+        dict: Détails de l'entreprise enregistrée, dont son company_id
     """
     try:
         data = request.get_json()
@@ -586,20 +6918,35 @@ def register_company():
                 'required': required_fields
             }), 400
         
+        countries = data.get('countries') or APPSTORE_COUNTRIES
+        if not isinstance(countries, list) or not all(isinstance(country, str) and country.strip()
+                                                      for country in countries):
+            return jsonify({
+                'error': 'Invalid countries',
+                'details': 'countries doit être une liste de codes pays'
+            }), 400
+        countries = [country.strip().lower() for country in countries]
+        
         # Initialisation du scraper pour l'entreprise
-        global global_scraper
-        global_scraper = ReviewScraper(
-            business_name=data['name'],
-            language='fr'
-        )
+        company_id = data.get('company_id') or ScraperRegistry.make_company_id(data['name'])
+        scraper_registry.register(company_id, {
+            'name': data['name'],
+            'location': data['location'],
+            'app_name': data['app_name'],
+            'domain': data['domain'],
+            'countries': countries,
+            'language': 'fr'
+        })
         
         return jsonify({
             'message': 'Company registered successfully',
             'company': {
+                'company_id': company_id,
                 'name': data['name'],
                 'location': data['location'],
                 'app_name': data['app_name'],
                 'domain': data['domain'],
+                'countries': countries,
                 'registered_at': datetime.now().isoformat()
             }
         })
@@ -615,60 +6962,64 @@ def collect_reviews():
     """
     Déclenche la collecte des avis pour une entreprise.
     
+    La collecte s'exécute en tâche de fond : la réponse (202) contient
+    l'identifiant de la tâche, à suivre via GET /api/jobs/<job_id>.
+    
     Expected payload:
     {
+        "company_id": "string",
         "platforms": ["google", "appstore", "trustpilot"],
-        "limit_per_platform": number
+        "limit_per_platform": number,
+        "full_refresh": boolean (optionnel, ignore les marqueurs de collecte)
     }
     
     Returns:
-        dict: Résumé de la collecte des avis
+        dict: Tâche de collecte soumise
     """
     try:
-        if global_scraper is None:
+        data = request.get_json()
+        company_id, scraper, error = resolve_company(data)
+        if error:
+            return error
+        
+        platforms = [p for p in data.get('platforms', ReviewScraper.PLATFORMS) if p in ReviewScraper.PLATFORMS]
+        if not platforms:
             return jsonify({
-                'error': 'No company registered. Please register a company first.'
+                'error': 'No valid platform requested',
+                'allowed': list(ReviewScraper.PLATFORMS)
             }), 400
-        
-        data = request.get_json()
-        platforms = data.get('platforms', ['google', 'appstore', 'trustpilot'])
-        limit = data.get('limit_per_platform', 100)
-        
-        # Collecte des avis depuis chaque plateforme
-        reviews_count = {
-            'google': 0,
-            'appstore': 0,
-            'trustpilot': 0
+        params = {
+            'platforms': platforms,
+            'limit_per_platform': data.get('limit_per_platform', 100),
+            'full_refresh': data.get('full_refresh', False)
         }
         
-        if 'google' in platforms:
-            google_reviews = global_scraper.google_api.get_reviews(
-                place_id='example_place_id',
-                max_results=limit
-            )
-            reviews_count['google'] = len(google_reviews)
-            global_scraper.reviews.extend(google_reviews)
-        
-        if 'appstore' in platforms:
-            appstore_reviews = global_scraper.appstore_api.get_reviews(
-                app_id='example_app_id',
-                max_results=limit
-            )
-            reviews_count['appstore'] = len(appstore_reviews)
-            global_scraper.reviews.extend(appstore_reviews)
-        
-        if 'trustpilot' in platforms:
-            trustpilot_reviews = global_scraper.trustpilot_api.get_reviews(
-                max_results=limit
-            )
-            reviews_count['trustpilot'] = len(trustpilot_reviews)
-            global_scraper.reviews.extend(trustpilot_reviews)
+        # Collecte concurrente des avis depuis chaque plateforme
+        def run(report, cancelled):
+            with scraper_registry.acquire(company_id) as scraper:
+                collection = scraper.collect_reviews(
+                    max_results=params['limit_per_platform'],
+                    platforms=params['platforms'],
+                    full_refresh=params['full_refresh'],
+                    progress=report,
+                    cancelled=cancelled
+                )
+                total_reviews = scraper.review_count()
+            reviews_count = {'google': 0, 'appstore': 0, 'trustpilot': 0}
+            reviews_count.update(collection['reviews_per_platform'])
+            return {
+                'total_reviews': total_reviews,
+                'reviews_per_platform': reviews_count,
+                'timed_out_platforms': collection['timed_out'],
+                'duplicates_skipped': collection['duplicates']
+            }
         
+        job = job_manager.submit('collect', company_id, params, run)
         return jsonify({
-            'message': 'Reviews collected successfully',
-            'total_reviews': len(global_scraper.reviews),
-            'reviews_per_platform': reviews_count
-        })
+            'message': 'Review collection submitted',
+            'job': job.to_dict(),
+            'status_url': f"/api/jobs/{job.id}"
+        }), 202
         
     except Exception as e:
         return jsonify({
@@ -681,35 +7032,356 @@ def analyze_reviews():
     """
     Analyse les avis collectés.
     
+    L'analyse s'exécute en tâche de fond : la réponse (202) contient
+    l'identifiant de la tâche, à suivre via GET /api/jobs/<job_id>.
+    
+    Expected payload:
+    {
+        "company_id": "string",
+        "batch": boolean (optionnel),
+        "local_first": boolean (optionnel),
+        "keep_local": boolean (optionnel, défaut: local_first),
+        "force": boolean (optionnel)
+    }
+    
+    Returns:
+        dict: Tâche d'analyse soumise (le résultat contient les KPIs)
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        company_id, scraper, error = resolve_company(data)
+        if error:
+            return error
+        
+        if not scraper.review_count():
+            return jsonify({
+                'error': 'No reviews to analyze. Please collect reviews first.'
+            }), 400
+        
+        params = {
+            'batch': data.get('batch', False),
+            'local_first': data.get('local_first', False),
+            'keep_local': data.get('keep_local'),
+            'force': data.get('force', False)
+        }
+        
+        def run(report, cancelled):
+            with scraper_registry.acquire(company_id) as scraper:
+                # Analyse des avis
+                analyzed_reviews = scraper.analyze_reviews(
+                    progress=report,
+                    cancelled=cancelled,
+                    **params
+                )
+                
+                # Calcul des KPIs
+                return {
+                    'kpis': scraper.calculate_kpis(),
+                    'reviews_count': len(analyzed_reviews),
+                    'analysis_stats': dict(scraper.last_analysis_stats)
+                }
+        
+        job = job_manager.submit('analyze', company_id, params, run)
+        return jsonify({
+            'message': 'Review analysis submitted',
+            'job': job.to_dict(),
+            'status_url': f"/api/jobs/{job.id}"
+        }), 202
+        
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to analyze reviews',
+            'details': str(e)
+        }), 500
+
+@app.route('/api/reviews/topics', methods=['POST'])
+def extract_review_topics():
+    """
+    Extrait localement (sans LLM) les sujets de tous les avis d'une entreprise.
+    
+    L'extraction s'exécute en tâche de fond : la réponse (202) contient
+    l'identifiant de la tâche, à suivre via GET /api/jobs/<job_id>.
+    
+    Expected payload:
+    {
+        "company_id": "string",
+        "overwrite": boolean (optionnel, remplace aussi les sujets existants)
+    }
+    
+    Returns:
+        dict: Tâche d'extraction soumise
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        company_id, scraper, error = resolve_company(data)
+        if error:
+            return error
+        
+        params = {'overwrite': data.get('overwrite', False)}
+        
+        def run(report, cancelled):
+            with scraper_registry.acquire(company_id) as scraper:
+                stats = scraper.extract_review_topics(progress=report, cancelled=cancelled, **params)
+                return {**stats, 'kpis': scraper.calculate_kpis()}
+        
+        job = job_manager.submit('topics', company_id, params, run)
+        return jsonify({
+            'message': 'Topic extraction submitted',
+            'job': job.to_dict(),
+            'status_url': f"/api/jobs/{job.id}"
+        }), 202
+        
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to extract topics',
+            'details': str(e)
+        }), 500
+
+@app.route('/api/resolutions/warm', methods=['POST'])
+def warm_resolutions():
+    """
+    Préchauffe le cache des identifiants de plateforme pour des entreprises.
+    
+    Une tâche de fond est soumise par entreprise.
+    
+    Expected payload:
+    {
+        "company_ids": ["string", ...],
+        "platforms": ["google", "appstore", "trustpilot"] (optionnel)
+    }
+    
     Returns:
-        dict: Résultats de l'analyse avec KPIs
+        dict: Tâches soumises et entreprises inconnues
     """
     try:
-        if global_scraper is None:
+        data = request.get_json(silent=True) or {}
+        if not data.get('company_ids'):
             return jsonify({
-                'error': 'No company registered. Please register a company first.'
+                'error': 'Missing required field: company_ids'
             }), 400
         
-        if not global_scraper.reviews:
+        platforms = [p for p in data.get('platforms', ReviewScraper.PLATFORMS) if p in ReviewScraper.PLATFORMS]
+        if not platforms:
             return jsonify({
-                'error': 'No reviews to analyze. Please collect reviews first.'
+                'error': 'No valid platform requested',
+                'allowed': list(ReviewScraper.PLATFORMS)
+            }), 400
+        jobs, unknown = [], []
+        for company_id in data['company_ids']:
+            scraper = scraper_registry.get(company_id)
+            if scraper is None:
+                unknown.append(company_id)
+                continue
+            
+            def run(report, cancelled, scraper=scraper):
+                return {'platform_ids': scraper.warm_resolutions(platforms)}
+            jobs.append(job_manager.submit('warm', company_id, {'platforms': platforms}, run))
+        
+        return jsonify({
+            'message': 'Resolution warming submitted',
+            'jobs': [job.to_dict() for job in jobs],
+            'unknown_companies': unknown
+        }), 202
+        
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to warm resolutions',
+            'details': str(e)
+        }), 500
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """
+    Liste les tâches de fond récentes.
+    
+    Query parameters:
+        company_id (optionnel): Restreint aux tâches de cette entreprise
+    
+    Returns:
+        dict: Tâches, de la plus récente à la plus ancienne
+    """
+    jobs = job_manager.list_jobs(request.args.get('company_id'))
+    return jsonify({'jobs': [job.to_dict() for job in jobs]})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Retourne l'état d'une tâche de fond.
+    
+    Returns:
+        dict: Statut, progression (avis récupérés/analysés), ETA, résultat ou erreur
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job', 'job_id': job_id}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """
+    Annule une tâche de fond.
+    
+    Une tâche en cours s'arrête au prochain point de contrôle; le travail
+    déjà effectué (avis collectés ou analysés) est conservé.
+    
+    Returns:
+        dict: État de la tâche après la demande d'annulation
+    """
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job', 'job_id': job_id}), 404
+    return jsonify(job.to_dict())
+
+## Encode une clé (date, id) en curseur opaque
+def encode_cursor(key: tuple) -> str:
+    """
+    Encode une clé de pagination (date, id) en curseur opaque.
+    
+    Args:
+        key (tuple): Clé (date, id) du dernier avis d'une page
+        
+    Returns:
+        str: Curseur base64 utilisable dans une URL
+    """
+    raw = json.dumps(list(key), ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+## Décode un curseur opaque en clé (date, id)
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Décode un curseur produit par encode_cursor.
+    
+    Args:
+        cursor (str): Curseur reçu du client
+        
+    Returns:
+        tuple: Clé (date, id)
+        
+    Raises:
+        ValueError: Si le curseur est invalide
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        key = json.loads(raw.decode('utf-8'))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError('Curseur invalide') from None
+    if (not isinstance(key, list) or len(key) != 2
+            or not (key[0] is None or isinstance(key[0], str)) or not isinstance(key[1], str)):
+        raise ValueError('Curseur invalide')
+    return key[0], key[1]
+
+@app.route('/api/reviews', methods=['GET'])
+def list_reviews():
+    """
+    Liste les avis d'une entreprise page par page, filtrés côté serveur.
+    
+    Query parameters:
+        company_id: Identifiant de l'entreprise
+        platform, sentiment, topic: Valeurs exactes (optionnel)
+        date_from, date_to: Bornes incluses YYYY-MM-DD (optionnel)
+        min_rating, max_rating: Bornes incluses de la note (optionnel)
+        limit: Taille de la page (défaut REVIEWS_PAGE_SIZE, max REVIEWS_PAGE_MAX)
+        cursor: Curseur next_cursor de la page précédente (optionnel)
+        fields: Champs à retourner, séparés par des virgules (optionnel,
+            par exemple "id,date,rating,sentiment" pour exclure le texte)
+    
+    Les avis sont triés du plus récent au plus ancien. La pagination par
+    curseur (date, id) garde un coût constant quelle que soit la page.
+    
+    Returns:
+        dict: Avis de la page et next_cursor (null sur la dernière page)
+    """
+    try:
+        company_id, scraper, error = resolve_company(None)
+        if error:
+            return error
+        
+        args = request.args
+        try:
+            filters = {name: args[name]
+                       for name in ('platform', 'date_from', 'date_to', 'sentiment', 'topic')
+                       if args.get(name)}
+            for name in ('min_rating', 'max_rating'):
+                if args.get(name):
+                    filters[name] = float(args[name])
+            limit = min(max(int(args.get('limit', REVIEWS_PAGE_SIZE)), 1), REVIEWS_PAGE_MAX)
+            after = decode_cursor(args['cursor']) if args.get('cursor') else None
+        except ValueError as e:
+            return jsonify({
+                'error': 'Invalid query parameter',
+                'details': str(e)
             }), 400
         
-        # Analyse des avis
-        analyzed_reviews = global_scraper.analyze_reviews()
+        reviews, next_key = scraper.page_reviews(limit, after=after, **filters)
+        
+        fields = [field.strip() for field in args.get('fields', '').split(',') if field.strip()]
+        if fields:
+            reviews = [{field: review[field] for field in fields if field in review}
+                       for review in reviews]
+        
+        with span('serialization'):
+            return jsonify({
+                'company_id': company_id,
+                'reviews': reviews,
+                'count': len(reviews),
+                'next_cursor': encode_cursor(next_key) if next_key else None
+            })
+        
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to list reviews',
+            'details': str(e)
+        }), 500
+
+@app.route('/api/trends', methods=['GET'])
+def get_trends():
+    """
+    Retourne l'évolution des notes, sentiments et sujets d'une entreprise.
+    
+    Query parameters:
+        company_id: Identifiant de l'entreprise
+        granularity: 'day', 'week' ou 'month' (défaut: 'day')
+        date_from, date_to: Bornes incluses YYYY-MM-DD (défaut: période couverte par les avis)
+        platform: Plateforme (défaut: toutes)
+    
+    Les séries sont maintenues au fil de la collecte et de l'analyse, et
+    enregistrées avec les avis dans le stockage durable : aucun avis n'est
+    chargé et le coût de la requête dépend du nombre de périodes, pas du
+    nombre d'avis.
+    
+    Returns:
+        dict: Une entrée par période (note moyenne, sentiments, sujets principaux)
+    """
+    try:
+        company_id, scraper, error = resolve_company(None)
+        if error:
+            return error
         
-        # Calcul des KPIs
-        kpis = global_scraper.calculate_kpis()
+        args = request.args
+        granularity = args.get('granularity', 'day')
+        try:
+            date_from = date.fromisoformat(args['date_from']) if args.get('date_from') else None
+            date_to = date.fromisoformat(args['date_to']) if args.get('date_to') else None
+            with scraper_registry.acquire(company_id) as scraper:
+                series = scraper.trend_series(granularity, date_from, date_to,
+                                              platform=args.get('platform') or None,
+                                              max_buckets=TRENDS_MAX_BUCKETS)
+        except ValueError as e:
+            return jsonify({
+                'error': 'Invalid query parameter',
+                'details': str(e)
+            }), 400
         
         return jsonify({
-            'message': 'Reviews analyzed successfully',
-            'kpis': kpis,
-            'reviews_count': len(analyzed_reviews)
+            'company_id': company_id,
+            'granularity': granularity,
+            'platform': args.get('platform') or None,
+            'series': series
         })
         
     except Exception as e:
         return jsonify({
-            'error': 'Failed to analyze reviews',
+            'error': 'Failed to compute trends',
             'details': str(e)
         }), 500
 
@@ -720,36 +7392,71 @@ def generate_report():
     
     Expected payload:
     {
-        "format": "json",
-        "include_reviews": boolean
+        "company_id": "string",
+        "format": "json" | "ndjson",
+        "stream": boolean,
+        "include_reviews": boolean,
+        "filters": {
+            "platform": "string",
+            "date_from": "YYYY-MM-DD",
+            "date_to": "YYYY-MM-DD",
+            "sentiment": "string",
+            "min_rating": number,
+            "max_rating": number,
+            "topic": "string"
+        }
     }
     
+    Les filtres (optionnels) s'appliquent aux avis inclus et sont exécutés
+    par le stockage durable.
+    
+    En format "ndjson", ou en "json" avec "stream": true, le rapport est
+    envoyé en flux : les métadonnées et KPIs d'abord, puis les avis au fil
+    de leur lecture, sans construire le rapport complet en mémoire.
+    - ndjson : une première ligne {"metadata": ..., "kpis": ...}, puis une
+      ligne par avis (application/x-ndjson)
+    - json en flux : même document que le format json, transmis par morceaux
+    
     Returns:
         dict: Rapport d'analyse complet
     """
     try:
-        if global_scraper is None:
-            return jsonify({
-                'error': 'No company registered. Please register a company first.'
-            }), 400
-        
         data = request.get_json()
+        company_id, scraper, error = resolve_company(data)
+        if error:
+            return error
+        
         include_reviews = data.get('include_reviews', True)
+        report_format = data.get('format', 'json')
+        if report_format == 'ndjson' or data.get('stream', False):
+            return stream_report(company_id, report_format, include_reviews,
+                                 data.get('filters') or {})
         
         # Génération du rapport
-        report = {
-            "metadata": {
-                "generated_at": datetime.now().isoformat(),
-                "business_name": global_scraper.business_name,
-                "total_reviews": len(global_scraper.reviews)
-            },
-            "kpis": global_scraper.calculate_kpis()
-        }
-        
-        if include_reviews:
-            report["reviews"] = global_scraper.reviews
+        with scraper_registry.acquire(company_id) as scraper:
+            kpis = scraper.calculate_kpis()
+            report = {
+                "metadata": {
+                    "generated_at": datetime.now().isoformat(),
+                    "company_id": company_id,
+                    "business_name": scraper.business_name,
+                    "total_reviews": kpis['review_count']
+                },
+                "kpis": kpis
+            }
+            
+            if include_reviews:
+                filters = data.get('filters') or {}
+                if filters:
+                    allowed = ('platform', 'date_from', 'date_to', 'sentiment', 'min_rating', 'max_rating', 'topic')
+                    report["reviews"] = scraper.query_reviews(
+                        **{name: filters[name] for name in allowed if name in filters}
+                    )
+                else:
+                    report["reviews"] = list(scraper.stream_reviews())
         
-        return jsonify(report)
+        with span('serialization'):
+            return jsonify(report)
         
     except Exception as e:
         return jsonify({
@@ -757,6 +7464,85 @@ def generate_report():
             'details': str(e)
         }), 500
 
+## Envoie un rapport en flux (NDJSON ou tableau JSON par morceaux)
+def stream_report(company_id: str, report_format: str,
+                  include_reviews: bool, filters: Dict[str, Any]) -> Response:
+    """
+    Envoie un rapport en flux : métadonnées et KPIs d'abord, puis les avis.
+    
+    Les KPIs sont calculés sous le verrou de l'entreprise; les avis sont
+    ensuite lus au fil de l'envoi et sérialisés par paquets de
+    REPORT_STREAM_CHUNK avis.
+    
+    Args:
+        company_id (str): Identifiant de l'entreprise (connue)
+        report_format (str): 'ndjson' ou 'json'
+        include_reviews (bool): Inclut les avis après l'en-tête
+        filters (Dict[str, Any]): Filtres des avis (voir generate_report)
+        
+    Returns:
+        Response: Réponse Flask en flux
+    """
+    allowed = ('platform', 'date_from', 'date_to', 'sentiment', 'min_rating', 'max_rating', 'topic')
+    filters = {name: filters[name] for name in allowed if name in filters}
+    with scraper_registry.acquire(company_id) as scraper:
+        kpis = scraper.calculate_kpis()
+        header = {
+            "metadata": {
+                "generated_at": datetime.now().isoformat(),
+                "company_id": company_id,
+                "business_name": scraper.business_name,
+                "total_reviews": kpis['review_count']
+            },
+            "kpis": kpis
+        }
+    ndjson = report_format == 'ndjson'
+    
+    def generate():
+        with span('serialization'):
+            head = json.dumps(header, ensure_ascii=False)
+        if ndjson:
+            yield head + "\n"
+        elif include_reviews:
+            yield head[:-1] + ', "reviews": ['
+        else:
+            yield head
+            return
+        if not include_reviews:
+            return
+        
+        def encode(chunk, first):
+            with span('serialization'):
+                lines = [json.dumps(review, ensure_ascii=False) for review in chunk]
+            if ndjson:
+                return "\n".join(lines) + "\n"
+            return ("" if first else ", ") + ", ".join(lines)
+        
+        try:
+            chunk, first = [], True
+            for review in scraper.stream_reviews(**filters):
+                chunk.append(review)
+                if len(chunk) >= REPORT_STREAM_CHUNK:
+                    yield encode(chunk, first)
+                    chunk, first = [], False
+            if chunk:
+                yield encode(chunk, first)
+        except Exception as e:
+            # L'en-tête est déjà envoyé : l'erreur est signalée dans le flux
+            print(f"Erreur lors de l'envoi du rapport en flux: {e}")
+            error = {'error': 'Failed to generate report', 'details': str(e)}
+            if ndjson:
+                yield json.dumps(error) + "\n"
+            else:
+                # Ferme le tableau et le document pour rester du JSON valide
+                yield '], "error": ' + json.dumps(error) + '}'
+            return
+        if not ndjson:
+            yield "]}"
+    
+    mimetype = 'application/x-ndjson' if ndjson else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
 @app.route('/api/sentiment', methods=['POST'])
 def analyze_text_sentiment():
     """
@@ -778,11 +7564,8 @@ def analyze_text_sentiment():
                 'error': 'Missing required field: text'
             }), 400
         
-        if global_scraper is None:
-            global_scraper = ReviewScraper("temp", "fr")
-        
-        # Analyse du sentiment
-        sentiment_analysis = global_scraper.analyze_sentiment_with_openai(data['text'])
+        # Analyse du sentiment (résultat partagé avec /api/topics via le cache)
+        sentiment_analysis = get_text_analyzer(data.get('company_id')).analyze_text(data['text'])
         
         return jsonify({
             'sentiment': sentiment_analysis['sentiment'],
@@ -803,7 +7586,8 @@ def extract_topics():
     
     Expected payload:
     {
-        "text": "string"
+        "text": "string",
+        "engine": "llm" | "local" (optionnel, défaut: TOPIC_ENGINE)
     }
     
     Returns:
@@ -817,11 +7601,8 @@ def extract_topics():
                 'error': 'Missing required field: text'
             }), 400
         
-        if global_scraper is None:
-            global_scraper = ReviewScraper("temp", "fr")
-        
-        # Extraction des sujets
-        topics = global_scraper.extract_topics(data['text'])
+        # Extraction des sujets (résultat partagé avec /api/sentiment via le cache)
+        topics = get_text_analyzer(data.get('company_id')).extract_topics(data['text'], data.get('engine'))
         
         return jsonify({
             'topics': topics
@@ -0,0 +1,15 @@
+"""
+Configuration commune des tests du module code_prototype
+
+Les caches et le stockage durable sont désactivés (chemins vides) avant
+l'import du module : aucun fichier SQLite n'est créé dans le dépôt, et
+chaque test construit explicitement les backends dont il a besoin.
+"""
+
+import os
+import sys
+
+for _key in ('SENTIMENT_CACHE_PATH', 'RESOLUTION_CACHE_PATH', 'REVIEW_DB_PATH'):
+    os.environ[_key] = ''
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
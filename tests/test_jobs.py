@@ -0,0 +1,141 @@
+"""
+Tests de la file des tâches de fond (JobManager et GET/DELETE /api/jobs/<id>)
+
+Les tâches sont de simples fonctions synchronisées par des threading.Event :
+aucun appel réseau ni LLM n'est nécessaire.
+"""
+
+import threading
+
+import pytest
+
+import code_prototype as cp
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = cp.JobManager(max_workers=1)
+    monkeypatch.setattr(cp, 'job_manager', manager)
+    return manager
+
+
+def wait(job, timeout: float = 5.0):
+    """Attend la fin d'une tâche et retourne son statut."""
+    job.future.result(timeout=timeout)
+    return job.status
+
+
+def blocking_job(started: threading.Event, release: threading.Event):
+    """Tâche qui occupe le seul thread du pool jusqu'à release."""
+    def func(report, cancelled):
+        started.set()
+        release.wait(5)
+        return {'ok': True}
+    return func
+
+
+def test_identical_pending_submissions_share_a_job(manager):
+    started, release = threading.Event(), threading.Event()
+    running = manager.submit('collect', 'acme', {'limit': 1}, blocking_job(started, release))
+    assert started.wait(5)
+
+    calls = []
+    work = lambda report, cancelled: calls.append(1) or {'count': len(calls)}
+    first = manager.submit('analyze', 'acme', {'batch': True}, work)
+    second = manager.submit('analyze', 'acme', {'batch': True}, work)
+    other = manager.submit('analyze', 'acme', {'batch': False}, work)
+    # Une tâche déjà démarrée n'absorbe pas les nouvelles soumissions
+    again = manager.submit('collect', 'acme', {'limit': 1}, work)
+
+    assert second is first
+    assert other is not first
+    assert again is not running
+    release.set()
+    for job in (running, first, other, again):
+        assert wait(job) == 'succeeded'
+    assert len(calls) == 3
+
+
+def test_cancelled_running_job_stops_at_next_check(manager):
+    started, checkpoint = threading.Event(), threading.Event()
+
+    def work(report, cancelled):
+        report(total=100)
+        for step in range(100):
+            if cancelled.is_set():
+                break
+            report(done=1, analyzed=1)
+            if step == 4:
+                started.set()
+                checkpoint.wait(5)
+        return {'steps': step}
+
+    job = manager.submit('analyze', 'acme', {}, work)
+    assert started.wait(5)
+    assert manager.cancel(job.id) is job
+    checkpoint.set()
+
+    assert wait(job) == 'cancelled'
+    state = job.to_dict()
+    assert state['progress']['done'] == 5
+    assert state['progress']['analyzed'] == 5
+    assert state['result'] == {'steps': 5}
+    assert state['eta_seconds'] is None
+
+
+def test_cancelled_pending_job_never_runs(manager):
+    started, release = threading.Event(), threading.Event()
+    running = manager.submit('collect', 'acme', {}, blocking_job(started, release))
+    assert started.wait(5)
+    calls = []
+    pending = manager.submit('analyze', 'acme', {}, lambda report, cancelled: calls.append(1))
+
+    manager.cancel(pending.id)
+    release.set()
+
+    assert wait(running) == 'succeeded'
+    assert pending.status == 'cancelled'
+    assert not calls
+    # Une nouvelle soumission identique crée une nouvelle tâche
+    assert manager.submit('analyze', 'acme', {}, lambda report, cancelled: {}) is not pending
+
+
+def test_eta_follows_progress(manager):
+    halfway, release = threading.Event(), threading.Event()
+
+    def work(report, cancelled):
+        report(total=10)
+        report(done=5)
+        halfway.set()
+        release.wait(5)
+        report(done=5)
+        return {}
+
+    job = manager.submit('analyze', 'acme', {}, work)
+    assert halfway.wait(5)
+    state = job.to_dict()
+    assert state['status'] == 'running'
+    assert state['progress']['percent'] == 50.0
+    assert state['eta_seconds'] is not None and state['eta_seconds'] >= 0
+
+    release.set()
+    assert wait(job) == 'succeeded'
+    assert job.to_dict()['eta_seconds'] is None
+
+
+def test_failed_job_reports_its_error_through_the_route(manager):
+    def work(report, cancelled):
+        raise RuntimeError("Plateforme indisponible")
+
+    job = manager.submit('collect', 'acme', {}, work)
+    assert wait(job) == 'failed'
+
+    client = cp.app.test_client()
+    response = client.get(f"/api/jobs/{job.id}")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['status'] == 'failed'
+    assert body['error'] == 'Plateforme indisponible'
+    assert body['result'] is None
+    assert client.get('/api/jobs/inconnue').status_code == 404
+    assert client.delete(f"/api/jobs/{job.id}").get_json()['status'] == 'failed'
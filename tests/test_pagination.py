@@ -0,0 +1,144 @@
+"""
+Tests de la pagination par clé des avis (page_reviews et GET /api/reviews)
+
+Les mêmes scénarios sont joués sur les avis en mémoire et sur le stockage
+SQLite : ordre stable à date égale, avis ajoutés entre deux pages, curseurs
+invalides et résultats identiques d'un backend à l'autre.
+"""
+
+import base64
+import json
+
+import pytest
+
+import code_prototype as cp
+
+
+def make_reviews(count: int, start: int = 0, day: int = None):
+    """Construit des avis dont plusieurs partagent la même date."""
+    return [{
+        'id': f"review_{index:04d}",
+        'platform': ('google', 'appstore', 'trustpilot')[index % 3],
+        'rating': index % 5 + 1,
+        'text': f"Avis {index}",
+        'date': f"2024-01-{(day if day is not None else index // 4 % 28 + 1):02d}",
+        'sentiment': ('positive', 'negative', 'neutral')[index % 3],
+        'topics': ['livraison', 'prix'][:index % 3]
+    } for index in range(start, start + count)]
+
+
+def raw_cursor(value) -> str:
+    """Encode une valeur JSON arbitraire comme un curseur."""
+    return base64.urlsafe_b64encode(json.dumps(value).encode('utf-8')).decode('ascii')
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def registry(request, tmp_path, monkeypatch):
+    storage = cp.SQLiteReviewStorage(str(tmp_path / 'reviews.sqlite3')) if request.param == 'sqlite' else None
+    registry = cp.ScraperRegistry(storage=storage)
+    monkeypatch.setattr(cp, 'scraper_registry', registry)
+    registry.register('acme', {'name': 'Acme', 'location': 'Paris', 'app_name': 'Acme',
+                               'domain': 'acme.fr'})
+    return registry
+
+
+def fetch_all(client, limit: int, **params):
+    """Parcourt toutes les pages de GET /api/reviews et retourne les identifiants."""
+    ids, cursor = [], None
+    while True:
+        query = dict(params, company_id='acme', limit=limit)
+        if cursor:
+            query['cursor'] = cursor
+        response = client.get('/api/reviews', query_string=query)
+        assert response.status_code == 200
+        body = response.get_json()
+        ids.extend(review['id'] for review in body['reviews'])
+        cursor = body['next_cursor']
+        if not cursor:
+            return ids
+
+
+def expected_ids(reviews):
+    return [review['id'] for review in sorted(reviews, key=cp.ReviewScraper.review_key, reverse=True)]
+
+
+def test_stable_order_when_reviews_share_a_date(registry):
+    reviews = make_reviews(25, day=5)
+    registry.get('acme').add_reviews(reviews)
+
+    ids = fetch_all(cp.app.test_client(), limit=7)
+
+    assert ids == expected_ids(reviews)
+    assert len(set(ids)) == 25
+
+
+def test_reviews_added_between_pages(registry):
+    scraper = registry.get('acme')
+    reviews = make_reviews(40)
+    scraper.add_reviews(reviews)
+
+    first, cursor = scraper.page_reviews(10)
+    # Un avis plus récent que la page courante et un avis plus ancien
+    newer = make_reviews(1, start=100, day=28)
+    older = make_reviews(1, start=200, day=1)
+    scraper.add_reviews(newer + older)
+
+    ids = [review['id'] for review in first]
+    while cursor:
+        page, cursor = scraper.page_reviews(10, after=cursor)
+        ids.extend(review['id'] for review in page)
+
+    assert ids == expected_ids(reviews + older)
+    assert newer[0]['id'] not in ids
+
+
+@pytest.mark.parametrize('cursor', [
+    'pas-un-curseur!!',
+    base64.urlsafe_b64encode(b'\xff\xfe\xfd').decode('ascii'),
+    raw_cursor({'date': '2024-01-01', 'id': 'review_0001'}),
+    raw_cursor(['2024-01-01']),
+    raw_cursor(['2024-01-01', 12]),
+    raw_cursor([20240101, 'review_0001'])
+])
+def test_malformed_or_tampered_cursor_returns_400(registry, cursor):
+    registry.get('acme').add_reviews(make_reviews(5))
+
+    response = cp.app.test_client().get('/api/reviews', query_string={'company_id': 'acme',
+                                                                      'cursor': cursor})
+
+    assert response.status_code == 400
+    assert response.get_json()['details'] == 'Curseur invalide'
+
+
+@pytest.mark.parametrize('key', [('2024-01-05', 'review_0001'), (None, 'avis_é'), ('', '')])
+def test_cursor_round_trip(key):
+    assert cp.decode_cursor(cp.encode_cursor(key)) == key
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'platform': 'google'},
+    {'sentiment': 'negative', 'min_rating': 2},
+    {'date_from': '2024-01-03', 'date_to': '2024-01-06', 'max_rating': 4},
+    {'topic': 'prix'}
+])
+def test_memory_and_sqlite_pages_match(tmp_path, filters):
+    reviews = make_reviews(60) + [dict(make_reviews(1, start=300)[0], date=None),
+                                  dict(make_reviews(1, start=301)[0], rating=None)]
+    memory = cp.ReviewScraper('Acme', storage=None, sentiment_cache=cp.SentimentCache(path=None))
+    stored = cp.ReviewScraper('Acme', storage=cp.SQLiteReviewStorage(str(tmp_path / 'reviews.sqlite3')),
+                              sentiment_cache=cp.SentimentCache(path=None))
+    memory.add_reviews(reviews)
+    stored.add_reviews(reviews)
+
+    pages = {}
+    for name, scraper in (('memory', memory), ('sqlite', stored)):
+        pages[name], cursor = [], None
+        while True:
+            page, cursor = scraper.page_reviews(9, after=cursor, **filters)
+            pages[name].append(page)
+            if cursor is None:
+                break
+
+    assert pages['memory'] == pages['sqlite']
+    assert sum(len(page) for page in pages['memory']) == len(memory.query_reviews(**filters))
@@ -0,0 +1,209 @@
+"""
+Tests du stockage en colonnes (ReviewStore, ReviewRow) et de l'agrégateur de KPIs
+
+Le comportement attendu est celui de l'ancienne liste de dictionnaires :
+chaque avis relu doit être identique à l'avis écrit, et les KPIs doivent
+correspondre au calcul complet d'origine sur les mêmes données.
+"""
+
+from collections import Counter
+
+import pytest
+
+import code_prototype as cp
+
+
+def make_review(index: int, **fields):
+    """Construit un avis complet, toutes colonnes renseignées."""
+    review = {
+        'id': f"google_{index:04d}",
+        'platform': ('google', 'appstore', 'trustpilot')[index % 3],
+        'author': f"Auteur {index}",
+        'rating': index % 5 + 1,
+        'text': f"Avis numéro {index} : livraison rapide, très bon accueil — ça va",
+        'date': f"2024-01-{index % 28 + 1:02d}",
+        'title': f"Titre {index} ✓",
+        'language': 'fr',
+        'country': 'fr',
+        'sentiment': ('positive', 'negative', 'neutral')[index % 3],
+        'score': 0.25 * (index % 4),
+        'confidence': 0.9,
+        'topics': ['livraison', 'prix'][:index % 3],
+        'analysis_source': 'local',
+        'analysis_version': 'v1'
+    }
+    review.update(fields)
+    return review
+
+
+def baseline_kpis(reviews):
+    """Calcul complet des KPIs de la version d'origine (liste de dictionnaires)."""
+    if not reviews:
+        return {
+            'average_rating': 0,
+            'sentiment_score': 0,
+            'review_count': 0,
+            'platform_distribution': {},
+            'sentiment_distribution': {},
+            'top_topics': []
+        }
+    ratings = [review['rating'] for review in reviews]
+    sentiments = [review['sentiment'] for review in reviews if 'sentiment' in review]
+    platforms = [review['platform'] for review in reviews]
+    topics = [topic for review in reviews if 'topics' in review for topic in review['topics']]
+    platform_distribution = {
+        platform: count / len(reviews) * 100 for platform, count in Counter(platforms).items()
+    }
+    sentiment_distribution = {
+        sentiment: count / len(sentiments) * 100 for sentiment, count in Counter(sentiments).items()
+    }
+    return {
+        'average_rating': sum(ratings) / len(ratings),
+        'sentiment_score': sentiment_distribution.get('positive', 0),
+        'review_count': len(reviews),
+        'platform_distribution': platform_distribution,
+        'sentiment_distribution': sentiment_distribution,
+        'top_topics': Counter(topics).most_common(5)
+    }
+
+
+def assert_kpis_equal(actual, expected):
+    """Compare deux jeux de KPIs, les moyennes à l'arrondi près."""
+    assert actual['review_count'] == expected['review_count']
+    assert actual['average_rating'] == pytest.approx(expected['average_rating'])
+    assert actual['sentiment_score'] == pytest.approx(expected['sentiment_score'])
+    assert actual['platform_distribution'] == pytest.approx(expected['platform_distribution'])
+    assert actual['sentiment_distribution'] == pytest.approx(expected['sentiment_distribution'])
+    assert [tuple(item) for item in actual['top_topics']] == [tuple(item) for item in expected['top_topics']]
+
+
+def test_round_trip_of_every_field():
+    reviews = [make_review(index) for index in range(30)]
+    store = cp.ReviewStore(reviews)
+
+    assert len(store) == 30
+    assert store.to_dicts() == reviews
+    assert store[-1].to_dict() == reviews[-1]
+    assert [row['id'] for row in store[5:8]] == [review['id'] for review in reviews[5:8]]
+    with pytest.raises(IndexError):
+        store[30]
+
+
+def test_none_and_unsupported_values_fall_back_to_extras():
+    review = make_review(1, rating=None, sentiment=None, date='15/01/2024', text=None,
+                         topics='livraison', score='n/a', source_url='https://example.com')
+    store = cp.ReviewStore([review])
+
+    assert store[0].to_dict() == review
+    assert store[0]['rating'] is None
+    assert store[0]['date'] == '15/01/2024'
+    assert store[0]['source_url'] == 'https://example.com'
+
+
+def test_missing_fields_behave_like_a_dict():
+    review = {'id': 'appstore_1', 'platform': 'appstore', 'rating': 4}
+    row = cp.ReviewStore([review])[0]
+
+    assert row.to_dict() == review
+    assert len(row) == 3
+    assert 'sentiment' not in row
+    assert row.get('sentiment') is None
+    assert row.get('topics', []) == []
+    with pytest.raises(KeyError):
+        row['sentiment']
+
+
+def test_delete_and_reassign_keys():
+    store = cp.ReviewStore([make_review(2)])
+    row = store[0]
+
+    del row['sentiment']
+    assert 'sentiment' not in row
+    with pytest.raises(KeyError):
+        del row['sentiment']
+    row['sentiment'] = 'negative'
+    assert row['sentiment'] == 'negative'
+
+    # Passage de la colonne aux champs d'appoint et retour : une seule clé
+    row['rating'] = 'inconnue'
+    assert row['rating'] == 'inconnue'
+    row['rating'] = 3
+    assert row['rating'] == 3
+    assert list(row).count('rating') == 1
+
+    row['text'] = 'Nouveau texte'
+    del row['title']
+    expected = make_review(2, sentiment='negative', rating=3, text='Nouveau texte')
+    del expected['title']
+    assert row.to_dict() == expected
+
+
+def test_to_dict_and_topics_are_independent_copies():
+    store = cp.ReviewStore([make_review(2)])
+    copy = store[0].to_dict()
+    copy['topics'].append('service')
+    copy['rating'] = 1
+    store[0]['topics'].append('service')
+
+    assert store[0]['topics'] == ['livraison', 'prix']
+    assert store[0]['rating'] == make_review(2)['rating']
+
+
+def test_arena_compaction_keeps_texts(monkeypatch):
+    monkeypatch.setattr(cp._ArenaColumn, 'COMPACT_MIN_BYTES', 0)
+    store = cp.ReviewStore([make_review(index) for index in range(50)])
+    column = store._columns['text']
+    for index in range(0, 50, 2):
+        store[index]['text'] = f"Réécrit {index}"
+
+    assert column.garbage * 2 <= len(column.arena)
+    for index, row in enumerate(store):
+        expected = f"Réécrit {index}" if index % 2 == 0 else make_review(index)['text']
+        assert row['text'] == expected
+
+
+def test_memory_usage_counts_referenced_objects():
+    store = cp.ReviewStore()
+    empty = store.memory_usage()
+    store.extend(make_review(index, id='x' * 200 + str(index)) for index in range(100))
+
+    assert store.memory_usage() - empty > 100 * 200
+    for row in store:
+        del row['id']
+        del row['author']
+        del row['topics']
+    assert store._columns['id'].value_bytes == 0
+    assert store._columns['topics'].value_bytes == 0
+    assert not store._columns['topics'].refs
+
+
+def test_calculate_kpis_matches_baseline():
+    reviews = [make_review(index) for index in range(40)]
+    # Avis non analysés : ni sentiment ni sujets
+    reviews += [{key: value for key, value in make_review(index).items()
+                 if key not in ('sentiment', 'topics')} for index in range(40, 45)]
+    scraper = cp.ReviewScraper('Test', storage=None, sentiment_cache=cp.SentimentCache(path=None))
+    scraper.add_reviews(reviews)
+
+    assert_kpis_equal(scraper.calculate_kpis(), baseline_kpis(reviews))
+
+    aggregator = cp.KPIAggregator()
+    aggregator.rebuild(cp.ReviewStore(reviews))
+    assert_kpis_equal(aggregator.snapshot(), baseline_kpis(reviews))
+
+
+def test_kpis_follow_analysis_updates():
+    reviews = [make_review(index) for index in range(12)]
+    scraper = cp.ReviewScraper('Test', storage=None, sentiment_cache=cp.SentimentCache(path=None))
+    scraper.add_reviews(reviews)
+    for index, row in enumerate(scraper.reviews):
+        analysis = {'sentiment': 'positive', 'topics': ['service'] * (index % 2)}
+        scraper.kpis.update_analysis(row, analysis)
+        reviews[index].update(analysis)
+
+    assert_kpis_equal(scraper.calculate_kpis(), baseline_kpis(reviews))
+
+
+def test_empty_store_kpis_match_baseline():
+    scraper = cp.ReviewScraper('Test', storage=None, sentiment_cache=cp.SentimentCache(path=None))
+    assert scraper.calculate_kpis() == baseline_kpis([])
@@ -0,0 +1,125 @@
+"""
+Tests des séries temporelles (TrendAggregator et compartiments du stockage SQLite)
+
+Les séries lues dans le stockage durable doivent être identiques à celles
+du TrendAggregator en mémoire, rester à jour après une réanalyse et être
+servies sans charger les avis.
+"""
+
+import pytest
+
+import code_prototype as cp
+
+
+def make_reviews(count: int):
+    """Construit des avis répartis sur trois mois et trois plateformes."""
+    return [{
+        'id': f"review_{index:04d}",
+        'platform': ('google', 'appstore', 'trustpilot')[index % 3],
+        'rating': index % 5 + 1,
+        'text': f"Avis {index}",
+        'date': f"2024-0{index % 3 + 1}-{index % 28 + 1:02d}",
+        'sentiment': ('positive', 'negative', 'neutral')[index % 3],
+        'topics': ['livraison', 'prix', 'service'][:index % 4]
+    } for index in range(count)]
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return cp.SQLiteReviewStorage(str(tmp_path / 'reviews.sqlite3'))
+
+
+def new_scraper(storage, company_id='acme'):
+    return cp.ReviewScraper('Acme', storage=storage, company_id=company_id,
+                            sentiment_cache=cp.SentimentCache(path=None))
+
+
+def all_series(scraper):
+    return {(granularity, platform): scraper.trend_series(granularity, platform=platform)
+            for granularity in cp.TrendAggregator.GRANULARITIES
+            for platform in (None, 'google', 'appstore')}
+
+
+def test_stored_series_match_in_memory_series(storage):
+    reviews = make_reviews(90)
+    stored = new_scraper(storage)
+    stored.add_reviews(reviews)
+    memory = new_scraper(None)
+    memory.add_reviews(reviews)
+
+    assert all_series(stored) == all_series(memory)
+    assert stored.trend_series('week', platform='unknown')[0]['review_count'] == 0
+
+
+def test_reanalysis_updates_stored_buckets(storage):
+    reviews = make_reviews(30)
+    stored = new_scraper(storage)
+    stored.add_reviews(reviews)
+    stored.load_reviews()
+    memory = new_scraper(None)
+    memory.add_reviews(reviews)
+
+    for scraper in (stored, memory):
+        for row in scraper.reviews:
+            scraper.trends.count_analysis(row, -1)
+            scraper.kpis.update_analysis(row, {'sentiment': 'positive', 'topics': ['accueil']})
+            scraper.trends.count_analysis(row, 1)
+        scraper._persist(list(scraper.reviews))
+
+    assert all_series(stored) == all_series(memory)
+    month = stored.trend_series('month')[0]
+    assert month['sentiment_counts'] == {'positive': 10}
+    assert month['top_topics'] == [('accueil', 10)]
+
+
+def test_series_after_restart_do_not_load_reviews(storage, tmp_path):
+    reviews = make_reviews(60)
+    new_scraper(storage).add_reviews(reviews)
+    memory = new_scraper(None, 'memory')
+    memory.add_reviews(reviews)
+    expected = all_series(memory)
+
+    restarted = new_scraper(cp.SQLiteReviewStorage(storage.path))
+    assert all_series(restarted) == expected
+    assert not restarted._loaded
+    assert len(restarted.reviews) == 0
+
+
+def test_buckets_are_rebuilt_for_databases_without_them(storage):
+    reviews = make_reviews(45)
+    new_scraper(storage).add_reviews(reviews)
+    expected = all_series(new_scraper(storage))
+    with storage._db:
+        storage._db.execute("DROP TABLE trend_buckets")
+
+    assert all_series(new_scraper(cp.SQLiteReviewStorage(storage.path))) == expected
+
+
+def test_series_bounds_and_limits(storage):
+    scraper = new_scraper(storage)
+    assert scraper.trend_series('day') == []
+    scraper.add_reviews(make_reviews(10))
+
+    series = scraper.trend_series('day')
+    assert series[0]['period'] == '2024-01-01'
+    assert series[-1]['period'] == '2024-03-09'
+    with pytest.raises(ValueError):
+        scraper.trend_series('year')
+    with pytest.raises(ValueError):
+        scraper.trend_series('day', max_buckets=5)
+
+
+def test_trends_route_reads_stored_buckets(storage, monkeypatch):
+    registry = cp.ScraperRegistry(storage=storage)
+    monkeypatch.setattr(cp, 'scraper_registry', registry)
+    registry.register('acme', {'name': 'Acme', 'location': 'Paris', 'app_name': 'Acme',
+                               'domain': 'acme.fr'}).add_reviews(make_reviews(30))
+    # Instance recréée depuis le stockage, comme après un redémarrage
+    registry._scrapers.clear()
+
+    response = cp.app.test_client().get('/api/trends?company_id=acme&granularity=month')
+
+    assert response.status_code == 200
+    assert [period['review_count'] for period in response.get_json()['series']] == [10, 10, 10]
+    assert not registry.get('acme')._loaded
+    assert cp.app.test_client().get('/api/trends?company_id=acme&granularity=year').status_code == 400
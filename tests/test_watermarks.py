@@ -0,0 +1,164 @@
+"""
+Tests de la collecte différentielle (marqueurs de collecte et points de reprise)
+
+Un client Trustpilot simulé sert un flux d'avis du plus récent au plus
+ancien avec la même sémantique que TrustpilotAPI.get_reviews (since,
+until_id, skip_ids) : aucun avis publié ne doit être perdu, quelle que soit
+la façon dont les collectes sont interrompues.
+"""
+
+import time
+from datetime import date, timedelta
+
+import pytest
+
+import code_prototype as cp
+
+
+class FakeTrustpilot:
+    """Client Trustpilot simulé : un avis par jour, le plus récent en tête."""
+
+    def __init__(self):
+        self.feed = []
+        self.calls = []
+        self.delay = 0.0
+
+    def publish(self, count: int) -> None:
+        for _ in range(count):
+            index = len(self.feed)
+            self.feed.insert(0, {
+                'id': f"trustpilot_{index:03d}",
+                'platform': 'trustpilot',
+                'rating': index % 5 + 1,
+                'text': f"Avis {index}",
+                'date': (date(2024, 1, 1) + timedelta(days=index)).isoformat()
+            })
+
+    def get_reviews(self, business_unit_id, max_results=100, since=None, until_id=None, skip_ids=None):
+        self.calls.append({'max_results': max_results, 'since': since, 'until_id': until_id,
+                           'skip_ids': skip_ids is not None})
+        time.sleep(self.delay)
+        reviews = []
+        for review in self.feed:
+            if since and review['date'] < since:
+                break
+            if until_id and review['id'] == until_id:
+                break
+            if skip_ids is not None and review['id'] in skip_ids:
+                continue
+            reviews.append(dict(review))
+            if len(reviews) >= max_results:
+                break
+        return reviews
+
+
+@pytest.fixture
+def platform():
+    return FakeTrustpilot()
+
+
+def new_scraper(platform, storage=None):
+    scraper = cp.ReviewScraper('Acme', storage=storage, company_id='acme',
+                               sentiment_cache=cp.SentimentCache(path=None))
+    scraper.trustpilot_api = platform
+    scraper.resolve_platform_id = lambda name: 'business-unit'
+    return scraper
+
+
+def collect(scraper, **options):
+    options.setdefault('concurrent', False)
+    return scraper.collect_reviews(platforms=['trustpilot'], **options)
+
+
+def stored_ids(scraper):
+    return {str(review_id) for review_id in scraper._known_review_ids()}
+
+
+def test_first_collection_sets_the_watermark(platform):
+    platform.publish(30)
+    scraper = new_scraper(platform)
+
+    result = collect(scraper)
+
+    assert result['reviews_per_platform'] == {'trustpilot': 30}
+    assert platform.calls[-1]['since'] is None and platform.calls[-1]['until_id'] is None
+    assert scraper.watermarks['trustpilot'] == {'date': platform.feed[0]['date'], 'id': 'trustpilot_029'}
+
+
+def test_incremental_collection_stops_at_the_watermark(platform):
+    platform.publish(30)
+    scraper = new_scraper(platform)
+    collect(scraper)
+    platform.publish(5)
+
+    result = collect(scraper)
+
+    assert platform.calls[-1]['until_id'] == 'trustpilot_029'
+    assert platform.calls[-1]['since'] == '2024-01-30'
+    assert result['reviews_per_platform'] == {'trustpilot': 5}
+    assert result['duplicates'] == 0
+    assert scraper.watermarks['trustpilot'] == {'date': '2024-02-04', 'id': 'trustpilot_034'}
+    assert len(scraper.reviews) == 35
+
+
+@pytest.mark.parametrize('restart', [False, True])
+def test_partial_collection_resumes_without_losing_reviews(platform, tmp_path, restart):
+    storage = cp.SQLiteReviewStorage(str(tmp_path / 'reviews.sqlite3'))
+    platform.publish(35)
+    scraper = new_scraper(platform, storage)
+    collect(scraper)
+    platform.publish(10)
+
+    collect(scraper, max_results=4)
+    watermark = scraper.watermarks['trustpilot']
+    assert watermark['id'] == 'trustpilot_034'
+    assert watermark['resume']['id'] == 'trustpilot_041'
+    assert watermark['head']['id'] == 'trustpilot_044'
+
+    if restart:
+        scraper = new_scraper(platform, cp.SQLiteReviewStorage(storage.path))
+        assert scraper.watermarks['trustpilot'] == watermark
+
+    collect(scraper, max_results=4)
+    assert platform.calls[-1]['skip_ids']
+    watermark = scraper.watermarks['trustpilot']
+    assert (watermark['id'], watermark['resume']['id'], watermark['head']['id']) == \
+        ('trustpilot_034', 'trustpilot_037', 'trustpilot_044')
+
+    result = collect(scraper, max_results=4)
+    assert result['reviews_per_platform'] == {'trustpilot': 2}
+    assert scraper.watermarks['trustpilot'] == {'date': '2024-02-14', 'id': 'trustpilot_044'}
+    assert stored_ids(scraper) == {review['id'] for review in platform.feed}
+
+
+def test_timed_out_collection_keeps_the_watermark(platform):
+    platform.publish(20)
+    scraper = new_scraper(platform)
+    collect(scraper)
+    watermark = dict(scraper.watermarks['trustpilot'])
+    platform.publish(5)
+    platform.delay = 0.5
+
+    result = collect(scraper, concurrent=True, timeouts={'trustpilot': 0.05})
+
+    assert result['timed_out'] == ['trustpilot']
+    assert scraper.watermarks['trustpilot'] == watermark
+
+    platform.delay = 0.0
+    result = collect(scraper, concurrent=True)
+    assert result['reviews_per_platform'] == {'trustpilot': 5}
+    assert stored_ids(scraper) == {review['id'] for review in platform.feed}
+
+
+def test_full_refresh_ignores_the_watermark(platform):
+    platform.publish(20)
+    scraper = new_scraper(platform)
+    collect(scraper)
+    platform.publish(3)
+
+    result = collect(scraper, full_refresh=True)
+
+    assert platform.calls[-1]['since'] is None and platform.calls[-1]['until_id'] is None
+    assert result['reviews_per_platform'] == {'trustpilot': 3}
+    assert result['duplicates'] == 20
+    assert scraper.watermarks['trustpilot'] == {'date': '2024-01-23', 'id': 'trustpilot_022'}